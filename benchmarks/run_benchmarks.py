@@ -0,0 +1,194 @@
+"""Throughput benchmarks for the variate generators and the queue simulators.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --output bench.json [--quick] [--label v1.2]
+
+Every result is a JSON record with the measured rates (calls, values, events or
+customers per second) and the peak memory allocated by Python during one call."""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import src.discret_events as de
+from src.discret_events import kernels
+from src.random_variable_generator import rvg
+
+# (name, function, arguments, values produced per call)
+GENERATORS = [
+    ("generate_U", rvg.generate_U, (), 1),
+    ("generate_random_number", rvg.generate_random_number, (10,), 1),
+    ("generate_geometric_variable", rvg.generate_geometric_variable, (0.2,), 1),
+    ("generate_binomial_variable", rvg.generate_binomial_variable, (20, 0.3), 1),
+    ("generate_poisson_variable", rvg.generate_poisson_variable, (5.0,), 1),
+    ("generate_exponential_variable", rvg.generate_exponential_variable, (2.0,), 1),
+    ("generate_next_poisson_time", rvg.generate_next_poisson_time, (0.0, 2.0), 1),
+    ("generate_poisson_process", rvg.generate_poisson_process, (10.0, 100.0), 1000),
+]
+
+BATCH_GENERATORS = [
+    ("generate_U_batch", rvg.generate_U_batch, ()),
+    ("generate_random_number_batch", rvg.generate_random_number_batch, (10,)),
+    ("generate_geometric_batch", rvg.generate_geometric_batch, (0.2,)),
+    ("generate_binomial_batch", rvg.generate_binomial_batch, (20, 0.3)),
+    ("generate_poisson_batch", rvg.generate_poisson_batch, (5.0,)),
+    ("generate_exponential_batch", rvg.generate_exponential_batch, (2.0,)),
+]
+
+def one_server(lmd, mu, end_time):
+    return de.simulate_one_server_queue(lmd, mu, end_time)
+
+def one_server_lindley(lmd, mu, end_time):
+    return de.simulate_one_server_queue(lmd, mu, end_time, method="lindley")
+
+def two_in_series(lmd, mu, end_time):
+    return de.simulate_two_in_series_servers_queue(lmd, mu, mu, end_time)
+
+def two_in_series_lindley(lmd, mu, end_time):
+    return de.simulate_two_in_series_servers_queue(lmd, mu, mu, end_time, method="lindley")
+
+def one_server_profiled(lmd, mu, end_time):
+    return de.simulate_one_server_queue(lmd, mu, end_time, profiler=de.EventProfiler(trace_every=1000))
+
+def one_server_numba(lmd, mu, end_time):
+    return de.simulate_one_server_queue(lmd, mu, end_time, backend="numba")
+
+def two_in_series_numba(lmd, mu, end_time):
+    return de.simulate_two_in_series_servers_queue(lmd, mu, mu, end_time, backend="numba")
+
+def two_parallel_numba(lmd, mu, end_time):
+    return de.simulate_two_paralel_servers_queue(lmd, mu / 2, mu / 2, end_time, backend="numba")
+
+def two_parallel(lmd, mu, end_time):
+    return de.simulate_two_paralel_servers_queue(lmd, mu / 2, mu / 2, end_time)
+
+def multi_server(lmd, mu, end_time):
+    return de.simulate_multi_server_queue(lmd, [mu / 50] * 50, end_time)
+
+def queue_network(lmd, mu, end_time):
+    return de.simulate_queue_network(lmd, de.in_series_servers_stations([mu, mu]), end_time)
+
+# (name, function, events per customer)
+# Every simulator is called as function(lmd, mu, end_time), with mu the total service capacity
+# of each station so that the load factor of every sweep point is lmd / mu.
+SIMULATORS = [
+    ("simulate_one_server_queue", one_server, 2),
+    ("simulate_one_server_queue[lindley]", one_server_lindley, 2),
+    ("simulate_one_server_queue[profiled]", one_server_profiled, 2),
+    ("simulate_two_in_series_servers_queue", two_in_series, 3),
+    ("simulate_two_in_series_servers_queue[lindley]", two_in_series_lindley, 3),
+    ("simulate_two_paralel_servers_queue", two_parallel, 2),
+    ("simulate_multi_server_queue", multi_server, 2),
+    ("simulate_queue_network", queue_network, 3),
+]
+
+if kernels.HAS_NUMBA:
+    SIMULATORS += [
+        ("simulate_one_server_queue[numba]", one_server_numba, 2),
+        ("simulate_two_in_series_servers_queue[numba]", two_in_series_numba, 3),
+        ("simulate_two_paralel_servers_queue[numba]", two_parallel_numba, 2),
+    ]
+
+def peak_memory(function, *args):
+    """Peak memory in bytes allocated by Python during function(*args)."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def timed(function, *args, min_time=0.2, count=len):
+    """Call function(*args) repeatedly for at least min_time seconds.
+
+    Return the number of calls, the elapsed time and the sum of count(result) over the calls."""
+    calls = 0
+    total = 0
+    start = time.perf_counter()
+    while True:
+        result = function(*args)
+        calls += 1
+        total += count(result)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls, elapsed, total
+
+def bench_generators(min_time):
+    results = []
+
+    for name, function, args, values in GENERATORS:
+        calls, elapsed, _ = timed(lambda: [function(*args) for _ in range(1000)], min_time=min_time)
+        results.append({"benchmark" : name, "args" : list(args), "calls_per_sec" : 1000 * calls / elapsed,
+                        "values_per_sec" : 1000 * calls * values / elapsed, "peak_memory" : peak_memory(function, *args)})
+
+    if rvg.np is not None:
+        for name, function, args in BATCH_GENERATORS:
+            size = 100000
+            calls, elapsed, _ = timed(function, *args, size, min_time=min_time)
+            results.append({"benchmark" : name, "args" : list(args), "size" : size, "calls_per_sec" : calls / elapsed,
+                            "values_per_sec" : calls * size / elapsed, "peak_memory" : peak_memory(function, *args, size)})
+
+        calls, elapsed, values = timed(rvg.generate_poisson_process_batch, 10.0, 10000.0, min_time=min_time)
+        results.append({"benchmark" : "generate_poisson_process_batch", "args" : [10.0, 10000.0],
+                        "calls_per_sec" : calls / elapsed, "values_per_sec" : values / elapsed,
+                        "peak_memory" : peak_memory(rvg.generate_poisson_process_batch, 10.0, 10000.0)})
+
+    return results
+
+def bench_simulators(loads, end_times, min_time):
+    results = []
+    mu = 1.0
+
+    for name, function, events_per_customer in SIMULATORS:
+        for end_time in end_times:
+            for load in loads:
+                lmd = load * mu
+                calls, elapsed, customers = timed(function, lmd, mu, end_time, min_time=min_time,
+                                                  count=lambda result: len(result[0]))
+
+                results.append({"benchmark" : name, "lmd" : lmd, "mu" : mu, "end_time" : end_time, "load" : load,
+                                "customers_per_run" : customers / calls,
+                                "customers_per_sec" : customers / elapsed,
+                                "events_per_sec" : customers * events_per_customer / elapsed,
+                                "seconds_per_run" : elapsed / calls,
+                                "peak_memory" : peak_memory(function, lmd, mu, end_time)})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="JSON file for the results (default: standard output)")
+    parser.add_argument("--label", default="", help="label of the measured version")
+    parser.add_argument("--quick", action="store_true", help="small sweep for a fast check")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        loads, end_times, min_time = [0.5, 0.95], [100.0], 0.05
+    else:
+        loads, end_times, min_time = [0.5, 0.8, 0.9, 0.95, 0.99], [1000.0, 10000.0, 100000.0], 0.5
+
+    report = {
+        "label" : args.label,
+        "timestamp" : datetime.now(timezone.utc).isoformat(),
+        "python" : sys.version,
+        "platform" : platform.platform(),
+        "numpy" : rvg.np.__version__ if rvg.np is not None else None,
+        "numba" : kernels.numba.__version__ if kernels.HAS_NUMBA else None,
+        "generators" : bench_generators(min_time),
+        "simulators" : bench_simulators(loads, end_times, min_time),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,9 @@
 from . import discret_events
 from . import random_variable_generator
-from . import utils
\ No newline at end of file
+from . import utils
+from . import online_statistics
+from . import replication
+from . import sweep
+from . import steady_state
+from . import service
+from . import analytic
@@ -0,0 +1,304 @@
+import math
+from functools import lru_cache
+from src.discret_events import (simulate_one_server_queue, simulate_two_in_series_servers_queue,
+                                simulate_two_paralel_servers_queue, simulate_multi_server_queue,
+                                simulate_queue_network, one_server_stations, in_series_servers_stations,
+                                parallel_servers_stations)
+from src.random_variable_generator.nhpp import is_time_varying
+from src.steady_state import estimate_steady_state_metrics
+from src.utils import freeze
+
+# Simulator of each model : name -> simulator
+SIMULATORS = {
+    "one_server" : simulate_one_server_queue,
+    "two_in_series" : simulate_two_in_series_servers_queue,
+    "two_parallel" : simulate_two_paralel_servers_queue,
+    "multi_server" : simulate_multi_server_queue,
+    "queue_network" : simulate_queue_network,
+}
+
+# ---------------------------------------------------------------------------
+# Steady state
+# ---------------------------------------------------------------------------
+
+def erlang_c(servers : int, load : float):
+    """Probability that an arrival waits in an M/M/c queue with c servers and offered load lambda / mu.
+
+    Computed from the Erlang B recursion B(k) = a B(k-1) / (k + a B(k-1))."""
+    b = 1.0
+    for k in range(1, servers + 1):
+        b = load * b / (k + load * b)
+    rho = load / servers
+    return b / (1 - rho * (1 - b))
+
+def mmc_metrics(lmd : float, mu : float, servers : int = 1):
+    """Steady-state metrics of an M/M/c queue, None when it is unstable (lambda >= c mu).
+
+    Return :
+        dict with the mean time_in_system (W), waiting_time (Wq), number_in_system (L),
+        queue_length (Lq) and the utilisation of the servers."""
+    load = lmd / mu
+    rho = load / servers
+    if rho >= 1:
+        return None
+
+    queue_length = erlang_c(servers, load) * rho / (1 - rho) if lmd > 0 else 0.0
+    waiting_time = queue_length / lmd if lmd > 0 else 0.0
+    time_in_system = waiting_time + 1 / mu
+
+    return {
+        "time_in_system" : time_in_system,
+        "waiting_time" : waiting_time,
+        "number_in_system" : lmd * time_in_system,
+        "queue_length" : queue_length,
+        "utilisation" : rho,
+    }
+
+def traffic_rates(lmd : float, stations, entry : int = 0):
+    """Total arrival rate to each station of an open network, solving the traffic equations
+    lambda_i = gamma_i + sum_j lambda_j p_ji by Gaussian elimination."""
+    k = len(stations)
+    # (I - P^T) lambda = gamma
+    a = [[float(i == j) for j in range(k)] + [lmd if i == entry else 0.0] for i in range(k)]
+    for j, station in enumerate(stations):
+        for probability, i in station.routing:
+            a[i][j] -= probability
+
+    for col in range(k):
+        pivot = max(range(col, k), key=lambda row : abs(a[row][col]))
+        if abs(a[pivot][col]) < 1e-12:
+            raise ValueError("the network is not open : some customers never leave")
+        a[col], a[pivot] = a[pivot], a[col]
+        for row in range(k):
+            if row != col and a[row][col] != 0.0:
+                factor = a[row][col] / a[col][col]
+                a[row] = [x - factor * y for x, y in zip(a[row], a[col])]
+
+    return [a[i][k] / a[i][i] for i in range(k)]
+
+def jackson_metrics(lmd : float, stations, entry : int = 0):
+    """Steady-state metrics of an open Jackson network of M/M/c stations.
+
+    Each station behaves as an independent M/M/c queue with the arrival rate given by the
+    traffic equations, and the means of the whole network follow from Little's law.
+    None when there is no product-form answer : a station with servers of different
+    rates or non-exponential service, finite capacity, balking or reneging, or an unstable station.
+
+    Return :
+        dict with time_in_system, waiting_time, number_in_system and queue_length of the network,
+        and station_utilisation, the list of the utilisation of the servers of each station.
+        Networks of a single station also have its utilisation as a float under utilisation,
+        like mmc_metrics and the replication summaries."""
+    if lmd <= 0:
+        return None
+
+    metrics = []
+    for rate, station in zip(traffic_rates(lmd, stations, entry), stations):
+        if any(is_time_varying(rate) for rate in station.rates) or len(set(station.rates)) != 1 or any(x is not None for x in (station.capacity, station.balking, station.patience)):
+            return None
+        station_metrics = mmc_metrics(rate, station.rates[0], len(station.rates))
+        if station_metrics is None:
+            return None
+        metrics.append(station_metrics)
+
+    number_in_system = sum(m["number_in_system"] for m in metrics)
+    queue_length = sum(m["queue_length"] for m in metrics)
+    network_metrics = {
+        "time_in_system" : number_in_system / lmd,
+        "waiting_time" : queue_length / lmd,
+        "number_in_system" : number_in_system,
+        "queue_length" : queue_length,
+        "station_utilisation" : [m["utilisation"] for m in metrics],
+    }
+    if len(metrics) == 1:
+        network_metrics["utilisation"] = metrics[0]["utilisation"]
+    return network_metrics
+
+def model_stations(model : str, params : dict):
+    """Stations of the queue network equivalent to a model, None for an unknown model."""
+    if model == "one_server":
+        return one_server_stations(params["mu"])
+    if model == "two_in_series":
+        return in_series_servers_stations([params["mu_1"], params["mu_2"]])
+    if model == "two_parallel":
+        return parallel_servers_stations([params["mu_1"], params["mu_2"]])
+    if model == "multi_server":
+        return parallel_servers_stations(params["mus"])
+    if model == "queue_network":
+        return params["stations"]
+    return None
+
+# Simulator parameters the steady state depends on, the cache key of analytic_metrics
+MODEL_PARAMETERS = ("lmd", "mu", "mu_1", "mu_2", "mus", "entry")
+
+@lru_cache(maxsize=1024)
+def _cached_metrics(model : str, frozen_params):
+    params = dict(frozen_params)
+    stations = model_stations(model, params)
+    if stations is None:
+        return None
+    return jackson_metrics(params["lmd"], stations, params.get("entry", 0))
+
+def analytic_metrics(model : str, params : dict):
+    """Steady-state metrics of a model (see SIMULATORS) with the simulator keyword arguments params,
+    or None when the model has no closed-form answer (see jackson_metrics), a time-varying
+    arrival rate or service times given as distributions. Answers are cached by (model, params), except for queue networks whose
+    stations can be modified, so the dict returned must not be modified.
+
+    The two parallel servers queue is only answered for equal service rates, where it is an M/M/2."""
+    if any(is_time_varying(params[k]) for k in ("lmd", "mu", "mu_1", "mu_2") if k in params) \
+            or any(is_time_varying(mu) for mu in params.get("mus", ())):
+        return None
+    if model == "queue_network":
+        return _cached_metrics.__wrapped__(model, tuple(params.items()))
+    return _cached_metrics(model, freeze({k : v for k, v in params.items() if k in MODEL_PARAMETERS}))
+
+# ---------------------------------------------------------------------------
+# Transient behaviour by uniformization
+# ---------------------------------------------------------------------------
+
+def poisson_weights(mean : float, tolerance : float = 1e-10):
+    """Poisson(mean) probabilities 0, 1, ..., K with K the first index after the mean whose
+    cumulative probability reaches 1 - tolerance. Computed in log space so that large means
+    do not underflow."""
+    weights = []
+    total = 0.0
+    log_mean = math.log(mean) if mean > 0 else -math.inf
+    k = 0
+    while True:
+        weight = math.exp(k * log_mean - mean - math.lgamma(k + 1)) if mean > 0 else float(k == 0)
+        weights.append(weight)
+        total += weight
+        if k >= mean and total >= 1 - tolerance:
+            return weights
+        k += 1
+
+def ctmc_transient(transitions, p0, t : float, tolerance : float = 1e-10):
+    """Distribution at time t of a continuous-time Markov chain by uniformization.
+
+    p(t) = sum_k Poisson(k ; q t) p0 P^k with P = I + Q / q the chain uniformized at the
+    largest exit rate q. The chain is given sparsely, so each step is linear in its size.
+    Parameters:
+      transitions : list of (from state, to state, rate) with states numbered from 0
+      p0 : initial distribution (list of probabilities)
+      t : time
+      tolerance : Poisson mass left out of the sum
+
+    Return :
+        p -> list(float) : probability of each state at time t."""
+    states = len(p0)
+    exit_rates = [0.0] * states
+    for i, _, rate in transitions:
+        exit_rates[i] += rate
+    q = max(exit_rates)
+    if q == 0 or t == 0:
+        return list(p0)
+
+    jumps = [(i, j, rate / q) for i, j, rate in transitions]
+    stay = [1 - rate / q for rate in exit_rates]
+
+    v = list(p0)
+    p = [0.0] * states
+    for weight in poisson_weights(q * t, tolerance):
+        for i in range(states):
+            p[i] += weight * v[i]
+
+        # v = v P
+        next_v = [v[i] * stay[i] for i in range(states)]
+        for i, j, probability in jumps:
+            next_v[j] += v[i] * probability
+        v = next_v
+
+    return p
+
+def default_truncation(lmd : float, t : float, n0 : int = 0):
+    """Customers above which the transient probability is negligible : the initial customers
+    plus a generous bound on the Poisson number of arrivals up to time t."""
+    arrivals = lmd * t
+    return n0 + int(arrivals + 8 * math.sqrt(arrivals) + 20)
+
+def mm1_transient(lmd : float, mu : float, t : float, n0 : int = 0, max_customers : int = None):
+    """Distribution of the number of customers of an M/M/1 queue at time t, starting with n0.
+
+    Return :
+        p -> list(float) : probability of 0, 1, ..., max_customers customers at time t."""
+    n = default_truncation(lmd, t, n0) if max_customers is None else max_customers
+    transitions = [(i, i + 1, lmd) for i in range(n)] + [(i, i - 1, mu) for i in range(1, n + 1)]
+    p0 = [0.0] * (n + 1)
+    p0[n0] = 1.0
+    return ctmc_transient(transitions, p0, t)
+
+def tandem_transient(lmd : float, mus, t : float, max_customers : int = None):
+    """Mean number of customers at each station of two single servers in series at time t,
+    starting empty. The states (n_1, n_2) are truncated at max_customers per station.
+
+    Return :
+        means -> list(float) : mean number of customers of each station at time t."""
+    mu_1, mu_2 = mus
+    n = default_truncation(lmd, t) if max_customers is None else max_customers
+    index = lambda n_1, n_2 : n_1 * (n + 1) + n_2
+
+    transitions = []
+    for n_1 in range(n + 1):
+        for n_2 in range(n + 1):
+            if n_1 < n:
+                transitions.append((index(n_1, n_2), index(n_1 + 1, n_2), lmd))
+            if n_1 > 0 and n_2 < n:
+                transitions.append((index(n_1, n_2), index(n_1 - 1, n_2 + 1), mu_1))
+            if n_2 > 0:
+                transitions.append((index(n_1, n_2), index(n_1, n_2 - 1), mu_2))
+
+    p0 = [0.0] * (n + 1) ** 2
+    p0[0] = 1.0
+    p = ctmc_transient(transitions, p0, t)
+
+    return [sum(p[index(n_1, n_2)] * n_1 for n_1 in range(n + 1) for n_2 in range(n + 1)),
+            sum(p[index(n_1, n_2)] * n_2 for n_1 in range(n + 1) for n_2 in range(n + 1))]
+
+# ---------------------------------------------------------------------------
+# Cross-check and hybrid evaluation
+# ---------------------------------------------------------------------------
+
+def check_simulator(model : str, params : dict, metrics=("time_in_system", "waiting_time"), n_batches : int = 20,
+                    confidence : float = 0.99, tolerance : float = 0.05):
+    """Compare the steady-state estimates of a simulator run with the analytic metrics.
+
+    The simulator (see SIMULATORS) runs once with params, whose end_time should be long, and
+    each metric is estimated with estimate_steady_state_metrics. A metric is consistent when
+    the analytic value is within the confidence interval widened by tolerance (relative), since
+    batch means intervals tend to be narrow.
+
+    Return :
+        report -> dict : for each metric, analytic value, estimate, half_width and consistent."""
+    expected = analytic_metrics(model, params)
+    if expected is None:
+        raise ValueError(f"no analytic answer for model {model} with these parameters")
+
+    estimates = estimate_steady_state_metrics(SIMULATORS[model], params, metrics, n_batches, confidence)
+    report = {}
+    for metric in metrics:
+        estimate = estimates[metric]
+        error = abs(estimate["mean"] - expected[metric])
+        report[metric] = {"analytic" : expected[metric], "estimate" : estimate["mean"], "half_width" : estimate["half_width"],
+                          "consistent" : error <= estimate["half_width"] + tolerance * abs(expected[metric])}
+    return report
+
+def evaluate(model : str, params : dict, hybrid : bool = True, n_batches : int = 20, confidence : float = 0.95):
+    """Steady-state mean time in system and waiting time of a model.
+
+    In hybrid mode the analytic answer is returned when there is one, and the simulator only
+    runs otherwise (see estimate_steady_state_metrics, end_time should be long). With
+    hybrid False the simulator always runs.
+
+    Return :
+        source -> str : "analytic" or "simulation".
+        metrics -> dict : time_in_system and waiting_time (all analytic metrics in the analytic case).
+        half_width -> dict : half-width of the confidence interval of each metric (0 for analytic answers)."""
+    if hybrid:
+        metrics = analytic_metrics(model, params)
+        if metrics is not None:
+            return "analytic", metrics, dict.fromkeys(metrics, 0.0)
+
+    estimates = estimate_steady_state_metrics(SIMULATORS[model], params, ("time_in_system", "waiting_time"), n_batches, confidence)
+    return ("simulation", {metric : e["mean"] for metric, e in estimates.items()},
+            {metric : e["half_width"] for metric, e in estimates.items()})
@@ -1,3 +1,10 @@
 from .one_server_queue import *
 from .two_in_series_servers_queue import *
-from .two_parallel_servers_queue import *
\ No newline at end of file
+from .two_parallel_servers_queue import *
+from .queue_network import *
+from .multi_server_queue import *
+from .observers import *
+from .trace import *
+from .lindley import *
+from .vectorized import *
+from .profiling import *
@@ -0,0 +1,234 @@
+import random
+import src.random_variable_generator.rvg as rvg
+from src.random_variable_generator.nhpp import is_time_varying
+
+np = rvg.np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Compiled event loops of the simulators, selected with backend="numba".
+# The loops work on preallocated float arrays and draw the event times inside the kernel
+# with np.random, so they compile with numba.njit. Without Numba, backend="numba" falls
+# back to the Python event loops of the simulators, which are faster than the kernels
+# interpreted.
+
+BACKENDS = ("python", "numba")
+
+HAS_NUMBA = numba is not None
+
+def jit(function):
+    """Compile function with numba.njit when Numba is installed, otherwise leave it as Python."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True)(function)
+
+@jit
+def _grow(values):
+    """Copy of values with twice the length."""
+    grown = np.empty(2 * len(values))
+    grown[:len(values)] = values
+    return grown
+
+@jit
+def one_server_kernel(lmd, mu, end_time, seed):
+    """Event loop of simulate_one_server_queue."""
+    np.random.seed(seed)
+
+    capacity = int(lmd * end_time * 1.1) + 16
+    arrival_times = np.empty(capacity)
+    departure_times = np.empty(capacity)
+
+    t = 0.0                                     # current time
+    n = 0                                       # number of customers in the system
+    t_a = np.random.exponential(1.0 / lmd)      # time for next arrival
+    t_d = np.inf                                # time for next departure
+    n_a = 0                                     # number of arrivals
+    n_d = 0                                     # number of departures
+
+    while True:
+        # Next Event : Customer Arrival
+        if t_a <= t_d and t_a <= end_time:
+            t = t_a
+            n += 1
+            t_a = t + np.random.exponential(1.0 / lmd)
+            if n == 1:
+                t_d = t + np.random.exponential(1.0 / mu)
+
+            if n_a == len(arrival_times):
+                arrival_times = _grow(arrival_times)
+                departure_times = _grow(departure_times)
+            arrival_times[n_a] = t
+            n_a += 1
+
+        # Next Event : Customer Departure
+        elif n > 0:
+            t = t_d
+            n -= 1
+            t_d = np.inf if n == 0 else t + np.random.exponential(1.0 / mu)
+
+            departure_times[n_d] = t
+            n_d += 1
+
+        # Next Event : System close
+        else:
+            return arrival_times[:n_a], departure_times[:n_d], max(0.0, t - end_time)
+
+@jit
+def two_in_series_kernel(lmd, mu_1, mu_2, end_time, seed):
+    """Event loop of simulate_two_in_series_servers_queue."""
+    np.random.seed(seed)
+
+    capacity = int(lmd * end_time * 1.1) + 16
+    arrival_times = np.empty(capacity)
+    departure_times = np.empty(capacity)
+
+    t = 0.0                                     # current time
+    n_1 = 0                                     # number of customers on server 1
+    n_2 = 0                                     # number of customers on server 2
+    t_a = np.random.exponential(1.0 / lmd)      # time of next arrival
+    t_1 = np.inf                                # service completion time for server 1
+    t_2 = np.inf                                # service completion time for server 2
+    n_a = 0                                     # number of arrivals
+    c_2 = 0                                     # number of customers served by server 2
+
+    while True:
+        # Next Event : Customer Arrival
+        if t_a <= t_1 and t_a <= t_2 and t_a <= end_time:
+            t = t_a
+            n_1 += 1
+            t_a = t + np.random.exponential(1.0 / lmd)
+            if n_1 == 1:
+                t_1 = t + np.random.exponential(1.0 / mu_1)
+
+            if n_a == len(arrival_times):
+                arrival_times = _grow(arrival_times)
+                departure_times = _grow(departure_times)
+            arrival_times[n_a] = t
+            n_a += 1
+
+        # Next Event : Service Completion (server 1)
+        elif t_1 <= t_2 and n_1 > 0:
+            t = t_1
+            n_1 -= 1
+            n_2 += 1
+            t_1 = np.inf if n_1 == 0 else t + np.random.exponential(1.0 / mu_1)
+            if n_2 == 1:
+                t_2 = t + np.random.exponential(1.0 / mu_2)
+
+        # Next Event : Service Completion (server 2)
+        elif t_2 < t_1:
+            t = t_2
+            n_2 -= 1
+            t_2 = np.inf if n_2 == 0 else t + np.random.exponential(1.0 / mu_2)
+
+            departure_times[c_2] = t
+            c_2 += 1
+
+        # Next Event : System close
+        else:
+            return arrival_times[:n_a], departure_times[:c_2], max(0.0, t - end_time)
+
+@jit
+def two_parallel_kernel(lmd, mu_1, mu_2, end_time, seed):
+    """Event loop of simulate_two_paralel_servers_queue."""
+    np.random.seed(seed)
+
+    capacity = int(lmd * end_time * 1.1) + 16
+    arrival_times = np.empty(capacity)
+    departure_times = np.empty(capacity)
+
+    t = 0.0                                     # current time
+    n = 0                                       # number of customers on the system
+    i_1 = -1                                    # customer attended by server 1
+    i_2 = -1                                    # customer attended by server 2
+    t_a = np.random.exponential(1.0 / lmd)      # time of next arrival
+    t_1 = np.inf                                # service completion time for server 1
+    t_2 = np.inf                                # service completion time for server 2
+    c_1 = 0                                     # number of customers served by server 1
+    c_2 = 0                                     # number of customers served by server 2
+    n_a = 0                                     # number of arrivals
+
+    while True:
+        # Next Event : Customer Arrival
+        if t_a <= t_1 and t_a <= t_2 and t_a <= end_time:
+            t = t_a
+            customer = n_a
+            t_a = t + np.random.exponential(1.0 / lmd)
+
+            if i_1 == -1:
+                i_1 = customer
+                t_1 = t + np.random.exponential(1.0 / mu_1)
+            elif i_2 == -1:
+                i_2 = customer
+                t_2 = t + np.random.exponential(1.0 / mu_2)
+            n += 1
+
+            if n_a == len(arrival_times):
+                arrival_times = _grow(arrival_times)
+                departure_times = _grow(departure_times)
+            arrival_times[n_a] = t
+            departure_times[n_a] = np.nan       # filled when the customer departs
+            n_a += 1
+
+        # Next Event : Service Completion (server 1)
+        elif t_1 <= t_2 and t_1 < np.inf:
+            t = t_1
+            c_1 += 1
+            departure_times[i_1] = t
+            if n <= 2:
+                t_1 = np.inf
+                i_1 = -1
+            else:
+                t_1 = t + np.random.exponential(1.0 / mu_1)
+                i_1 = max(i_1, i_2) + 1
+            n -= 1
+
+        # Next Event : Service Completion (server 2)
+        elif t_2 < t_1:
+            t = t_2
+            c_2 += 1
+            departure_times[i_2] = t
+            if n <= 2:
+                t_2 = np.inf
+                i_2 = -1
+            else:
+                t_2 = t + np.random.exponential(1.0 / mu_2)
+                i_2 = max(i_1, i_2) + 1
+            n -= 1
+
+        # Event : System closed and no customers remaining
+        else:
+            return arrival_times[:n_a], departure_times[:n_a], max(0.0, t - end_time), c_1, c_2
+
+def kernel_seed(rng=None):
+    """Seed of the kernel random generator, drawn from rng or from the global random state."""
+    if rng is None:
+        return random.getrandbits(32)
+    if np is not None and isinstance(rng, np.random.Generator):
+        return int(rng.integers(2 ** 32))
+    return rng.getrandbits(32)
+
+def run_kernel(kernel, *args, rng=None):
+    """Run a compiled event loop and return its output with the arrays converted to lists.
+
+    Compiled kernels draw from the Numba generator, which is separate from np.random, so the
+    run does not disturb the global NumPy state."""
+    result = kernel(*args, kernel_seed(rng))
+    return tuple(value.tolist() if isinstance(value, np.ndarray) else value for value in result)
+
+def check_backend(backend : str, rates, *options):
+    """Validate backend and return whether the compiled event loop should be used, that is
+    for backend="numba" when Numba is installed.
+
+    The compiled loops draw their own exponential event times, so streams, observers, profilers and
+    rates (lmd and service rates) that are time-varying or distributions are rejected."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend}")
+    if backend == "numba" and any(x is not None for x in options):
+        raise ValueError("the numba backend does not support streams, observers or profilers")
+    if backend == "numba" and any(is_time_varying(rate) for rate in rates):
+        raise ValueError("the numba backend needs constant exponential rates")
+    return backend == "numba" and HAS_NUMBA
@@ -0,0 +1,65 @@
+import src.random_variable_generator as rvg
+
+np = rvg.np
+
+def lindley_departures(arrival_times, service_times):
+    """Departure times of a FIFO single-server queue given arrival and service times.
+
+    Uses the recursion D_i = max(A_i, D_{i-1}) + S_i. With NumPy arrays it is evaluated
+    without a loop through its closed form D_i = C_i + max_{j<=i}(A_j - C_{j-1}),
+    where C is the cumulative sum of the service times."""
+    if np is not None and isinstance(arrival_times, np.ndarray):
+        total_service = np.cumsum(service_times)
+        return total_service + np.maximum.accumulate(arrival_times - (total_service - service_times))
+
+    departure_times = []
+    last_departure = 0.0
+    for arrival, service in zip(arrival_times, service_times):
+        last_departure = max(arrival, last_departure) + service
+        departure_times.append(last_departure)
+    return departure_times
+
+def simulate_fifo_tandem_queue(lmd : float, mus, end_time : float, rng=None):
+    """Simulate a line of FIFO single servers with rates mus visited in order, up to time end_time.
+    Instead of an event loop, all the interarrival and service times are drawn at once and the
+    departures of each server are computed with lindley_departures.
+    Parameters:
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      mus : Exponential rate for the service time of each server, or a rvg.Distribution of its service times
+      end_time : Time until the system will accept new arrivals
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+
+    Return :
+        arrival_times -> list(float) : times of arrival times for each customer.
+        departure_times -> list(float) : times of departure times for each customer.
+        exceeded_time -> float : time past close time that the system remains attending customers."""
+
+    if np is not None and (rng is None or isinstance(rng, np.random.Generator)):
+        if rvg.is_distribution(lmd):
+            arrival_times = rvg.generate_renewal_process(lmd, end_time, rng)
+        elif rvg.is_time_varying(lmd):
+            arrival_times = rvg.generate_nhpp_batch(lmd, end_time, rng=rng)
+        else:
+            arrival_times = rvg.generate_poisson_process_batch(lmd, end_time, rng)
+        departure_times = arrival_times
+        for mu in mus:
+            services = mu.sample(len(arrival_times), rng) if rvg.is_distribution(mu) else rvg.generate_exponential_batch(mu, len(arrival_times), rng=rng)
+            departure_times = lindley_departures(departure_times, services)
+        arrival_times, departure_times = arrival_times.tolist(), departure_times.tolist()
+
+    else:
+        if rvg.is_distribution(lmd):
+            arrival_times = rvg.generate_renewal_process(lmd, end_time, rng)
+        elif rvg.is_time_varying(lmd):
+            arrival_times = rvg.generate_nhpp(lmd, end_time, rng=rng)
+        else:
+            arrival_times = rvg.generate_poisson_process(lmd, end_time, rng)
+        departure_times = arrival_times
+        for mu in mus:
+            services = mu.sample(len(arrival_times), rng) if rvg.is_distribution(mu) else [rvg.generate_exponential_variable(mu, rng) for _ in arrival_times]
+            departure_times = lindley_departures(departure_times, services)
+
+    exceeded_time = max(0.0, departure_times[-1] - end_time) if departure_times else 0.0
+    return arrival_times, departure_times, exceeded_time
@@ -0,0 +1,107 @@
+import heapq
+import math
+import src.random_variable_generator as rvg
+def simulate_multi_server_queue(lmd : float, mus, end_time : float, stream=None, observer=None,
+                                arrival_stream=None, service_streams=None, rng=None):
+    """Simulate a queue attended by len(mus) parallel servers with arrival rate lambda up to time end_time.
+    Customers are attended in order of arrival by the free server with the lowest index.
+    Parameters :
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      mus : Exponential rate for the service time of each server, or a rvg.Distribution of its service times
+      end_time : Time until the system will accept new arrivals
+      stream : Optional source of event times exposing next_time(t, rate) (e.g. rvg.ExponentialBuffer)
+      arrival_stream, service_streams : Optional dedicated streams for the arrivals and each server
+                                        (e.g. from rvg.CommonRandomNumbers), overriding stream
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      observer : Optional SimulationObserver notified of every event, the output lists are not built
+
+    Return:
+      arrival_times -> list(float) : times of arrival times for each customer (empty with an observer).
+      departure_times -> list(float) : times of departure times for each customer (empty with an observer).
+      exceeded_time -> float : time past close time that the system remains attending customers.
+      served -> list(int) : number of customers served by each server
+    """
+
+    # Source of arrival and service times
+    next_arrival, next_service = rvg.next_time_functions(len(mus), stream, arrival_stream, service_streams, rng, lmd, end_time, mus)
+
+    # time variable
+    t = 0.0     # keeps track of current simulated time
+
+    # System State
+    # free : indexes of the free servers (min-heap)
+    # in_service : number of customers that have started their service, the next
+    #              customer in line is always customer in_service
+    free = list(range(len(mus)))
+    in_service = 0
+    n_a = 0     # number of arrivals
+
+    # Event List(t_a, busy)
+    # busy : (completion time, server, customer) of each busy server (min-heap)
+    t_a = next_arrival(0, lmd)  # time of next arrival
+    busy = []
+
+    # Output Variables
+    served = [0] * len(mus)     # number of customers served by each server
+    arrival_times = []
+    departure_times = []
+
+    while True :
+        t_d = busy[0][0] if busy else math.inf     # next service completion time
+
+        # Next Event : Customer Arrival
+        if t_a == min(t_a, t_d, end_time):
+            t = t_a                                 # update current time to next arrival
+            customer = n_a                          # current customer
+            n_a += 1                                # update number of arrivals
+
+            t_a = next_arrival(t, lmd)              # generate new arrival time
+
+            # if there is a free server, the one with the lowest index attends the customer
+            # otherwise the customer waits in line
+            server = -1
+            if free:
+                server = heapq.heappop(free)
+                heapq.heappush(busy, (next_service[server](t, mus[server]), server, customer))
+                in_service += 1
+
+            # Collect arrival time of customer i
+            if observer is None :
+                arrival_times.append(t)
+                departure_times.append(math.nan)    # filled when the customer departs
+            else :
+                observer.on_arrival(t, customer)
+                if server != -1 :
+                    observer.on_service_start(t, customer, server)
+
+        # Next Event : Service Completion
+        elif busy:
+            t, server, customer = heapq.heappop(busy)   # update current time to the completion
+            served[server] += 1                         # update number of customers attended by the server
+
+            # Collect departure time of customer i
+            if observer is None :
+                departure_times[customer] = t
+            else :
+                observer.on_service_end(t, customer, server)
+                observer.on_departure(t, customer)
+
+            # the next customer in line is attended by the server, if there is none the server stays free
+            if in_service < n_a:
+                heapq.heappush(busy, (next_service[server](t, mus[server]), server, in_service))
+                if observer is not None :
+                    observer.on_service_start(t, in_service, server)
+                in_service += 1
+            else:
+                heapq.heappush(free, server)
+
+        # Event : System closed and no customers remaining
+        else :
+            exceeded_time = max(0.0, t - end_time)
+
+            if observer is not None :
+                observer.on_close(t)
+
+            return arrival_times, departure_times, exceeded_time, served
@@ -0,0 +1,225 @@
+import time
+from src.online_statistics import RunningStatistics, SummaryStatistics, TimeWeightedStatistics
+
+class SimulationObserver:
+    """Receives the events of a simulation in place of the arrival/departure lists.
+
+    Simulators given an observer call these methods as the events happen and do
+    not build their output lists. Customers are numbered in order of arrival and
+    servers from 0. Every method does nothing by default."""
+
+    def on_arrival(self, t : float, customer : int):
+        """A customer arrives to the system."""
+
+    def on_service_start(self, t : float, customer : int, server : int):
+        """A server starts attending a customer."""
+
+    def on_service_end(self, t : float, customer : int, server : int):
+        """A server finishes attending a customer."""
+
+    def on_abandon(self, t : float, customer : int):
+        """A customer who is not in service leaves the system (blocked, balking or reneging),
+        on_departure follows."""
+
+    def on_departure(self, t : float, customer : int):
+        """A customer leaves the system."""
+
+    def on_close(self, t : float):
+        """The system is closed and empty, the simulation ends at time t."""
+
+class StatisticsObserver(SimulationObserver):
+    """Online statistics of a simulation in memory proportional to the customers in the system.
+
+    Attributes (SummaryStatistics):
+      time_in_system : time from arrival to departure of each customer
+      waiting_time : total time each customer waits in line before its services
+      queue_length : number of customers waiting in line found by each arrival
+      abandoned : number of customers who left without being served"""
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99)):
+        self.time_in_system = SummaryStatistics(quantiles)
+        self.waiting_time = SummaryStatistics(quantiles)
+        self.queue_length = SummaryStatistics(quantiles)
+        self.abandoned = 0
+
+        # System State
+        self.n = 0              # number of customers on the system
+        self.busy = 0           # number of busy servers
+        self.arrival = {}       # arrival time of each customer on the system
+        self.ready = {}         # time each customer joined its current line
+        self.waited = {}        # time each customer has waited so far
+
+    def on_arrival(self, t, customer):
+        self.queue_length.add(self.n - self.busy)
+        self.n += 1
+        self.arrival[customer] = t
+        self.ready[customer] = t
+        self.waited[customer] = 0.0
+
+    def on_service_start(self, t, customer, server):
+        self.busy += 1
+        self.waited[customer] += t - self.ready[customer]
+
+    def on_service_end(self, t, customer, server):
+        self.busy -= 1
+        self.ready[customer] = t
+
+    def on_abandon(self, t, customer):
+        self.abandoned += 1
+        self.waited[customer] += t - self.ready[customer]
+
+    def on_departure(self, t, customer):
+        self.n -= 1
+        self.time_in_system.add(t - self.arrival.pop(customer))
+        self.waiting_time.add(self.waited.pop(customer))
+        del self.ready[customer]
+
+class MetricsObserver(SimulationObserver):
+    """Time-weighted state of a simulation, event counts and wall time per event.
+
+    Parameters:
+      server_stations : station of each server, for models whose stations are visited in
+                        order (e.g. (0, 1) for two servers in series). By default all the
+                        servers belong to a single station, and a ValueError is raised when a
+                        customer starts a second service (a model with stations in series).
+
+    Attributes:
+      number_in_system, queue_length : TimeWeightedStatistics of the customers in the system and waiting in line
+      station_number : TimeWeightedStatistics of the customers on each station (n_1, n_2, ...)
+      busy : TimeWeightedStatistics (0 or 1) of each server, its mean is the utilisation of the server
+      busy_periods : RunningStatistics of the length of the periods with customers in the system
+      event_counts : number of notifications of each event type
+      event_time : wall time in seconds spent since the previous notification, by event type"""
+
+    def __init__(self, server_stations=None):
+        self.server_stations = server_stations
+        stations = max(server_stations) + 1 if server_stations else 1
+
+        self.number_in_system = TimeWeightedStatistics()
+        self.queue_length = TimeWeightedStatistics()
+        self.station_number = [TimeWeightedStatistics() for _ in range(stations)]
+        self.busy = {}
+        self.busy_periods = RunningStatistics()
+
+        self.event_counts = dict.fromkeys(["arrival", "service_start", "service_end", "abandon", "departure"], 0)
+        self.event_time = dict.fromkeys(self.event_counts, 0.0)
+
+        # System State
+        self.busy_servers = 0
+        self.busy_period_start = 0.0
+        self.station = {}       # station of each customer on the system
+        self.waiting = set()    # customers waiting in line
+        self.wall_start = self.wall_last = time.perf_counter()
+        self.wall_time = 0.0
+
+    def count(self, event : str):
+        """Count an event and charge it the wall time since the previous one."""
+        now = time.perf_counter()
+        self.event_counts[event] += 1
+        self.event_time[event] += now - self.wall_last
+        self.wall_last = now
+
+    def server(self, server : int):
+        """Busy state of a server, created idle on first use."""
+        if server not in self.busy:
+            self.busy[server] = TimeWeightedStatistics()
+        return self.busy[server]
+
+    def on_arrival(self, t, customer):
+        self.count("arrival")
+        if self.number_in_system.value == 0:
+            self.busy_period_start = t
+
+        self.number_in_system.add(t, 1)
+        self.queue_length.add(t, 1)
+        self.station_number[0].add(t, 1)
+        self.station[customer] = 0
+        self.waiting.add(customer)
+
+    def on_service_start(self, t, customer, server):
+        self.count("service_start")
+        if self.server_stations is not None and server >= len(self.server_stations):
+            raise ValueError(f"server {server} has no station in server_stations")
+        if customer not in self.waiting:
+            raise ValueError(f"customer {customer} starts a service at a station it did not join, "
+                             "give server_stations for models with stations in series")
+        self.waiting.remove(customer)
+        self.busy_servers += 1
+        self.queue_length.add(t, -1)
+        self.server(server).update(t, 1)
+
+    def on_service_end(self, t, customer, server):
+        self.count("service_end")
+        self.busy_servers -= 1
+        self.server(server).update(t, 0)
+
+        # the customer moves to the next station or waits to leave the system
+        station = self.station[customer]
+        self.station_number[station].add(t, -1)
+        if station + 1 < len(self.station_number):
+            self.station[customer] = station + 1
+            self.station_number[station + 1].add(t, 1)
+            self.queue_length.add(t, 1)
+            self.waiting.add(customer)
+
+    def on_abandon(self, t, customer):
+        self.count("abandon")
+        self.waiting.discard(customer)
+        self.queue_length.add(t, -1)
+        self.station_number[self.station[customer]].add(t, -1)
+
+    def on_departure(self, t, customer):
+        self.count("departure")
+        del self.station[customer]
+        self.number_in_system.add(t, -1)
+
+        if self.number_in_system.value == 0:
+            self.busy_periods.add(t - self.busy_period_start)
+
+    def on_close(self, t):
+        for stats in [self.number_in_system, self.queue_length, *self.station_number, *self.busy.values()]:
+            stats.update(t, stats.value)
+        self.wall_time = time.perf_counter() - self.wall_start
+
+    def utilisation(self, server : int):
+        """Fraction of the simulated time the server was busy."""
+        return self.server(server).mean
+
+    @property
+    def events(self):
+        """Total number of event notifications."""
+        return sum(self.event_counts.values())
+
+    def wall_time_per_event(self):
+        """Mean wall time in seconds of each event type."""
+        return {event : self.event_time[event] / count if count else 0.0 for event, count in self.event_counts.items()}
+
+class ObserverGroup(SimulationObserver):
+    """Forwards the events of a simulation to several observers, e.g. statistics and a trace."""
+
+    def __init__(self, *observers):
+        self.observers = observers
+
+    def on_arrival(self, t, customer):
+        for observer in self.observers:
+            observer.on_arrival(t, customer)
+
+    def on_service_start(self, t, customer, server):
+        for observer in self.observers:
+            observer.on_service_start(t, customer, server)
+
+    def on_service_end(self, t, customer, server):
+        for observer in self.observers:
+            observer.on_service_end(t, customer, server)
+
+    def on_abandon(self, t, customer):
+        for observer in self.observers:
+            observer.on_abandon(t, customer)
+
+    def on_departure(self, t, customer):
+        for observer in self.observers:
+            observer.on_departure(t, customer)
+
+    def on_close(self, t):
+        for observer in self.observers:
+            observer.on_close(t)
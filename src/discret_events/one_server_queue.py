@@ -1,18 +1,52 @@
-from src.random_variable_generator import rvg
+from src.random_variable_generator.streams import next_time_functions
+from src.discret_events.lindley import simulate_fifo_tandem_queue
+from src.discret_events.kernels import check_backend, run_kernel, one_server_kernel
 import math
 
-def simulate_one_server_queue(lmd : float, mu : float, end_time : float):
+def simulate_one_server_queue(lmd : float, mu : float, end_time : float, stream=None, observer=None, method : str = "events",
+                              arrival_stream=None, service_streams=None, rng=None, backend : str = "python",
+                              profiler=None):
     """Simulate a one-server queue with arrival rate lambda and service rate mu up to time end_time.
     Parameters:
-      lmd : Poisson rate for the arrival times
-      mu  : Exponential rate for the service time
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      mu  : Exponential rate for the service time, or a rvg.Distribution of the service times
       end_time : Time until the system will accept new arrivals
+      stream : Optional source of event times exposing next_time(t, rate) (e.g. rvg.ExponentialBuffer)
+      arrival_stream, service_streams : Optional dedicated streams for the arrivals and each server
+                                        (e.g. from rvg.CommonRandomNumbers), overriding stream
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      observer : Optional SimulationObserver notified of every event, the output lists are not built
+      method : "events" runs the event loop, "lindley" computes the departures with the FIFO
+               recursion D_i = max(A_i, D_{i-1}) + S_i over arrays (much faster, no stream or observer)
+      backend : "python" runs the event loop below, "numba" runs the compiled loop of
+                discret_events.kernels (no stream or observer, the loop below without Numba)
+      profiler : Optional EventProfiler (see discret_events.profiling) counting and timing the events,
+                 the sources of event times and the output appends, and sampling an event trace
 
     Return :
-        arrival_times -> list(float) : times of arrival times for each customer.
-        departure_times -> list(float) : times of departure times for each customer.
+        arrival_times -> list(float) : times of arrival times for each customer (empty with an observer).
+        departure_times -> list(float) : times of departure times for each customer (empty with an observer).
         exceeded_time -> float : time past close time that the system remains attending customers."""
 
+    if method == "lindley" :
+        if any(x is not None for x in (stream, observer, arrival_stream, service_streams, profiler)) :
+            raise ValueError("the lindley method does not support streams, observers or profilers")
+        return simulate_fifo_tandem_queue(lmd, [mu], end_time, rng)
+    elif method != "events" :
+        raise ValueError(f"unknown simulation method: {method}")
+
+    if check_backend(backend, (lmd, mu), stream, observer, arrival_stream, service_streams, profiler) :
+        return run_kernel(one_server_kernel, lmd, mu, end_time, rng=rng)
+
+    # Source of arrival and service times
+    next_arrival, (next_service,) = next_time_functions(1, stream, arrival_stream, service_streams, rng, lmd, end_time, [mu])
+
+    # Profiling : time the sources of event times and the output lists
+    if profiler is not None :
+        next_arrival, next_service = profiler.timed("generate", next_arrival, next_service)
+
     # time variable
     t = 0.0     
 
@@ -20,14 +54,26 @@ def simulate_one_server_queue(lmd : float, mu : float, end_time : float):
     n  = 0
     
     # Event List : (t_a , t_d) 
-    t_a = rvg.generate_next_poisson_time(0, lmd)    # time for next arrival
+    t_a = next_arrival(0, lmd)                  # time for next arrival
     t_d = math.inf                              # time for next departure
 
+    # Counters
+    n_a = 0     # number of arrivals
+    n_d = 0     # number of departures
+
     # Output Variables
     arrival_times = []      # list of arrival times for each customer
     departure_times = []    # list of departure times for each customer
     exceeded_time = 0.0     # time past after T that the last customer departs
 
+    # Output appends, timed when profiling
+    record_arrival = arrival_times.append
+    record_departure = departure_times.append
+
+    if profiler is not None :
+        record_arrival, record_departure = profiler.timed("record", record_arrival, record_departure)
+        profiler.start()
+
     while True :
         
         # Next Event : Customer Arrival
@@ -36,14 +82,24 @@ def simulate_one_server_queue(lmd : float, mu : float, end_time : float):
             t = t_a   # update current time to next arrival
             n += 1    # update number of customers on the system
 
-            t_a = rvg.generate_next_poisson_time(t, lmd) # generate the new arrival time
+            t_a = next_arrival(t, lmd) # generate the new arrival time
 
             # if the server is free the customer is attended
             if n == 1 :
-                t_d = rvg.generate_next_poisson_time(t, mu)  # generate the new departure time
+                t_d = next_service(t, mu)  # generate the new departure time
             
             # Collect arrival time of customer i
-            arrival_times.append(t)
+            if observer is None :
+                record_arrival(t)
+            else :
+                observer.on_arrival(t, n_a)
+                if n == 1 :
+                    observer.on_service_start(t, n_a, 0)
+
+            n_a += 1
+
+            if profiler is not None :
+                profiler.event("arrival", t, (n,))
         
         # Next Event : Customer Departure
         elif n > 0 :     
@@ -56,10 +112,21 @@ def simulate_one_server_queue(lmd : float, mu : float, end_time : float):
                 t_d = math.inf
 
             else:
-                t_d = rvg.generate_next_poisson_time(t, mu) # generate next departure time
+                t_d = next_service(t, mu) # generate next departure time
 
             # Collect departure time of customer i
-            departure_times.append(t)
+            if observer is None :
+                record_departure(t)
+            else :
+                observer.on_service_end(t, n_d, 0)
+                observer.on_departure(t, n_d)
+                if n > 0 :
+                    observer.on_service_start(t, n_d + 1, 0)
+
+            n_d += 1
+
+            if profiler is not None :
+                profiler.event("departure", t, (n,))
 
         # Next Event : System close
         else:
@@ -67,6 +134,11 @@ def simulate_one_server_queue(lmd : float, mu : float, end_time : float):
             # Collect exceeded time
             exceeded_time = max(0.0 , t - end_time)
 
+            if observer is not None :
+                observer.on_close(t)
+            if profiler is not None :
+                profiler.close(t)
+
             # Return output variables
             return arrival_times, departure_times, exceeded_time
 
@@ -0,0 +1,137 @@
+import time
+from collections import deque
+
+class EventProfiler:
+    """Opt-in instrumentation of the event loops of the simulators.
+
+    Simulators given a profiler time the sources of event times (the rvg calls or streams)
+    and the appends to their output lists, and report every event with event(kind, t, state).
+    Without a profiler the loops only pay a None check per event.
+
+    Parameters:
+      trace_every : keep a trace of every k-th event (0 for no trace)
+      callback : Optional function(index, t, kind, state) called with each sampled event
+                 instead of storing it in traces
+      max_traces : number of most recent sampled events kept in traces (None for all)
+      clock : function returning a wall time in seconds
+
+    Attributes:
+      counts : number of events of each type ("arrival", "service_end", "departure", or the
+               event types of queue_network for a QueueNetwork)
+      event_time : wall time in seconds spent on each event type, from the end of the previous event
+      section_time, section_calls : wall time and calls of each timed section
+                                    ("generate" for the event time sources, "record" for the outputs)
+      traces : sampled events as (index, t, kind, state), state being the system state of the
+               simulator after the event (e.g. (n,) for one server)
+      wall_time : wall time in seconds from start to close"""
+
+    def __init__(self, trace_every : int = 0, callback=None, max_traces : int = None, clock=time.perf_counter):
+        self.trace_every = trace_every
+        self.callback = callback
+        self.clock = clock
+
+        self.counts = {}
+        self.event_time = {}
+        self.section_time = {}
+        self.section_calls = {}
+        self.traces = deque(maxlen=max_traces)
+        self.events = 0
+        self.wall_time = 0.0
+        self.end_time = 0.0     # simulated time at close
+        self.overhead = self.calibrate()
+
+        self.wall_start = self.last = clock()
+
+    def calibrate(self, calls : int = 1000):
+        """Wall time in seconds added by timing one call, measured on a function doing nothing."""
+        def nothing():
+            pass
+
+        clock = self.clock
+        start = clock()
+        for _ in range(calls):
+            nothing()
+        bare = clock() - start
+
+        start = clock()
+        for _ in range(calls):
+            started = clock()
+            nothing()
+            clock() - started
+        return max(0.0, (clock() - start - bare) / calls)
+
+    def start(self):
+        """Start the wall clock, called by the simulator before its first event."""
+        self.wall_start = self.last = self.clock()
+
+    def timed(self, section : str, *functions):
+        """Wrap functions so that their calls are charged to section. Returns the wrapped functions as a list."""
+        self.section_time.setdefault(section, 0.0)
+        self.section_calls.setdefault(section, 0)
+        return [self.wrap(section, function) for function in functions]
+
+    def wrap(self, section : str, function):
+        clock = self.clock
+        section_time = self.section_time
+        section_calls = self.section_calls
+
+        def timed_function(*args):
+            started = clock()
+            result = function(*args)
+            section_time[section] += clock() - started
+            section_calls[section] += 1
+            return result
+
+        return timed_function
+
+    def event(self, kind : str, t : float, state):
+        """Count an event, charge it the wall time since the previous one and sample it for the trace."""
+        now = self.clock()
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.event_time[kind] = self.event_time.get(kind, 0.0) + now - self.last
+        self.events += 1
+
+        if self.trace_every and self.events % self.trace_every == 0:
+            if self.callback is None:
+                self.traces.append((self.events, t, kind, state))
+            else:
+                self.callback(self.events, t, kind, state)
+
+        self.last = self.clock()    # the profiler's own work is not charged to the next event
+
+    def close(self, t : float):
+        """The simulation ends at time t."""
+        self.end_time = t
+        self.wall_time = self.clock() - self.wall_start
+
+    def breakdown(self):
+        """Share of the event loop wall time spent in each section.
+
+        The time of the events not spent in a timed section goes to "loop" : the selection of
+        the next event (min(...) or the heap) and the state updates, except the estimated cost
+        of timing the sections (see calibrate), reported as "profiling".
+
+        Return :
+          shares -> dict(str, float) : fraction of the event wall time of each section, "loop" and "profiling"."""
+        total = sum(self.event_time.values())
+        if total <= 0:
+            return {}
+
+        shares = {section : spent / total for section, spent in self.section_time.items()}
+        rest = total - sum(self.section_time.values())
+        profiling = min(rest, sum(self.section_calls.values()) * self.overhead)
+        shares["loop"] = (rest - profiling) / total
+        shares["profiling"] = profiling / total
+        return shares
+
+    def report(self):
+        """Event counts, mean wall time in seconds per event type, timed sections and breakdown, as a dict."""
+        return {
+            "events" : self.events,
+            "wall_time" : self.wall_time,
+            "counts" : dict(self.counts),
+            "time_per_event" : {kind : self.event_time[kind] / count for kind, count in self.counts.items()},
+            "sections" : {section : {"time" : self.section_time[section], "calls" : self.section_calls[section]}
+                          for section in self.section_time},
+            "breakdown" : self.breakdown(),
+        }
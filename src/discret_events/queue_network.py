@@ -0,0 +1,380 @@
+import heapq
+import math
+import os
+import pickle
+import random
+from collections import deque
+import src.random_variable_generator as rvg
+
+# Event types of the future event list
+ARRIVAL = "arrival"             # external arrival to the entry station
+SERVICE_END = "service_end"     # service completion at (station, server)
+RENEGE = "renege"               # patience of a waiting customer runs out
+
+class Station:
+    """Description of a service station of a queue network.
+
+    Parameters:
+      rates : Exponential service rate of each server of the station, or a rvg.Distribution of its service times
+      routing : list of (probability, station index) pairs followed by customers
+                leaving the station. The remaining probability mass leaves the system.
+      capacity : maximum number of customers on the station (in service and waiting),
+                 customers finding it full are lost (blocked). None for no limit.
+      balking : function of the number of customers waiting giving the probability that a
+                customer who would have to wait leaves instead (balks). Must be picklable
+                (e.g. a module function) to save checkpoints.
+      patience : rate of the exponential time a customer waits in line before leaving
+                 (reneging). None for customers who never leave the line."""
+
+    def __init__(self, rates, routing=(), capacity : int = None, balking=None, patience : float = None):
+        self.rates = list(rates)
+        self.routing = list(routing)
+        self.capacity = capacity
+        self.balking = balking
+        self.patience = patience
+
+class EventScheduler:
+    """Future event list kept as a binary heap ordered by (time, insertion order).
+
+    Scheduling and extracting the next event are O(log n) in the number of pending events.
+    Cancelled events (e.g. abandonment timers of customers who started service) are only
+    marked and skipped when they reach the top of the heap. The heap is rebuilt without
+    them when they become the majority, so cancelling is O(1) amortized."""
+
+    def __init__(self):
+        self.events = []
+        self.count = 0              # insertion counter, breaks ties between simultaneous events
+        self.cancelled = set()      # ids of the pending events cancelled
+
+    def schedule(self, time : float, kind : str, data=None):
+        """Add an event of type kind at the given time and return its id."""
+        event_id = self.count
+        heapq.heappush(self.events, (time, event_id, kind, data))
+        self.count += 1
+        return event_id
+
+    def cancel(self, event_id : int):
+        """Cancel a pending event given the id returned by schedule."""
+        self.cancelled.add(event_id)
+        if len(self.cancelled) > 64 and 2 * len(self.cancelled) > len(self.events):
+            self.events = [event for event in self.events if event[1] not in self.cancelled]
+            heapq.heapify(self.events)
+            self.cancelled.clear()
+
+    def pop(self):
+        """Remove and return the next event as (time, kind, data)."""
+        time, event_id, kind, data = heapq.heappop(self.events)
+        while self.cancelled and event_id in self.cancelled:
+            self.cancelled.remove(event_id)
+            time, event_id, kind, data = heapq.heappop(self.events)
+        return time, kind, data
+
+    def __len__(self):
+        return len(self.events) - len(self.cancelled)
+
+class QueueNetwork:
+    """Discrete event simulation of an open network of multi-server FIFO stations.
+
+    Customers arrive following a Poisson process with rate lmd to the entry station
+    until end_time, are served by the first free server (lowest index) of each station
+    and are routed between stations until they leave the system.
+
+    Event handlers are looked up by event type in the handlers dict and called as
+    handler(time, data), so models can override them or schedule their own event types.
+
+    Given an observer, it is notified of every event and the output lists are not built.
+    Servers are numbered consecutively across stations for the observer.
+
+    Customers lost to a full station, balking or reneging (see Station) leave the system
+    without service : their departure time is the time they leave, observers are notified
+    with on_abandon followed by on_departure, and they are counted by station in the
+    blocked, balked and reneged lists. Waiting customers who renege are removed lazily
+    from their line, so every event stays O(log n) with many customers waiting.
+
+    The whole simulation state (clock, stations, pending events, outputs, observer and
+    stream) lives in the object, so it can be saved with save_checkpoint and continued
+    bit-identically after QueueNetwork.resume. Custom handlers, streams and observers
+    must be picklable for that."""
+
+    def __init__(self, lmd : float, stations, end_time : float, entry : int = 0, stream=None, observer=None,
+                 arrival_stream=None, service_streams=None, rng=None):
+        self.lmd = lmd
+        self.stations = list(stations)
+        self.end_time = end_time
+        self.entry = entry
+        self.observer = observer
+        self.rng = rng
+
+        # Observer index of the first server of each station
+        self.server_offsets = []
+        offset = 0
+        for station in self.stations:
+            self.server_offsets.append(offset)
+            offset += len(station.rates)
+
+        # Source of arrival and service times
+        self.next_arrival, self.next_service = rvg.next_time_functions(offset, stream, arrival_stream, service_streams, rng, lmd, end_time,
+                                                                          [rate for s in self.stations for rate in s.rates])
+
+        # time variable
+        self.t = 0.0
+        self.started = False    # whether the first arrival has been scheduled
+        self.events = 0         # number of events processed
+
+        # System State : waiting line and free servers (min-heap of indexes) of each station
+        self.queues = [deque() for _ in self.stations]
+        self.waiting = [set() for _ in self.stations]       # customers in each line, reneged ones are only removed from here
+        self.free_servers = [list(range(len(s.rates))) for s in self.stations]
+        self.renege_timers = {}                             # pending RENEGE event of each waiting customer
+
+        # Event List
+        self.scheduler = EventScheduler()
+        self.handlers = {ARRIVAL : self.handle_arrival, SERVICE_END : self.handle_service_end, RENEGE : self.handle_renege}
+
+        # Output Variables
+        self.n_a = 0                                        # number of arrivals
+        self.arrival_times = []                             # arrival time of each customer
+        self.departure_times = []                           # departure time of each customer
+        self.served = [[0] * len(s.rates) for s in self.stations]  # customers served by each server
+        self.blocked = [0] * len(self.stations)             # customers lost to a full station
+        self.balked = [0] * len(self.stations)              # customers who left instead of waiting
+        self.reneged = [0] * len(self.stations)             # customers who left the line
+
+    def run(self, checkpoint_path : str = None, checkpoint_every : int = 100000, profiler=None):
+        """Run the simulation until the system is closed and empty.
+
+        Parameters:
+          checkpoint_path : Optional file where the state is saved every checkpoint_every events
+          checkpoint_every : number of events between checkpoints
+          profiler : Optional EventProfiler counting, timing and sampling the events by type, with
+                     the length of each line as state (the sources of event times are not timed)
+
+        Return :
+          arrival_times -> list(float) : times of arrival times for each customer.
+          departure_times -> list(float) : times of departure times for each customer.
+          exceeded_time -> float : time past close time that the system remains attending customers.
+          served -> list(list(int)) : number of customers served by each server of each station."""
+
+        self.start()
+
+        scheduler = self.scheduler
+        handlers = self.handlers
+        if profiler is not None:
+            profiler.start()
+
+        while len(scheduler) > 0:
+            time, kind, data = scheduler.pop()
+            self.t = time
+            handlers[kind](time, data)
+
+            self.events += 1
+            if profiler is not None:
+                profiler.event(kind, time, tuple(len(line) for line in self.waiting))
+            if checkpoint_path is not None and self.events % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint_path)
+
+        exceeded_time = max(0.0, self.t - self.end_time)
+
+        if self.observer is not None:
+            self.observer.on_close(self.t)
+        if profiler is not None:
+            profiler.close(self.t)
+
+        return self.arrival_times, self.departure_times, exceeded_time, self.served
+
+    def start(self):
+        """Schedule the first arrival, if it has not been done yet."""
+        if self.started:
+            return
+        self.started = True
+
+        first_arrival = self.next_arrival(0, self.lmd)
+        if first_arrival <= self.end_time:
+            self.scheduler.schedule(first_arrival, ARRIVAL)
+
+    def step(self):
+        """Process the next event. Returns False when there are no events left."""
+        self.start()
+        if len(self.scheduler) == 0:
+            return False
+
+        time, kind, data = self.scheduler.pop()
+        self.t = time
+        self.handlers[kind](time, data)
+        self.events += 1
+        return True
+
+    def save_checkpoint(self, path : str):
+        """Save the simulation state and the state of the random generators to a binary file.
+
+        The file is replaced atomically, so a crash while saving keeps the previous checkpoint."""
+        rng_state = (random.getstate(), rvg.np.random.get_state() if rvg.np is not None else None)
+
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump((self, rng_state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def resume(path : str):
+        """Load a simulation saved with save_checkpoint and restore the random generators."""
+        with open(path, "rb") as f:
+            network, (state, np_state) = pickle.load(f)
+
+        random.setstate(state)
+        if np_state is not None:
+            rvg.np.random.set_state(np_state)
+        return network
+
+    def handle_arrival(self, t : float, data):
+        """External arrival : a new customer enters the entry station."""
+        customer = self.n_a
+        self.n_a += 1
+
+        if self.observer is None:
+            self.arrival_times.append(t)
+            self.departure_times.append(math.nan)     # filled when the customer leaves
+        else:
+            self.observer.on_arrival(t, customer)
+
+        next_arrival = self.next_arrival(t, self.lmd)
+        if next_arrival <= self.end_time:
+            self.scheduler.schedule(next_arrival, ARRIVAL)
+
+        self.enter(t, self.entry, customer)
+
+    def handle_service_end(self, t : float, data):
+        """Service completion : the customer is routed and the server takes the next in line."""
+        station, server, customer = data
+        self.served[station][server] += 1
+
+        if self.observer is not None:
+            self.observer.on_service_end(t, customer, self.server_offsets[station] + server)
+
+        queue = self.queues[station]
+        waiting = self.waiting[station]
+        while queue and queue[0] not in waiting:
+            queue.popleft()     # reneged customer
+
+        if queue:
+            next_customer = queue.popleft()
+            waiting.remove(next_customer)
+            if next_customer in self.renege_timers:
+                self.scheduler.cancel(self.renege_timers.pop(next_customer))
+            self.start_service(t, station, server, next_customer)
+        else:
+            heapq.heappush(self.free_servers[station], server)
+
+        self.route(t, station, customer)
+
+    def handle_renege(self, t : float, data):
+        """The patience of a waiting customer runs out : the customer leaves the line."""
+        station, customer = data
+        del self.renege_timers[customer]
+        self.waiting[station].remove(customer)      # its entry of the line is skipped later
+        self.reneged[station] += 1
+        self.abandon(t, customer)
+
+    def enter(self, t : float, station : int, customer : int):
+        """Customer joins a station : served by the first free server or waits in line,
+        unless the station is full or the customer balks."""
+        free = self.free_servers[station]
+        if free:
+            self.start_service(t, station, heapq.heappop(free), customer)
+            return
+
+        description = self.stations[station]
+        waiting = len(self.waiting[station])
+        if description.capacity is not None and len(description.rates) + waiting >= description.capacity:
+            self.blocked[station] += 1
+            self.abandon(t, customer)
+        elif description.balking is not None and rvg.generate_U(self.rng) < description.balking(waiting):
+            self.balked[station] += 1
+            self.abandon(t, customer)
+        else:
+            self.queues[station].append(customer)
+            self.waiting[station].add(customer)
+            if description.patience is not None:
+                renege_time = rvg.generate_next_poisson_time(t, description.patience, self.rng)
+                self.renege_timers[customer] = self.scheduler.schedule(renege_time, RENEGE, (station, customer))
+
+    def start_service(self, t : float, station : int, server : int, customer : int):
+        """Schedule the service completion of customer on the given server."""
+        rate = self.stations[station].rates[server]
+        next_service = self.next_service[self.server_offsets[station] + server]
+        self.scheduler.schedule(next_service(t, rate), SERVICE_END, (station, server, customer))
+
+        if self.observer is not None:
+            self.observer.on_service_start(t, customer, self.server_offsets[station] + server)
+
+    def route(self, t : float, station : int, customer : int):
+        """Send a customer leaving station to its next station or out of the system."""
+        routing = self.stations[station].routing
+        if routing:
+            u = rvg.generate_U(self.rng)
+            for probability, next_station in routing:
+                u -= probability
+                if u < 0:
+                    self.enter(t, next_station, customer)
+                    return
+
+        self.leave(t, customer)
+
+    def abandon(self, t : float, customer : int):
+        """A customer who is not in service leaves the system."""
+        if self.observer is not None:
+            self.observer.on_abandon(t, customer)
+        self.leave(t, customer)
+
+    def leave(self, t : float, customer : int):
+        """Record the departure of a customer."""
+        if self.observer is None:
+            self.departure_times[customer] = t
+        else:
+            self.observer.on_departure(t, customer)
+
+
+def simulate_queue_network(lmd : float, stations, end_time : float, entry : int = 0, stream=None, observer=None,
+                           checkpoint_path : str = None, checkpoint_every : int = 100000,
+                           arrival_stream=None, service_streams=None, rng=None, profiler=None):
+    """Simulate an open queue network with arrival rate lambda to the entry station up to time end_time.
+    Parameters:
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      stations : list(Station) describing servers and routing of each station
+      end_time : Time until the system will accept new arrivals
+      entry : index of the station receiving external arrivals
+      stream : Optional source of event times exposing next_time(t, rate) (e.g. rvg.ExponentialBuffer)
+      arrival_stream, service_streams : Optional dedicated streams for the arrivals and each server
+                                        (numbered across stations), overriding stream
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      observer : Optional SimulationObserver notified of every event, the output lists are not built
+      checkpoint_path : Optional file where the state is saved every checkpoint_every events,
+                        resume with resume_queue_network
+      profiler : Optional EventProfiler (see discret_events.profiling) counting, timing and sampling the events
+
+    Return :
+        arrival_times -> list(float) : times of arrival times for each customer (empty with an observer).
+        departure_times -> list(float) : times of departure times for each customer (empty with an observer).
+        exceeded_time -> float : time past close time that the system remains attending customers.
+        served -> list(list(int)) : number of customers served by each server of each station."""
+    network = QueueNetwork(lmd, stations, end_time, entry, stream, observer, arrival_stream, service_streams, rng)
+    return network.run(checkpoint_path, checkpoint_every, profiler)
+
+def resume_queue_network(path : str, checkpoint_every : int = 100000):
+    """Continue a simulation from a checkpoint saved by simulate_queue_network or QueueNetwork.run,
+    saving new checkpoints to the same file. Returns the same values as simulate_queue_network."""
+    return QueueNetwork.resume(path).run(path, checkpoint_every)
+
+def one_server_stations(mu : float, capacity : int = None, balking=None, patience : float = None):
+    """Stations of a one-server queue (M/M/1, M/M/1/K with a capacity, see Station for the other options)."""
+    return [Station([mu], capacity=capacity, balking=balking, patience=patience)]
+
+def parallel_servers_stations(mus, capacity : int = None, balking=None, patience : float = None):
+    """Stations of a queue attended by parallel servers with rates mus (M/M/k, M/M/k/K with a capacity)."""
+    return [Station(mus, capacity=capacity, balking=balking, patience=patience)]
+
+def in_series_servers_stations(mus):
+    """Stations of a line of single servers with rates mus visited in order (k-stage tandem)."""
+    k = len(mus)
+    return [Station([mu], [(1.0, i + 1)] if i + 1 < k else []) for i, mu in enumerate(mus)]
@@ -0,0 +1,120 @@
+import json
+import math
+import mmap
+import os
+from array import array
+from src.discret_events.observers import SimulationObserver
+
+# Columns of a trace and their array typecodes
+TRACE_COLUMNS = {
+    "arrival" : "d",        # arrival time of the customer
+    "service_start" : "d",  # time its first service starts
+    "departure" : "d",      # time it leaves the system
+    "server" : "q",         # server that attended its last service
+}
+
+class TraceRecorder(SimulationObserver):
+    """Observer recording one row per customer in compact columnar arrays.
+
+    Columns are array('d') / array('q') buffers (8 bytes per value). Given a path,
+    rows are spilled to one binary file per column in that directory as soon as
+    spill_rows consecutive customers have departed, so memory stays bounded by the
+    customers in the system plus spill_rows. The files can be read back zero-copy
+    with load_trace."""
+
+    def __init__(self, path : str = None, spill_rows : int = 65536):
+        self.path = path
+        self.spill_rows = spill_rows
+        self.columns = {name : array(typecode) for name, typecode in TRACE_COLUMNS.items()}
+
+        self.base = 0           # customer of the first row kept in memory
+        self.completed = 0      # rows in memory whose customer has departed, counted from the first one
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            for name in self.columns:
+                open(column_file(path, name), "wb").close()
+
+    def __len__(self):
+        return self.base + len(self.columns["arrival"])
+
+    def on_arrival(self, t, customer):
+        columns = self.columns
+        columns["arrival"].append(t)
+        columns["service_start"].append(math.nan)
+        columns["departure"].append(math.nan)
+        columns["server"].append(-1)
+
+    def on_service_start(self, t, customer, server):
+        service_start = self.columns["service_start"]
+        row = customer - self.base
+        if math.isnan(service_start[row]):
+            service_start[row] = t
+
+    def on_service_end(self, t, customer, server):
+        self.columns["server"][customer - self.base] = server
+
+    def on_departure(self, t, customer):
+        departure = self.columns["departure"]
+        departure[customer - self.base] = t
+
+        # Advance the completed prefix and spill it when it is large enough
+        while self.completed < len(departure) and not math.isnan(departure[self.completed]):
+            self.completed += 1
+        if self.path is not None and self.completed >= self.spill_rows:
+            self.spill(self.completed)
+
+    def on_close(self, t):
+        if self.path is not None:
+            self.spill(len(self.columns["arrival"]))
+            self.write_metadata(self.path)
+
+    def spill(self, rows : int):
+        """Append the first rows kept in memory to the column files and drop them."""
+        for name, column in self.columns.items():
+            with open(column_file(self.path, name), "ab") as f:
+                column[:rows].tofile(f)
+            del column[:rows]
+
+        self.base += rows
+        self.completed -= rows
+
+    def write_metadata(self, path : str):
+        """Write the description of the column files of the trace."""
+        with open(os.path.join(path, "trace.json"), "w") as f:
+            json.dump({"rows" : len(self), "columns" : TRACE_COLUMNS}, f)
+
+    def save(self, path : str):
+        """Write an in-memory trace to path in the format read by load_trace."""
+        os.makedirs(path, exist_ok=True)
+        for name, column in self.columns.items():
+            with open(column_file(path, name), "wb") as f:
+                column.tofile(f)
+        self.write_metadata(path)
+
+
+def column_file(path : str, name : str):
+    """Binary file holding a column of the trace stored in path."""
+    return os.path.join(path, name + ".bin")
+
+def load_trace(path : str):
+    """Map the columns of a trace written by TraceRecorder into memory.
+
+    Return :
+        columns -> dict(str, memoryview) : typed views over the memory-mapped files, without copying.
+    Use numpy.asarray(view) for a zero-copy NumPy array."""
+
+    with open(os.path.join(path, "trace.json")) as f:
+        metadata = json.load(f)
+
+    columns = {}
+    for name, typecode in metadata["columns"].items():
+        if metadata["rows"] == 0:
+            columns[name] = memoryview(array(typecode))
+            continue
+
+        with open(column_file(path, name), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        columns[name] = memoryview(buffer).cast(typecode)
+
+    return columns
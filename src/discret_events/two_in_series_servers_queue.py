@@ -1,20 +1,54 @@
 import math
 import src.random_variable_generator as rvg
-def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float, end_time : float):
+from src.discret_events.lindley import simulate_fifo_tandem_queue
+from src.discret_events.kernels import check_backend, run_kernel, two_in_series_kernel
+def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float, end_time : float, stream=None, observer=None, method : str = "events",
+                                         arrival_stream=None, service_streams=None, rng=None, backend : str = "python",
+                                         profiler=None):
     """Simulate a two-in-series-server queue with arrival rate lambda, service rate mu_1 for sever 1 and mu_2 
     for server 2, up to time end_time.
 
     Parameters:
-      lmd : Poisson rate for the arrival times
-      mu_1  : Exponential rate for the service time (server 1)
-      mu_2  : Exponential rate for the service time (server 2)
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      mu_1  : Exponential rate for the service time (server 1), or a rvg.Distribution of the service times
+      mu_2  : Exponential rate for the service time (server 2), or a rvg.Distribution of the service times
       end_time : Time until the system will accept new arrivals
+      stream : Optional source of event times exposing next_time(t, rate) (e.g. rvg.ExponentialBuffer)
+      arrival_stream, service_streams : Optional dedicated streams for the arrivals and each server
+                                        (e.g. from rvg.CommonRandomNumbers), overriding stream
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      observer : Optional SimulationObserver notified of every event, the output lists are not built
+      method : "events" runs the event loop, "lindley" computes the departures with the FIFO
+               recursion D_i = max(A_i, D_{i-1}) + S_i over arrays (much faster, no stream or observer)
+      backend : "python" runs the event loop below, "numba" runs the compiled loop of
+                discret_events.kernels (no stream or observer, the loop below without Numba)
+      profiler : Optional EventProfiler (see discret_events.profiling) counting and timing the events,
+                 the sources of event times and the output appends, and sampling an event trace
 
     Return :
-        arrival_times -> list(float) : times of arrival times for each customer.
-        departure_times -> list(float) : times of departure times for each customer.
+        arrival_times -> list(float) : times of arrival times for each customer (empty with an observer).
+        departure_times -> list(float) : times of departure times for each customer (empty with an observer).
         exceeded_time -> float : time past close time that the system remains attending customers. """
 
+    if method == "lindley" :
+        if any(x is not None for x in (stream, observer, arrival_stream, service_streams, profiler)) :
+            raise ValueError("the lindley method does not support streams, observers or profilers")
+        return simulate_fifo_tandem_queue(lmd, [mu_1, mu_2], end_time, rng)
+    elif method != "events" :
+        raise ValueError(f"unknown simulation method: {method}")
+
+    if check_backend(backend, (lmd, mu_1, mu_2), stream, observer, arrival_stream, service_streams, profiler) :
+        return run_kernel(two_in_series_kernel, lmd, mu_1, mu_2, end_time, rng=rng)
+
+    # Source of arrival and service times
+    next_arrival, (next_service_1, next_service_2) = rvg.next_time_functions(2, stream, arrival_stream, service_streams, rng, lmd, end_time, [mu_1, mu_2])
+
+    # Profiling : time the sources of event times and the output lists
+    if profiler is not None :
+        next_arrival, next_service_1, next_service_2 = profiler.timed("generate", next_arrival, next_service_1, next_service_2)
+
     # time variable 
     t = 0.0     # keeps track of current simulated time
 
@@ -23,15 +57,28 @@ def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float
     n_2 = 0     # number of customers on server 2(including the one being attended)
 
     # Even List(t_a, t_1, t_2)
-    t_a = rvg.generate_next_poisson_time(0, lmd)     # time of next arrival
+    t_a = next_arrival(0, lmd)                       # time of next arrival
     t_1 = math.inf                                   # service completion time for server 1
     t_2 = math.inf                                   # service completion time for server 2
 
+    # Counters
+    n_a = 0     # number of arrivals
+    c_1 = 0     # number of customers served by server 1
+    c_2 = 0     # number of customers served by server 2
+
     # Output Variables
     arrival_times = []
     departure_times = []
     exceeded_time = 0.0    # time past after T that the last customer departs
 
+    # Output appends, timed when profiling
+    record_arrival = arrival_times.append
+    record_departure = departure_times.append
+
+    if profiler is not None :
+        record_arrival, record_departure = profiler.timed("record", record_arrival, record_departure)
+        profiler.start()
+
     while True :
 
         # Next Event : Customer Arrival
@@ -40,14 +87,24 @@ def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float
             t = t_a    # update current time to next arrival
             n_1 += 1   # update number of customers on server 1
 
-            t_a = rvg.generate_next_poisson_time(t, lmd) # generate the time of next arrival
+            t_a = next_arrival(t, lmd) # generate the time of next arrival
 
             # if the server 1 is free, the customer is attended
             if n_1 == 1 :
-                t_1 = rvg.generate_next_poisson_time(t, mu_1)
+                t_1 = next_service_1(t, mu_1)
             
             # Collect arrival time of customer i
-            arrival_times.append(t)
+            if observer is None :
+                record_arrival(t)
+            else :
+                observer.on_arrival(t, n_a)
+                if n_1 == 1 :
+                    observer.on_service_start(t, n_a, 0)
+
+            n_a += 1
+
+            if profiler is not None :
+                profiler.event("arrival", t, (n_1, n_2))
 
         # Next Event : Service Completion (server 1)
         elif t_1 <= t_2 and n_1 > 0:
@@ -57,12 +114,24 @@ def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float
             n_2 += 1    # update number of customers on server 2
 
             # if there are customers waiting to use server 1 the next customer is attended if not the server stays inactive
-            t_1 = math.inf if n_1 == 0 else rvg.generate_next_poisson_time(t, mu_1)
+            t_1 = math.inf if n_1 == 0 else next_service_1(t, mu_1)
             
 
             # if server 2 is free, the customer is attended
             if n_2 == 1 :
-                t_2 = rvg.generate_next_poisson_time(t, mu_2)
+                t_2 = next_service_2(t, mu_2)
+
+            if observer is not None :
+                observer.on_service_end(t, c_1, 0)
+                if n_1 > 0 :
+                    observer.on_service_start(t, c_1 + 1, 0)
+                if n_2 == 1 :
+                    observer.on_service_start(t, c_1, 1)
+
+            c_1 += 1
+
+            if profiler is not None :
+                profiler.event("service_end", t, (n_1, n_2))
 
         # Next Event : Service Completion (server 2)
         elif t_2 < t_1 :
@@ -71,12 +140,29 @@ def simulate_two_in_series_servers_queue(lmd : float, mu_1 : float, mu_2 : float
 
             # if there are customers waiting to use server 2 the next customer is attended if not 
             # the server stays inactive
-            t_2 = math.inf if n_2 == 0 else rvg.generate_next_poisson_time(t, mu_2)
+            t_2 = math.inf if n_2 == 0 else next_service_2(t, mu_2)
             
             # Collect departure time of customer i
-            departure_times.append(t)
+            if observer is None :
+                record_departure(t)
+            else :
+                observer.on_service_end(t, c_2, 1)
+                observer.on_departure(t, c_2)
+                if n_2 > 0 :
+                    observer.on_service_start(t, c_2 + 1, 1)
+
+            c_2 += 1
+
+            if profiler is not None :
+                profiler.event("departure", t, (n_1, n_2))
             
         # Next Event : System close
         elif n_1 + n_2 == 0:
             exceeded_time = max(0.0 , t - end_time)
+
+            if observer is not None :
+                observer.on_close(t)
+            if profiler is not None :
+                profiler.close(t)
+
             return arrival_times, departure_times, exceeded_time
\ No newline at end of file
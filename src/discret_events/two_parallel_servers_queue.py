@@ -1,21 +1,45 @@
 import math
 import src.random_variable_generator as rvg
-def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float, end_time : float):
+from src.discret_events.kernels import check_backend, run_kernel, two_parallel_kernel
+def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float, end_time : float, stream=None, observer=None,
+                                       arrival_stream=None, service_streams=None, rng=None, backend : str = "python",
+                                       profiler=None):
     """Simulate a two-parallel-servers queue with arrival rate lambda and service rates mu_1 and mu_2 up to time end_time.
     Parameters :
-      lmd : Poisson rate for the arrival times
-      mu_1  : Exponential rate for the service time (server 1)
-      mu_2  : Exponential rate for the service time (server 2)
+      lmd : Poisson rate for the arrival times, a constant or a time-varying rate
+            (callable, rvg.PiecewiseRate or (start, rate) table, see rvg.ThinningArrivals),
+            or a rvg.Distribution of the interarrival times
+      mu_1  : Exponential rate for the service time (server 1), or a rvg.Distribution of the service times
+      mu_2  : Exponential rate for the service time (server 2), or a rvg.Distribution of the service times
       end_time : Time until the system will accept new arrivals
+      stream : Optional source of event times exposing next_time(t, rate) (e.g. rvg.ExponentialBuffer)
+      arrival_stream, service_streams : Optional dedicated streams for the arrivals and each server
+                                        (e.g. from rvg.CommonRandomNumbers), overriding stream
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      observer : Optional SimulationObserver notified of every event, the output lists are not built
+      backend : "python" runs the event loop below, "numba" runs the compiled loop of
+                discret_events.kernels (no stream or observer, the loop below without Numba)
+      profiler : Optional EventProfiler (see discret_events.profiling) counting and timing the events,
+                 the sources of event times and the output appends, and sampling an event trace
     
     Return: 
-      arrival_times -> list(float) : times of arrival times for each customer.
-      departure_times -> list(float) : times of departure times for each customer.
+      arrival_times -> list(float) : times of arrival times for each customer (empty with an observer).
+      departure_times -> list(float) : times of departure times for each customer (empty with an observer).
       exceeded_time -> float : time past close time that the system remains attending customers.
       c_1 -> int : number of customers served by server 1
       c_2 -> int : number of customers served by server 2
     """
-    
+
+    if check_backend(backend, (lmd, mu_1, mu_2), stream, observer, arrival_stream, service_streams, profiler) :
+        return run_kernel(two_parallel_kernel, lmd, mu_1, mu_2, end_time, rng=rng)
+
+    # Source of arrival and service times
+    next_arrival, (next_service_1, next_service_2) = rvg.next_time_functions(2, stream, arrival_stream, service_streams, rng, lmd, end_time, [mu_1, mu_2])
+
+    # Profiling : time the sources of event times and the output lists
+    if profiler is not None :
+        next_arrival, next_service_1, next_service_2 = profiler.timed("generate", next_arrival, next_service_1, next_service_2)
+
     # time variable 
     t = 0.0     # keeps track of current simulated time
 
@@ -26,7 +50,7 @@ def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float,
     SS = (0, -1, -1)
 
     # Even List(t_a, t_1, t_2)
-    t_a = rvg.generate_next_poisson_time(0, lmd)     # time of next arrival
+    t_a = next_arrival(0, lmd)                       # time of next arrival
     t_1 = math.inf                                   # service completion time for server 1
     t_2 = math.inf                                   # service completion time for server 2
 
@@ -36,7 +60,16 @@ def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float,
     n_a = 0     # number of arrivals
 
     arrival_times = []
-    departure_times = {}
+    departure_times = []    # departure time of each customer, indexed by customer
+
+    # Output appends, timed when profiling
+    record_arrival = arrival_times.append
+    reserve_departure = departure_times.append
+    record_departure = departure_times.__setitem__
+
+    if profiler is not None :
+        record_arrival, reserve_departure, record_departure = profiler.timed("record", record_arrival, reserve_departure, record_departure)
+        profiler.start()
 
     while True :
         # Next Event : Customer Arrival
@@ -44,20 +77,31 @@ def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float,
             t = t_a     # update current time to next arrival
             n_a += 1    # update number of arrivals
 
-            t_a = rvg.generate_next_poisson_time(t,lmd)  # generate new arrival time
-            customer = n_a -1                            # current customer
+            t_a = next_arrival(t,lmd)   # generate new arrival time
+            customer = n_a -1           # current customer
 
             # Determine wich server will attend the customer
             # if Server 1 is free it will attend the customer
             # if Server 2 is free it will attend the customer if Server 1 is busy
             # if both are busy the customer will wait
-            i_1, t_1 = (customer, rvg.generate_next_poisson_time(t, mu_1)) if SS[1] == -1 else (SS[1] , t_1)
-            i_2, t_2 = (customer, rvg.generate_next_poisson_time(t, mu_1)) if SS[2] == -1 and SS[1] != -1 else (SS[2] , t_2)
+            i_1, t_1 = (customer, next_service_1(t, mu_1)) if SS[1] == -1 else (SS[1] , t_1)
+            i_2, t_2 = (customer, next_service_2(t, mu_2)) if SS[2] == -1 and SS[1] != -1 else (SS[2] , t_2)
+
+            # Collect arrival time of customer i
+            if observer is None :
+                record_arrival(t)
+                reserve_departure(math.nan)     # filled when the customer departs
+            else :
+                observer.on_arrival(t, customer)
+                if i_1 != SS[1] :
+                    observer.on_service_start(t, customer, 0)
+                elif i_2 != SS[2] :
+                    observer.on_service_start(t, customer, 1)
 
             SS = (SS[0] + 1 , i_1, i_2)  
 
-            # Collect arrival time of customer i
-            arrival_times.append(t)
+            if profiler is not None :
+                profiler.event("arrival", t, SS)
 
         # Next Event : Service Completion (server 1)
         elif(t_1 <= t_2 and t_1 < math.inf):
@@ -66,12 +110,21 @@ def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float,
             customer = SS[1]  # current customer
 
             # update next completion time and customer (server 1)
-            t_1 = math.inf if SS[0] <= 2 else rvg.generate_next_poisson_time(t, mu_1)
+            t_1 = math.inf if SS[0] <= 2 else next_service_1(t, mu_1)
             next_customer = -1 if SS[0] <= 2 else max(SS[1], SS[2]) + 1
 
             SS = (SS[0] - 1 , next_customer , SS[2])
 
-            departure_times[customer] = t
+            if observer is None :
+                record_departure(customer, t)
+            else :
+                observer.on_service_end(t, customer, 0)
+                observer.on_departure(t, customer)
+                if next_customer != -1 :
+                    observer.on_service_start(t, next_customer, 0)
+
+            if profiler is not None :
+                profiler.event("departure", t, SS)
 
         # Next Event : Service Completion (server 2)
         elif(t_2 < t_1):
@@ -80,21 +133,29 @@ def simulate_two_paralel_servers_queue(lmd : float, mu_1 : float, mu_2 : float,
             customer = SS[2]  # current customer
 
             # update next completion time and customer (server 2)
-            t_2 = math.inf if SS[0] <= 2 else rvg.generate_next_poisson_time(t, mu_2)
+            t_2 = math.inf if SS[0] <= 2 else next_service_2(t, mu_2)
             next_customer = -1 if SS[0] <= 2 else max(SS[1], SS[2]) + 1
 
             SS = (SS[0] - 1 , SS[1] , next_customer)
 
-            departure_times[customer] = t
+            if observer is None :
+                record_departure(customer, t)
+            else :
+                observer.on_service_end(t, customer, 1)
+                observer.on_departure(t, customer)
+                if next_customer != -1 :
+                    observer.on_service_start(t, next_customer, 1)
+
+            if profiler is not None :
+                profiler.event("departure", t, SS)
 
         # Event : System closed and no customers remaining
         else :
-            exceeded_time = max(0.0, end_time - t)
-            return arrival_times, convert_to_list(departure_times), exceeded_time, c_1, c_2
-
-
-def convert_to_list(d : dict) :
-    """Converts the departure times dictionary to a list"""
-    return [d[i] for i in range(len(d))]
+            exceeded_time = max(0.0, t - end_time)
 
+            if observer is not None :
+                observer.on_close(t)
+            if profiler is not None :
+                profiler.close(t)
 
+            return arrival_times, departure_times, exceeded_time, c_1, c_2
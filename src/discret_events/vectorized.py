@@ -0,0 +1,106 @@
+import src.random_variable_generator.rvg as rvg
+
+np = rvg.np
+
+def simulate_one_server_replications(lmd : float, mu : float, end_time : float, replications : int, rng=None):
+    """Simulate many independent replications of simulate_one_server_queue advancing in lockstep.
+
+    The state of every replication is kept in arrays of shape (replications,) and each step
+    processes the next event of all of them at once: the next event time is the masked
+    np.minimum of the next arrival (infinite once the system is closed) and the next departure.
+    Replications whose system is closed and empty drop out of the arrays.
+
+    Parameters:
+      lmd : Poisson rate for the arrival times
+      mu  : Exponential rate for the service time
+      end_time : Time until the system will accept new arrivals
+      replications : number of independent replications
+      rng : Optional NumPy Generator (see rvg.make_rng) used instead of the global np.random state
+
+    Return :
+      dict of arrays with one value per replication, with the metrics of
+      replication.summarize_one_server_result :
+        customers -> number of customers served.
+        avg_time_in_system -> mean time in system of the customers.
+        exceeded_time -> time past close time that the system remains attending customers.
+        utilisation -> busy time of the server over the time until the last departure."""
+    rvg._require_numpy()
+
+    # Output Variables, indexed by replication
+    customers = np.zeros(replications, dtype=np.int64)
+    avg_time_in_system = np.zeros(replications)
+    exceeded_time = np.zeros(replications)
+    utilisation = np.zeros(replications)
+
+    # State of the replications still running, index gives their position in the outputs
+    index = np.arange(replications)
+    t = np.zeros(replications)                                          # current time
+    n = np.zeros(replications, dtype=np.int64)                          # customers in the system
+    t_a = rvg.generate_exponential_batch(lmd, replications, rng=rng)    # time for next arrival
+    t_d = np.full(replications, np.inf)                                 # time for next departure
+
+    # Accumulators
+    n_a = np.zeros(replications, dtype=np.int64)    # number of arrivals
+    total_arrival = np.zeros(replications)          # sum of the arrival times
+    total_departure = np.zeros(replications)        # sum of the departure times
+    busy = np.zeros(replications)                   # time with the server busy
+    last_departure = np.zeros(replications)         # time of the last departure
+
+    while len(index) > 0:
+        # Next Event of every replication : arrivals are masked out once the system is closed
+        open_arrival = np.where(t_a <= end_time, t_a, np.inf)
+        t_next = np.minimum(open_arrival, t_d)
+        done = t_next == np.inf
+
+        # Replications closed and empty drop out
+        if done.any():
+            finished = index[done]
+            served = n_a[done]
+            duration = last_departure[done]
+            customers[finished] = served
+            avg_time_in_system[finished] = np.divide(total_departure[done] - total_arrival[done], served,
+                                                     out=np.zeros(len(finished)), where=served > 0)
+            exceeded_time[finished] = np.maximum(0.0, t[done] - end_time)
+            utilisation[finished] = np.divide(busy[done], duration, out=np.zeros(len(finished)), where=duration > 0)
+
+            keep = ~done
+            (index, t, n, t_a, t_d, t_next, open_arrival, n_a, total_arrival, total_departure, busy, last_departure) = (
+                values[keep] for values in (index, t, n, t_a, t_d, t_next, open_arrival,
+                                            n_a, total_arrival, total_departure, busy, last_departure))
+            if len(index) == 0:
+                break
+
+        busy += np.where(n > 0, t_next - t, 0.0)
+        t = t_next
+
+        # Next Event : Customer Arrival (ties go to the arrival, as in the event loop)
+        arrival = open_arrival <= t_d
+        if arrival.any():
+            at = t[arrival]
+            n[arrival] += 1
+            n_a[arrival] += 1
+            total_arrival[arrival] += at
+            t_a[arrival] = at + rvg.generate_exponential_batch(lmd, len(at), rng=rng)
+
+            # if the server is free the customer is attended
+            start = arrival & (n == 1)
+            t_d[start] = t[start] + rvg.generate_exponential_batch(mu, int(start.sum()), rng=rng)
+
+        # Next Event : Customer Departure
+        departure = ~arrival
+        if departure.any():
+            dt = t[departure]
+            n[departure] -= 1
+            total_departure[departure] += dt
+            last_departure[departure] = dt
+
+            more = departure & (n > 0)
+            t_d[departure] = np.inf
+            t_d[more] = t[more] + rvg.generate_exponential_batch(mu, int(more.sum()), rng=rng)
+
+    return {
+        "customers" : customers,
+        "avg_time_in_system" : avg_time_in_system,
+        "exceeded_time" : exceeded_time,
+        "utilisation" : utilisation,
+    }
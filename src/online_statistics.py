@@ -0,0 +1,171 @@
+import math
+
+class RunningStatistics:
+    """Mean, variance, minimum and maximum of a sequence of values in O(1) memory.
+
+    Uses Welford's online algorithm. Two accumulators can be combined with merge,
+    which gives the same result as feeding all the values to a single one."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0           # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x : float):
+        """Add a value to the statistics."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        """Combine the values of another RunningStatistics into this one."""
+        if other.count == 0:
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance of the values (0 with less than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def __repr__(self):
+        return f"RunningStatistics(count={self.count}, mean={self.mean:.4f}, std={self.std:.4f})"
+
+class P2Quantile:
+    """Estimate of the p-quantile of a sequence of values in O(1) memory.
+
+    Uses the P² algorithm of Jain and Chlamtac, which keeps five markers whose
+    heights are adjusted with a piecewise-parabolic formula as values arrive."""
+
+    def __init__(self, p : float):
+        self.p = p
+        self.heights = []                                   # marker heights
+        self.positions = [1, 2, 3, 4, 5]                    # marker positions
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]  # desired marker positions
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]     # desired position increments
+
+    def add(self, x : float):
+        """Add a value to the estimate."""
+        heights = self.heights
+
+        # The first five values initialize the markers
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        # Find the cell k containing x and update the extreme markers
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Adjust the heights of the middle markers if they are off their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def _parabolic(self, i : int, d : int):
+        """Piecewise-parabolic prediction of the height of marker i moved by d."""
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self):
+        """Current estimate of the quantile (exact while less than five values were added)."""
+        heights = self.heights
+        if len(heights) == 5:
+            return heights[2]
+        if not heights:
+            return math.nan
+        return heights[min(len(heights) - 1, int(self.p * len(heights)))]
+
+class SummaryStatistics(RunningStatistics):
+    """RunningStatistics that also tracks P² estimates of some quantiles."""
+
+    def __init__(self, quantiles=(0.5, 0.9, 0.99)):
+        super().__init__()
+        self.estimators = {p : P2Quantile(p) for p in quantiles}
+
+    def add(self, x : float):
+        """Add a value to the statistics."""
+        super().add(x)
+        for estimator in self.estimators.values():
+            estimator.add(x)
+
+    def quantile(self, p : float):
+        """Estimate of the p-quantile, p must be one of the tracked quantiles."""
+        return self.estimators[p].value
+
+class TimeWeightedStatistics:
+    """Time average of a piecewise-constant quantity, such as the number of customers in a queue.
+
+    The quantity keeps its value until the next update, and the area under it is
+    integrated as it changes."""
+
+    def __init__(self, value : float = 0.0, start : float = 0.0):
+        self.value = value
+        self.start = start
+        self.last_time = start
+        self.area = 0.0
+        self.max = value
+
+    def update(self, t : float, value : float):
+        """The quantity changes to value at time t."""
+        self.area += self.value * (t - self.last_time)
+        self.last_time = t
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def add(self, t : float, delta : float):
+        """The quantity changes by delta at time t."""
+        self.update(t, self.value + delta)
+
+    @property
+    def mean(self):
+        """Time average of the quantity from start until the last update."""
+        duration = self.last_time - self.start
+        return self.area / duration if duration > 0 else self.value
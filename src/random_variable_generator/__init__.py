@@ -1 +1,5 @@
-from .rvg import *
\ No newline at end of file
+from .rvg import *
+from .streams import *
+from .samplers import *
+from .nhpp import *
+from .distributions import *
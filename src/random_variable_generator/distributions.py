@@ -0,0 +1,203 @@
+import abc
+import bisect
+import math
+import random
+from src.random_variable_generator import rvg
+
+np = rvg.np
+
+# Service and interarrival time distributions for the simulators.
+#
+# A distribution can be given to a simulator in place of a rate (mu, mu_1, mus, lmd...).
+# Each one draws its values in blocks with sample(size, rng) and the simulator reads them
+# through a SampleBuffer, so a draw costs a list index whatever the distribution.
+
+def _use_numpy(rng):
+    """Whether the NumPy batch path can draw from rng."""
+    return np is not None and (rng is None or isinstance(rng, np.random.Generator))
+
+class Distribution(abc.ABC):
+    """Distribution of positive times.
+
+    Subclasses implement sample(size, rng) and set the mean."""
+
+    mean = math.nan
+
+    @abc.abstractmethod
+    def sample(self, size : int, rng=None):
+        """size values of the distribution, a NumPy array with NumPy and a list otherwise."""
+
+    def stream(self, block_size : int = 4096, rng=None):
+        """Buffered source of times exposing next_time(t, rate) (see SampleBuffer)."""
+        return SampleBuffer(self, block_size, rng)
+
+class SampleBuffer:
+    """Source of event times drawn from a distribution in blocks of block_size.
+
+    next_time(t, rate) returns t plus the next value, the rate argument is ignored so the
+    buffer can replace the exponential sources of the simulators."""
+
+    def __init__(self, distribution : Distribution, block_size : int = 4096, rng=None):
+        self.distribution = distribution
+        self.block_size = block_size
+        self.rng = rng
+        self._block = []
+        self._index = 0
+
+    def next_time(self, current_time : float, rate=None):
+        i = self._index
+        if i == len(self._block):
+            block = self.distribution.sample(self.block_size, self.rng)
+            self._block = block.tolist() if np is not None and isinstance(block, np.ndarray) else block
+            i = 0
+        self._index = i + 1
+        return current_time + self._block[i]
+
+class Exponential(Distribution):
+    """Exponential distribution with the given rate."""
+
+    def __init__(self, rate : float):
+        self.rate = rate
+        self.mean = 1 / rate
+
+    def sample(self, size : int, rng=None):
+        if _use_numpy(rng):
+            return rvg.generate_exponential_batch(self.rate, size, rng=rng)
+        return [rvg.generate_exponential_variable(self.rate, rng) for _ in range(size)]
+
+class Erlang(Distribution):
+    """Erlang distribution, the sum of k exponential phases with the given rate each."""
+
+    def __init__(self, k : int, rate : float):
+        self.k = k
+        self.rate = rate
+        self.mean = k / rate
+
+    def sample(self, size : int, rng=None):
+        if _use_numpy(rng):
+            u = rvg.generate_U_batch(size * self.k, rng=rng).reshape(size, self.k)
+            return -np.log1p(-u).sum(axis=1) / self.rate
+        return [-sum(math.log(1 - rvg.generate_U(rng)) for _ in range(self.k)) / self.rate for _ in range(size)]
+
+class LogNormal(Distribution):
+    """Lognormal distribution, exp(N) with N normal of parameters mu and sigma.
+
+    Use LogNormal.from_moments to give the mean and the standard deviation of the times."""
+
+    def __init__(self, mu : float, sigma : float):
+        self.mu = mu
+        self.sigma = sigma
+        self.mean = math.exp(mu + sigma ** 2 / 2)
+
+    @classmethod
+    def from_moments(cls, mean : float, std : float):
+        """Lognormal distribution with the given mean and standard deviation."""
+        sigma2 = math.log(1 + (std / mean) ** 2)
+        return cls(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+
+    def sample(self, size : int, rng=None):
+        if _use_numpy(rng):
+            return (np.random if rng is None else rng).lognormal(self.mu, self.sigma, size)
+        source = random if rng is None else rng
+        return [source.lognormvariate(self.mu, self.sigma) for _ in range(size)]
+
+class Empirical(Distribution):
+    """Distribution of measured times, sampled by inversion of a precomputed CDF table.
+
+    Parameters:
+      values : observed times (e.g. a service time trace), a sequence or a NumPy array
+      weights : Optional weight of each value (e.g. histogram counts)
+      interpolate : if True, the inverse CDF interpolates linearly between the sorted values
+                    (equal weights only), so draws are not restricted to the observed values
+      guide_size : number of cells of the guide table (default one per value)
+
+    Without interpolation, draws look up the table by binary search (np.searchsorted) in
+    batches, and one at a time through a guide table : cell j holds the first index whose
+    cumulative probability exceeds j / guide_size, so a lookup checks O(1) entries on average."""
+
+    def __init__(self, values, weights=None, interpolate : bool = False, guide_size : int = None):
+        values = list(values)
+        weights = None if weights is None else list(weights)
+        if not values:
+            raise ValueError("an empirical distribution needs at least one value")
+        if interpolate and weights is not None:
+            raise ValueError("interpolation needs values with equal weights")
+
+        pairs = sorted(zip(values, weights if weights is not None else [1.0] * len(values)))
+        self.values = [v for v, _ in pairs]
+        self.interpolate = interpolate
+
+        total = sum(w for _, w in pairs)
+        self.cdf = []
+        cumulative = 0.0
+        for _, w in pairs:
+            cumulative += w
+            self.cdf.append(cumulative / total)
+        self.cdf[-1] = 1.0
+        self.mean = sum(v * w for v, w in pairs) / total
+        if interpolate and len(self.values) > 1:
+            # mean of the piecewise linear inverse CDF
+            self.mean = sum(a + b for a, b in zip(self.values, self.values[1:])) / (2 * (len(self.values) - 1))
+
+        # guide[j] : first index i with cdf[i] > j / m
+        m = guide_size or len(self.values)
+        self.guide = [bisect.bisect_right(self.cdf, j / m) for j in range(m)]
+
+        if np is not None:
+            self._values = np.array(self.values)
+            self._cdf = np.array(self.cdf)
+
+    def inverse(self, u : float):
+        """Value of the inverse CDF at u in [0, 1)."""
+        if self.interpolate:
+            position = u * (len(self.values) - 1)
+            i = int(position)
+            if i + 1 == len(self.values):
+                return self.values[i]
+            return self.values[i] + (position - i) * (self.values[i + 1] - self.values[i])
+
+        cdf = self.cdf
+        i = self.guide[int(u * len(self.guide))]
+        while cdf[i] <= u:
+            i += 1
+        return self.values[i]
+
+    def sample(self, size : int, rng=None):
+        if _use_numpy(rng):
+            u = rvg.generate_U_batch(size, rng=rng)
+            if self.interpolate:
+                return np.interp(u * (len(self.values) - 1), np.arange(len(self.values)), self._values)
+            return self._values[np.searchsorted(self._cdf, u, side="right")]
+        return [self.inverse(rvg.generate_U(rng)) for _ in range(size)]
+
+def is_distribution(value):
+    """Whether value is a Distribution given in place of a rate."""
+    return isinstance(value, Distribution)
+
+def generate_renewal_process(distribution : Distribution, t : float, rng=None):
+    """Arrival times up to time t of a renewal process with the given interarrival distribution.
+
+    Interarrival times are drawn in blocks and accumulated. Returns a NumPy array with NumPy,
+    a list otherwise."""
+    if distribution.mean == 0:
+        raise ValueError("the interarrival distribution must have a positive mean")
+    block = max(16, int(1.2 * t / distribution.mean) + 1)
+
+    if _use_numpy(rng):
+        chunks = []
+        current_time = 0.0
+        while current_time < t:
+            arrivals = np.cumsum(distribution.sample(block, rng))
+            arrivals += current_time
+            current_time = arrivals[-1]
+            chunks.append(arrivals)
+        arrival_times = np.concatenate([np.empty(0), *chunks])
+        return arrival_times[:np.searchsorted(arrival_times, t, side="left")]
+
+    arrival_times = []
+    stream = distribution.stream(block, rng)
+    current_time = stream.next_time(0.0)
+    while current_time < t:
+        arrival_times.append(current_time)
+        current_time = stream.next_time(current_time)
+    return arrival_times
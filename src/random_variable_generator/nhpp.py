@@ -0,0 +1,243 @@
+import bisect
+import math
+import numbers
+from src.random_variable_generator import rvg
+
+np = rvg.np
+
+# Non-homogeneous Poisson processes by thinning against a piecewise constant envelope.
+#
+# On each piece of the envelope, candidates are drawn from a homogeneous process with the
+# envelope rate and kept with probability rate(s) / envelope. A tight envelope keeps most of
+# the candidates even when the peak rate is much larger than the off-peak one.
+
+WINDOW_ARRIVALS = 256       # expected candidates of the windows of an envelope piece without end
+
+class PiecewiseRate:
+    """Piecewise constant rate function, e.g. the hourly arrival rates of a daily curve.
+
+    Parameters:
+      breakpoints : increasing start times of the pieces, the first one 0
+      rates : rate on each piece, the last piece lasts until period (or forever)
+      period : Optional time after which the rates repeat (e.g. 24 for the hours of a day)
+
+    Calling it with a time or a NumPy array of times returns the rate at those times."""
+
+    def __init__(self, breakpoints, rates, period : float = None):
+        if len(breakpoints) != len(rates) or not breakpoints:
+            raise ValueError("breakpoints and rates must be non-empty and of the same length")
+        if breakpoints[0] != 0 or any(a >= b for a, b in zip(breakpoints, breakpoints[1:])):
+            raise ValueError("breakpoints must start at 0 and be increasing")
+        if any(r < 0 for r in rates):
+            raise ValueError("rates must be non-negative")
+        if period is not None and period <= breakpoints[-1]:
+            raise ValueError("period must be larger than the last breakpoint")
+
+        self.breakpoints = [float(b) for b in breakpoints]
+        self.rates = [float(r) for r in rates]
+        self.period = period
+
+    def __call__(self, t):
+        if np is not None and isinstance(t, np.ndarray):
+            if self.period is not None:
+                t = np.mod(t, self.period)
+            return np.asarray(self.rates)[np.searchsorted(self.breakpoints, t, side="right") - 1]
+
+        if self.period is not None:
+            t = t % self.period
+        return self.rates[bisect.bisect_right(self.breakpoints, t) - 1]
+
+    def piece(self, i : int):
+        """Start, end and rate of piece i, counting the pieces of the following periods."""
+        cycle, j = divmod(i, len(self.rates)) if self.period is not None else (0, min(i, len(self.rates) - 1))
+        offset = cycle * self.period if self.period is not None else 0.0
+
+        if j + 1 < len(self.breakpoints):
+            end = self.breakpoints[j + 1]
+        else:
+            end = self.period if self.period is not None else math.inf
+        return offset + self.breakpoints[j], offset + end, self.rates[j]
+
+    def mean(self, t : float):
+        """Expected number of arrivals up to time t."""
+        total = 0.0
+        i = 0
+        while True:
+            start, end, rate = self.piece(i)
+            if start >= t:
+                return total
+            total += rate * (min(end, t) - start)
+            if end >= t:
+                return total
+            i += 1
+
+def as_rate(lmd):
+    """Rate function of lmd, given as a callable, a PiecewiseRate or a table of (start, rate) pairs."""
+    if callable(lmd):
+        return lmd
+    breakpoints, rates = zip(*lmd)
+    return PiecewiseRate(breakpoints, rates)
+
+def is_time_varying(lmd):
+    """Whether lmd is a time-varying arrival rate rather than a constant."""
+    return not isinstance(lmd, numbers.Real)
+
+def piecewise_envelope(rate, end_time : float, pieces : int = 256, samples : int = 16, margin : float = 1.0,
+                       period : float = None):
+    """Piecewise constant envelope of a rate function on [0, end_time], or on [0, period]
+    repeated for a rate function with that period.
+
+    The rate of each of the pieces equal-length pieces is margin times the largest of
+    samples evaluations of rate over the piece (both ends included), which bounds rate when
+    it is monotone between evaluations. Without a period the last piece is extended past end_time."""
+    length = end_time if period is None else period
+    if length is None or length <= 0:
+        raise ValueError("the envelope of a rate function needs a positive end_time or period")
+
+    width = length / pieces
+    breakpoints = [i * width for i in range(pieces)]
+    rates = [margin * max(rate(b + width * k / (samples - 1)) for k in range(samples)) for b in breakpoints]
+    return PiecewiseRate(breakpoints, rates, period)
+
+def thinning_window(rate, level : float, start : float, end : float, exact : bool = False, rng=None,
+                    vectorized : bool = False):
+    """Arrival times in [start, end) of a non-homogeneous Poisson process with rate function
+    rate bounded by level on the window, sorted.
+
+    With NumPy the candidates are drawn and thinned as arrays. rate is called once with the
+    array of times when vectorized or a PiecewiseRate, and with each time otherwise, since
+    rate functions written for scalars (conditionals, min, max...) fail on arrays.
+    If exact, rate equals level on the window and every candidate is kept."""
+    if np is not None and (rng is None or isinstance(rng, np.random.Generator)):
+        n = (np.random if rng is None else rng).poisson(level * (end - start))
+        times = rvg.generate_U_batch(n, rng=rng)
+        times *= end - start
+        times += start
+        times.sort()
+        if not exact:
+            if vectorized or isinstance(rate, PiecewiseRate):
+                rates = rate(times)
+            else:
+                rates = np.fromiter(map(rate, times.tolist()), float, len(times))
+            times = times[rvg.generate_U_batch(n, rng=rng) * level < rates]
+        return times, n
+
+    times = []
+    n = 0
+    s = start
+    while True:
+        s = rvg.generate_next_poisson_time(s, level, rng)
+        if s >= end:
+            return times, n
+        n += 1
+        if exact or rvg.generate_U(rng) * level < rate(s):
+            times.append(s)
+
+class ThinningArrivals:
+    """Arrival stream of a non-homogeneous Poisson process with a time-varying rate.
+
+    The arrivals are generated one envelope piece at a time with thinning_window and
+    returned by next_time(t, rate) (the rate argument is ignored), so the stream can be
+    passed to the simulators as arrival_stream.
+
+    Parameters:
+      rate : rate function, PiecewiseRate or table of (start, rate) pairs (see as_rate)
+      end_time : horizon of the envelope of a rate function (see piecewise_envelope)
+      envelope : Optional PiecewiseRate bounding rate, a PiecewiseRate rate is its own envelope
+      pieces : number of pieces of the default envelope of a rate function
+      period : Optional period of a rate function, its envelope is then built over one period
+      rng : Optional random generator (see rvg.make_rng) used instead of the global random state
+      vectorized : whether the rate function accepts a NumPy array of times (see thinning_window)
+
+    Attributes:
+      candidates, accepted : number of candidates drawn and kept so far"""
+
+    def __init__(self, rate, end_time : float = None, envelope=None, pieces : int = 256, period : float = None, rng=None,
+                 vectorized : bool = False):
+        rate = as_rate(rate)
+        if envelope is None:
+            envelope = rate if isinstance(rate, PiecewiseRate) else piecewise_envelope(rate, end_time, pieces, period=period)
+
+        self.rate = rate
+        self.envelope = envelope
+        self.exact = envelope is rate
+        self.rng = rng
+        self.vectorized = vectorized
+
+        self.piece = 0              # envelope piece of the next window
+        self.window_end = 0.0       # end of the window generated last
+        self.times = []
+        self.position = 0
+        self.candidates = 0
+        self.accepted = 0
+
+    @property
+    def acceptance_rate(self):
+        """Fraction of the candidates kept by the thinning."""
+        return self.accepted / self.candidates if self.candidates else 1.0
+
+    def next_window(self):
+        """Arrival times of the next window (a NumPy array with NumPy), None when no arrival can follow."""
+        start, end, level = self.envelope.piece(self.piece)
+        start = max(start, self.window_end)
+
+        if end == math.inf:
+            if level == 0.0:
+                return None
+            end = start + WINDOW_ARRIVALS / level     # a piece without end is generated in windows
+        else:
+            self.piece += 1
+
+        times, n = thinning_window(self.rate, level, start, end, self.exact, self.rng, self.vectorized) if level > 0.0 else ([], 0)
+        self.window_end = end
+        self.candidates += n
+        self.accepted += len(times)
+        return times
+
+    def refill(self):
+        """Buffer the arrivals of the next window, returns False when no arrival can follow."""
+        times = self.next_window()
+        if times is None:
+            return False
+        self.times = times.tolist() if np is not None and isinstance(times, np.ndarray) else times
+        self.position = 0
+        return True
+
+    def next_time(self, current_time : float, rate=None):
+        """First arrival after current_time."""
+        while True:
+            times = self.times
+            while self.position < len(times):
+                s = times[self.position]
+                self.position += 1
+                if s > current_time:
+                    return s
+            if not self.refill():
+                return math.inf
+
+def windows(rate, t : float, envelope=None, rng=None, vectorized : bool = False):
+    """Arrival times of the windows of ThinningArrivals(rate, t, envelope) starting before time t."""
+    stream = ThinningArrivals(rate, t, envelope, rng=rng, vectorized=vectorized)
+    while stream.window_end < t:
+        times = stream.next_window()
+        if times is None:
+            return
+        yield times
+
+def generate_nhpp(rate, t : float, envelope=None, rng=None, vectorized : bool = False):
+    """Generate a non-homogeneous Poisson process with the given rate (see ThinningArrivals) up to time t.
+
+    Returns a list of the arrival times."""
+    arrival_times = []
+    for times in windows(rate, t, envelope, rng, vectorized):
+        arrival_times.extend(s for s in times if s < t)
+    return arrival_times
+
+def generate_nhpp_batch(rate, t : float, envelope=None, rng=None, vectorized : bool = False):
+    """Generate a non-homogeneous Poisson process with the given rate up to time t,
+    thinning whole envelope pieces as arrays (rate is called with arrays when vectorized,
+    see thinning_window). Returns a NumPy array of the arrival times."""
+    rvg._require_numpy()
+
+    arrival_times = np.concatenate([np.empty(0), *windows(rate, t, envelope, rng, vectorized)])
+    return arrival_times[:np.searchsorted(arrival_times, t, side="left")]
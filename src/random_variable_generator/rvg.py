@@ -1,22 +1,53 @@
 import random
 import math
 
-def generate_U():
+try:
+    import numpy as np
+except ImportError:     # batch generators are only available with NumPy
+    np = None
+
+# Every generator takes an optional rng : an object with a random() method returning
+# uniforms in [0, 1), such as random.Random or numpy.random.Generator (see make_rng).
+# Without it the generators use the global state of the random module (and of
+# numpy.random for the batch generators).
+
+def make_rng(seed=None):
+    """Create an independent random generator.
+
+    A NumPy Generator over the PCG64 bit generator when NumPy is available,
+    a random.Random otherwise."""
+    if np is not None:
+        return np.random.Generator(np.random.PCG64(seed))
+    return random.Random(seed)
+
+def spawn_rngs(seed, n : int):
+    """Create n independent random generators from a seed, for concurrent simulations.
+
+    With NumPy, generator i is PCG64(seed) jumped ahead i * 2^127 steps, so the n
+    streams never overlap. Otherwise each one is a random.Random seeded with (seed, i)."""
+    if np is not None:
+        bit_generator = np.random.PCG64(seed)
+        return [np.random.Generator(bit_generator.jumped(i)) for i in range(n)]
+    return [random.Random(f"{seed}:{i}") for i in range(n)]
+
+def generate_U(rng=None):
     """Generate a random variable U uniformly distributed in [0, 1)."""
-    return random.uniform(0, 1)
+    if rng is None:
+        return random.uniform(0, 1)
+    return rng.random()
 
-def generate_random_number(n : int):
+def generate_random_number(n : int, rng=None):
     """Generate a random number in the range [1,n] with equal probability for each number"""
-    u = generate_U()
+    u = generate_U(rng)
     return math.floor(n * u) + 1
 
-def generate_geometric_variable(p : float):
+def generate_geometric_variable(p : float, rng=None):
     """Generate a geometric random variable with probabilty p"""
-    u  = generate_U()
+    u  = generate_U(rng)
     g = math.log(u) / math.log(1 - p)
     return math.floor(g) + 1
 
-def generate_binomial_variable(n: int , p : float):
+def generate_binomial_variable(n: int , p : float, rng=None):
     """Generate a binomial random variable with parameters n and p.
     n : number of trials
     p : probability of success in each trial
@@ -29,7 +60,7 @@ def generate_binomial_variable(n: int , p : float):
     pf = (1 - p)**n     # P(X = 0)
     f = pf              # cumulative distribution function
 
-    u = generate_U()    # uniform random variable in [0, 1)
+    u = generate_U(rng)    # uniform random variable in [0, 1)
     
     while u >= f :      
         pf = c * (n - i) / (i + 1) * pf 
@@ -38,7 +69,7 @@ def generate_binomial_variable(n: int , p : float):
     
     return i
 
-def generate_poisson_variable(lam : float):
+def generate_poisson_variable(lam : float, rng=None):
     """Generate a Poisson random variable with parameter lambda.
     
     Uses the inverse transform method. By computing the cumulative distribution
@@ -48,7 +79,7 @@ def generate_poisson_variable(lam : float):
     pf = math.exp(-lam) # P(X = 0)
     f = pf              # cumulative distribution function
 
-    u = generate_U()    # uniform random variable in [0, 1)
+    u = generate_U(rng)    # uniform random variable in [0, 1)
     
     while u >= f :      
         pf = lam / (i + 1) * pf 
@@ -57,12 +88,12 @@ def generate_poisson_variable(lam : float):
     
     return i
 
-def generate_exponential_variable(lam : float):
+def generate_exponential_variable(lam : float, rng=None):
     """Generate an exponential random variable with parameter lambda."""
-    u = generate_U()
+    u = generate_U(rng)
     return -math.log(1 - u) / lam
 
-def generate_poisson_process(lam : float, t : float):
+def generate_poisson_process(lam : float, t : float, rng=None):
     """Generate a Poisson process with parameter lambda up to time t.
     
     Returns a list of the arrival times."""
@@ -71,7 +102,7 @@ def generate_poisson_process(lam : float, t : float):
     current_time = 0.0
 
     while True:
-        inter_arrival_time = generate_exponential_variable(lam)
+        inter_arrival_time = generate_exponential_variable(lam, rng)
         current_time += inter_arrival_time
         
         if current_time >= t:
@@ -81,6 +112,128 @@ def generate_poisson_process(lam : float, t : float):
     
     return arrival_times
 
-def generate_next_poisson_time(current_time : float, rate : float):
+def generate_next_poisson_time(current_time : float, rate : float, rng=None):
     """Generate a new Poisson event time given the current time and the rate."""
-    return current_time + generate_exponential_variable(rate)
\ No newline at end of file
+    return current_time + generate_exponential_variable(rate, rng)
+
+
+# ---------------------------------------------------------------------------
+# Batch generators
+#
+# Same inverse-transform methods as the scalar generators above, but filling
+# NumPy arrays in one call. Each function accepts either a `size` for a new
+# array or an `out` array to be filled in place, and rng must be a NumPy Generator.
+# ---------------------------------------------------------------------------
+
+def _require_numpy():
+    """Raise an informative error when the batch generators are used without NumPy."""
+    if np is None:
+        raise ImportError("NumPy is required for the batch generators")
+
+def _batch_output(size, out, dtype):
+    """Return the array that a batch generator must fill."""
+    _require_numpy()
+    if out is None:
+        return np.empty(size, dtype=dtype)
+    return out
+
+def generate_U_batch(size=None, out=None, rng=None):
+    """Generate an array of uniform random variables in [0, 1)."""
+    out = _batch_output(size, out, float)
+    out[...] = (np.random if rng is None else rng).random(out.shape)
+    return out
+
+def generate_random_number_batch(n : int, size=None, out=None, rng=None):
+    """Generate an array of random numbers in the range [1,n] with equal probability"""
+    out = _batch_output(size, out, np.int64)
+    u = generate_U_batch(out.shape, rng=rng)
+    out[...] = np.floor(n * u) + 1
+    return out
+
+def generate_geometric_batch(p : float, size=None, out=None, rng=None):
+    """Generate an array of geometric random variables with probabilty p"""
+    out = _batch_output(size, out, np.int64)
+    u = generate_U_batch(out.shape, rng=rng)
+    out[...] = np.floor(np.log(u) / math.log(1 - p)) + 1
+    return out
+
+def _inverse_transform_from_cdf(cdf, u, out):
+    """Fill out with the smallest i such that u < cdf[i].
+
+    Equivalent to walking the CDF from zero for every u, but done with a
+    single binary search over the shared table."""
+    np.minimum(np.searchsorted(cdf, u, side="right"), len(cdf) - 1, out=out)
+    return out
+
+def generate_binomial_batch(n : int, p : float, size=None, out=None, rng=None):
+    """Generate an array of binomial random variables with parameters n and p.
+
+    Uses the inverse transform method. The CDF table is built once with the
+    same recurrence as generate_binomial_variable and shared by all draws."""
+    out = _batch_output(size, out, np.int64)
+    u = generate_U_batch(out.shape, rng=rng)
+
+    c = p / (1 - p)                 # constant factor
+    pf = (1 - p)**n                 # P(X = 0)
+    cdf = [pf]                      # cumulative distribution function
+
+    for i in range(n):
+        pf = c * (n - i) / (i + 1) * pf
+        cdf.append(cdf[-1] + pf)
+
+    return _inverse_transform_from_cdf(np.array(cdf), u, out)
+
+def generate_poisson_batch(lam : float, size=None, out=None, rng=None):
+    """Generate an array of Poisson random variables with parameter lambda.
+
+    Uses the inverse transform method. The CDF table is extended with the
+    same recurrence as generate_poisson_variable until it covers the largest
+    uniform drawn, then shared by all draws."""
+    out = _batch_output(size, out, np.int64)
+    u = generate_U_batch(out.shape, rng=rng)
+    u_max = u.max() if u.size else 0.0
+
+    i = 0                           # current number of occurrences
+    pf = math.exp(-lam)             # P(X = 0)
+    cdf = [pf]                      # cumulative distribution function
+
+    while cdf[-1] <= u_max:
+        pf = lam / (i + 1) * pf
+        i = i + 1
+        if pf == 0.0 and i > lam:   # the tail underflowed, no more mass to add
+            break
+        cdf.append(cdf[-1] + pf)
+
+    return _inverse_transform_from_cdf(np.array(cdf), u, out)
+
+def generate_exponential_batch(lam : float, size=None, out=None, rng=None):
+    """Generate an array of exponential random variables with parameter lambda."""
+    out = _batch_output(size, out, float)
+    generate_U_batch(out=out, rng=rng)
+    np.negative(np.log1p(np.negative(out, out=out), out=out), out=out)
+    out /= lam
+    return out
+
+def generate_poisson_process_batch(lam : float, t : float, rng=None):
+    """Generate a Poisson process with parameter lambda up to time t.
+
+    Interarrival times are drawn in blocks and accumulated with a cumulative
+    sum instead of one at a time. Returns a NumPy array of the arrival times."""
+    _require_numpy()
+    if t <= 0:
+        return np.empty(0)
+
+    mean = lam * t
+    block = max(16, int(mean + 4 * math.sqrt(mean)) + 1)   # enough for one block almost always
+
+    chunks = []
+    current_time = 0.0
+
+    while current_time < t:
+        arrivals = np.cumsum(generate_exponential_batch(lam, block, rng=rng))
+        arrivals += current_time
+        current_time = arrivals[-1]
+        chunks.append(arrivals)
+
+    arrival_times = np.concatenate(chunks)
+    return arrival_times[:np.searchsorted(arrival_times, t, side="left")]
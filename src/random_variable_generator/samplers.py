@@ -0,0 +1,182 @@
+import math
+from functools import lru_cache
+from src.random_variable_generator import rvg
+
+# Parameter (lambda or n*min(p, 1-p)) from which the rejection samplers are used
+REJECTION_THRESHOLD = 10.0
+
+# Probability mass left out of the tables of the discrete samplers
+TAIL_MASS = 1e-15
+
+class AliasSampler:
+    """Sample from a finite discrete distribution on {0, ..., k-1} in O(1) per draw.
+
+    Uses Vose's alias method: the table is built once in O(k) and each draw
+    needs a single uniform random variable."""
+
+    def __init__(self, probabilities):
+        k = len(probabilities)
+        total = sum(probabilities)
+        scaled = [p * k / total for p in probabilities]
+
+        self.probability = [1.0] * k    # probability of keeping column i
+        self.alias = list(range(k))     # value returned when column i is not kept
+
+        small = [i for i, q in enumerate(scaled) if q < 1.0]
+        large = [i for i, q in enumerate(scaled) if q >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+    def sample(self, rng=None):
+        """Generate a random value of the distribution."""
+        u = rvg.generate_U(rng) * len(self.probability)
+        i = int(u)
+        return i if u - i < self.probability[i] else self.alias[i]
+
+    def sample_batch(self, size : int, rng=None):
+        """Generate an array of random values of the distribution (requires NumPy)."""
+        np = rvg.np
+        probability = np.asarray(self.probability)
+        alias = np.asarray(self.alias)
+
+        u = rvg.generate_U_batch(size, rng=rng) * len(probability)
+        i = u.astype(np.int64)
+        return np.where(u - i < probability[i], i, alias[i])
+
+class PoissonRejectionSampler:
+    """Sample Poisson random variables with large lambda in constant expected time.
+
+    Uses the transformed rejection method with squeeze PTRS (Hörmann, 1993)."""
+
+    def __init__(self, lam : float):
+        self.lam = lam
+        self.log_lam = math.log(lam)
+        self.b = 0.931 + 2.53 * math.sqrt(lam)
+        self.a = -0.059 + 0.02483 * self.b
+        self.log_inv_alpha = math.log(1.1239 + 1.1328 / (self.b - 3.4))
+        self.vr = 0.9277 - 3.6224 / (self.b - 2)
+
+    def sample(self, rng=None):
+        """Generate a random value of the distribution."""
+        while True:
+            u = rvg.generate_U(rng) - 0.5
+            v = 1.0 - rvg.generate_U(rng)      # in (0, 1]
+            us = 0.5 - abs(u)
+            k = math.floor((2 * self.a / us + self.b) * u + self.lam + 0.43)
+
+            if us >= 0.07 and v <= self.vr:
+                return k
+            if k < 0 or (us < 0.013 and v > us):
+                continue
+            if (math.log(v) + self.log_inv_alpha - math.log(self.a / (us * us) + self.b)
+                    <= -self.lam + k * self.log_lam - math.lgamma(k + 1)):
+                return k
+
+    def sample_batch(self, size : int, rng=None):
+        """Generate an array of random values of the distribution (requires NumPy)."""
+        return rvg.np.array([self.sample(rng) for _ in range(size)])
+
+class BinomialRejectionSampler:
+    """Sample binomial random variables with large n*p in constant expected time.
+
+    Uses the transformed rejection method BTRS (Hörmann, 1993) for p <= 1/2
+    and the symmetry X = n - Y, Y ~ Binomial(n, 1 - p), otherwise."""
+
+    def __init__(self, n : int, p : float):
+        self.n = n
+        self.flipped = p > 0.5
+        p = 1 - p if self.flipped else p
+        q = 1 - p
+
+        spq = math.sqrt(n * p * q)
+        self.b = 1.15 + 2.53 * spq
+        self.a = -0.0873 + 0.0248 * self.b + 0.01 * p
+        self.c = n * p + 0.5
+        self.vr = 0.92 - 4.2 / self.b
+        self.alpha = (2.83 + 5.1 / self.b) * spq
+        self.lpq = math.log(p / q)
+        self.m = math.floor((n + 1) * p)
+        self.h = math.lgamma(self.m + 1) + math.lgamma(n - self.m + 1)
+
+    def sample(self, rng=None):
+        """Generate a random value of the distribution."""
+        n = self.n
+        while True:
+            u = rvg.generate_U(rng) - 0.5
+            v = 1.0 - rvg.generate_U(rng)      # in (0, 1]
+            us = 0.5 - abs(u)
+            k = math.floor((2 * self.a / us + self.b) * u + self.c)
+
+            if k < 0 or k > n:
+                continue
+            if us >= 0.07 and v <= self.vr:
+                break
+            if (math.log(v * self.alpha / (self.a / (us * us) + self.b))
+                    <= self.h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - self.m) * self.lpq):
+                break
+
+        return n - k if self.flipped else k
+
+    def sample_batch(self, size : int, rng=None):
+        """Generate an array of random values of the distribution (requires NumPy)."""
+        return rvg.np.array([self.sample(rng) for _ in range(size)])
+
+def poisson_probabilities(lam : float):
+    """P(X = i) of a Poisson variable for i = 0, 1, ... until the tail mass is below TAIL_MASS."""
+    pf = math.exp(-lam)
+    probabilities = [pf]
+    f = pf
+    i = 0
+    while f < 1 - TAIL_MASS and (i < lam or pf > 0.0):
+        pf = lam / (i + 1) * pf
+        f = f + pf
+        i = i + 1
+        probabilities.append(pf)
+    return probabilities
+
+def binomial_probabilities(n : int, p : float):
+    """P(X = i) of a binomial variable for i = 0, 1, ..., n, stopping when the tail mass is below TAIL_MASS."""
+    c = p / (1 - p)
+    pf = (1 - p)**n
+    probabilities = [pf]
+    f = pf
+    for i in range(n):
+        if f >= 1 - TAIL_MASS:
+            break
+        pf = c * (n - i) / (i + 1) * pf
+        f = f + pf
+        probabilities.append(pf)
+    return probabilities
+
+@lru_cache(maxsize=256)
+def poisson_sampler(lam : float):
+    """Cached sampler of Poisson random variables with parameter lambda.
+
+    Alias table for small lambda, PTRS rejection from REJECTION_THRESHOLD on."""
+    if lam >= REJECTION_THRESHOLD:
+        return PoissonRejectionSampler(lam)
+    return AliasSampler(poisson_probabilities(lam))
+
+@lru_cache(maxsize=256)
+def binomial_sampler(n : int, p : float):
+    """Cached sampler of binomial random variables with parameters n and p.
+
+    Alias table when n*min(p, 1-p) is small, BTRS rejection from REJECTION_THRESHOLD on."""
+    if p in (0.0, 1.0):
+        return AliasSampler([0.0] * n + [1.0]) if p == 1.0 else AliasSampler([1.0])
+    if n * min(p, 1 - p) >= REJECTION_THRESHOLD:
+        return BinomialRejectionSampler(n, p)
+    return AliasSampler(binomial_probabilities(n, p))
+
+def sample_poisson(lam : float, rng=None):
+    """Generate a Poisson random variable with parameter lambda in constant expected time."""
+    return poisson_sampler(lam).sample(rng)
+
+def sample_binomial(n : int, p : float, rng=None):
+    """Generate a binomial random variable with parameters n and p in constant expected time."""
+    return binomial_sampler(n, p).sample(rng)
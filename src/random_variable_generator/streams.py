@@ -0,0 +1,123 @@
+import math
+import random
+from functools import partial
+from src.random_variable_generator import rvg
+from src.random_variable_generator.nhpp import ThinningArrivals, is_time_varying
+from src.random_variable_generator.distributions import is_distribution
+
+def fill_exponentials(size : int, rng=None, antithetic : bool = False):
+    """Draw a block of exponential random variables with rate 1 from rng (see rvg.make_rng).
+
+    Uses the NumPy batch generator when available, the scalar generator otherwise.
+    The antithetic block uses 1 - U wherever the normal block uses U."""
+    np = rvg.np
+    if np is not None and (rng is None or isinstance(rng, np.random.Generator)):
+        if not antithetic:
+            return rvg.generate_exponential_batch(1.0, size, rng=rng).tolist()
+        u = rvg.generate_U_batch(size, rng=rng)
+        return (-np.log(np.where(u > 0.0, u, 1.0))).tolist()
+
+    uniform = partial(rvg.generate_U, rng)
+    if antithetic:
+        return [-math.log(uniform() or 1.0) for _ in range(size)]
+    return [-math.log(1.0 - uniform()) for _ in range(size)]
+
+class ExponentialBuffer:
+    """Buffered source of exponential times for the queue simulators.
+
+    Exponentials with rate 1 are pre-generated in blocks of block_size and
+    scaled by the requested rate on use, so each draw costs a list index.
+    The block is refilled by calling fill(block_size), which can be replaced
+    to drive a simulation from recorded or transformed variates.
+
+    By default the stream draws from the global generators. Given a rng (see rvg.make_rng)
+    or a seed, for its own random.Random(seed), it is independent of them, so that two
+    simulations can share it as common random numbers. An antithetic stream uses
+    1 - U wherever the stream with the same seed uses U."""
+
+    def __init__(self, block_size : int = 4096, fill=None, seed=None, antithetic : bool = False, rng=None):
+        self.block_size = block_size
+        self.fill = fill
+        self.antithetic = antithetic
+        self.rng = random.Random(seed) if rng is None and seed is not None else rng
+        self._block = []
+        self._index = 0
+
+    def next_time(self, current_time : float, rate : float):
+        """Generate a new Poisson event time given the current time and the rate."""
+        i = self._index
+        if i == len(self._block):
+            self._block = self.refill()
+            i = 0
+        self._index = i + 1
+        return current_time + self._block[i] / rate
+
+    def refill(self):
+        """Draw the next block of exponentials with rate 1."""
+        if self.fill is not None:
+            return self.fill(self.block_size)
+        return fill_exponentials(self.block_size, self.rng, self.antithetic)
+
+class CommonRandomNumbers:
+    """Dedicated streams for the arrivals and for each server, reproducible from a seed.
+
+    Every call returns fresh streams starting from the same numbers, so simulations of
+    different configurations built from the same CommonRandomNumbers see the same
+    interarrival times and the same service draws on server i. Pass
+    antithetic=True (or use antithetic_pair) for the antithetic replication."""
+
+    def __init__(self, seed, antithetic : bool = False, block_size : int = 4096):
+        self.seed = seed
+        self.antithetic = antithetic
+        self.block_size = block_size
+
+    def stream(self, purpose : str):
+        """Stream dedicated to a purpose, e.g. "arrival" or "service:0"."""
+        return ExponentialBuffer(self.block_size, seed=f"{self.seed}:{purpose}", antithetic=self.antithetic)
+
+    def arrival_stream(self):
+        """Stream of the interarrival times."""
+        return self.stream("arrival")
+
+    def service_streams(self, servers : int):
+        """Streams of the service times of each server."""
+        return [self.stream(f"service:{i}") for i in range(servers)]
+
+    def antithetic_pair(self):
+        """CommonRandomNumbers with the same seed and the opposite antithetic setting."""
+        return CommonRandomNumbers(self.seed, not self.antithetic, self.block_size)
+
+def next_time_functions(servers : int, stream=None, arrival_stream=None, service_streams=None, rng=None,
+                        lmd=None, end_time : float = None, rates=None):
+    """Functions next_time(t, rate) used by a simulator for its arrivals and for each of its servers.
+
+    Dedicated arrival_stream and service_streams (one per server) take precedence over the
+    shared stream, which defaults to rvg.generate_next_poisson_time drawing from rng.
+    Unless arrival_stream is given, an arrival rate lmd given as a Distribution of the
+    interarrival times gets its SampleBuffer, and a time-varying lmd (callable, PiecewiseRate
+    or table of (start, rate) pairs) a ThinningArrivals stream with its envelope up to end_time.
+    Likewise, servers whose rate in rates (one per server) is a Distribution get its SampleBuffer.
+
+    Return :
+        next_arrival -> function : source of arrival times.
+        next_service -> list(function) : source of service completion times of each server."""
+    if stream is not None:
+        default = stream.next_time
+    elif rng is not None:
+        default = partial(rvg.generate_next_poisson_time, rng=rng)
+    else:
+        default = rvg.generate_next_poisson_time
+    if arrival_stream is None and lmd is not None:
+        if is_distribution(lmd):
+            arrival_stream = lmd.stream(rng=rng)
+        elif is_time_varying(lmd):
+            arrival_stream = ThinningArrivals(lmd, end_time, rng=rng)
+    next_arrival = default if arrival_stream is None else arrival_stream.next_time
+
+    if service_streams is None:
+        if rates is None:
+            return next_arrival, [default] * servers
+        return next_arrival, [rate.stream(rng=rng).next_time if is_distribution(rate) else default for rate in rates]
+    if len(service_streams) != servers:
+        raise ValueError(f"expected {servers} service streams, got {len(service_streams)}")
+    return next_arrival, [s.next_time for s in service_streams]
@@ -0,0 +1,193 @@
+import contextlib
+import hashlib
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from src.online_statistics import RunningStatistics
+from src.random_variable_generator import rvg
+from src.utils import calculate_busy_time
+
+def spawn_seeds(seed : int, n : int, start : int = 0):
+    """Derive the seeds of replications start, ..., start + n - 1 from a root seed.
+
+    Seed i only depends on (seed, i), so the stream of a replication is the same
+    whatever the number of workers or the order in which replications run."""
+    return [int.from_bytes(hashlib.sha256(f"{seed}:{i}".encode()).digest()[:8], "little")
+            for i in range(start, start + n)]
+
+def seed_generators(seed : int):
+    """Seed the random generators used by the simulators."""
+    random.seed(seed)
+    if rvg.np is not None:
+        rvg.np.random.seed(seed % 2**32)
+
+@contextlib.contextmanager
+def preserved_generators():
+    """Restore the state of the global random generators on exit."""
+    state = random.getstate()
+    np_state = rvg.np.random.get_state() if rvg.np is not None else None
+    try:
+        yield
+    finally:
+        random.setstate(state)
+        if np_state is not None:
+            rvg.np.random.set_state(np_state)
+
+def summarize_queue_result(result):
+    """Summary of one simulator run : number of customers, mean time in system and exceeded time.
+
+    Works with every simulator of src.discret_events, whose results start with
+    (arrival_times, departure_times, exceeded_time)."""
+    arrival_times, departure_times, exceeded_time = result[:3]
+    customers = len(departure_times)
+
+    return {
+        "customers" : customers,
+        "avg_time_in_system" : (sum(departure_times) - sum(arrival_times)) / customers if customers else 0.0,
+        "exceeded_time" : exceeded_time,
+    }
+
+def summarize_one_server_result(result):
+    """summarize_queue_result plus the utilisation of the server, for one-server queues.
+
+    The utilisation is the busy time of the server over the time until the last departure."""
+    summary = summarize_queue_result(result)
+    arrival_times, departure_times = result[:2]
+
+    duration = departure_times[-1] if departure_times else 0.0
+    summary["utilisation"] = calculate_busy_time(arrival_times, departure_times) / duration if duration else 0.0
+    return summary
+
+def run_chunk(sim_fn, params : dict, seeds, summarize=summarize_queue_result, rng : bool = False):
+    """Run one replication of sim_fn(**params) per seed and accumulate their summaries.
+
+    Only the accumulated statistics are returned, the per-customer results of
+    each replication are discarded as soon as they are summarized. With rng, each
+    replication gets its own rvg.make_rng(seed) instead of seeding the global
+    generators, so that chunks can run concurrently in threads. Otherwise the global
+    generators are restored afterwards, so a chunk run in the caller's process does not
+    change the caller's random state."""
+    totals = {}
+    with contextlib.nullcontext() if rng else preserved_generators():
+        for seed in seeds:
+            if rng:
+                result = sim_fn(**params, rng=rvg.make_rng(seed))
+            else:
+                seed_generators(seed)
+                result = sim_fn(**params)
+            for metric, value in summarize(result).items():
+                totals.setdefault(metric, RunningStatistics()).add(value)
+    return totals
+
+def merge_totals(totals, chunk_totals):
+    """Merge the statistics of a chunk into the running totals."""
+    for metric, stats in chunk_totals.items():
+        totals.setdefault(metric, RunningStatistics()).merge(stats)
+    return totals
+
+def run_replications(sim_fn, params : dict, n : int, workers : int = None, seed : int = 0,
+                     summarize=summarize_queue_result, chunk_size : int = 100, start : int = 0, executor=None):
+    """Run n independent replications of a simulator over a process pool.
+    Parameters:
+      sim_fn : simulator function, e.g. simulate_one_server_queue (must be importable by the workers)
+      params : keyword arguments of sim_fn
+      n : number of replications
+      workers : number of worker processes (default os.cpu_count(), 1 runs in this process)
+      seed : root seed, replication i is seeded with spawn_seeds(seed, 1, i)
+      summarize : function mapping a simulator result to a dict of metrics
+      chunk_size : replications per work unit sent to a worker
+      start : index of the first replication, to continue a previous call with the same seed
+      executor : Optional concurrent.futures executor running the chunks instead of a new pool,
+                 so that several calls can share the workers (workers is then ignored)
+
+    Return :
+        totals -> dict(str, RunningStatistics) : statistics of each metric over the replications.
+    The result does not depend on the number of workers."""
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [spawn_seeds(seed, min(chunk_size, n - i), start + i) for i in range(0, n, chunk_size)]
+    totals = {}
+
+    if executor is None and workers == 1:
+        for seeds in chunks:
+            merge_totals(totals, run_chunk(sim_fn, params, seeds, summarize))
+        return totals
+
+    with ProcessPoolExecutor(max_workers=workers) if executor is None else contextlib.nullcontext(executor) as executor:
+        futures = [executor.submit(run_chunk, sim_fn, params, seeds, summarize) for seeds in chunks]
+        for future in futures:      # merged in chunk order so the result is reproducible
+            merge_totals(totals, future.result())
+
+    return totals
+
+
+def student_t_quantile(p : float, df : int):
+    """Approximate p-quantile of the Student t distribution with df degrees of freedom.
+
+    Exact for df 1 and 2, otherwise uses the Cornish-Fisher expansion around the
+    normal quantile, accurate to about 1e-3 for df >= 5."""
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = NormalDist().inv_cdf(p)
+    return (z
+            + (z**3 + z) / (4 * df)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3))
+
+def confidence_half_width(stats : RunningStatistics, confidence : float = 0.95):
+    """Half-width of the confidence interval of the mean of the values in stats."""
+    if stats.count < 2:
+        return math.inf
+    return student_t_quantile(0.5 + confidence / 2, stats.count - 1) * stats.std / math.sqrt(stats.count)
+
+MIN_REPLICATIONS = 10     # replications before run_until_precision checks the precision
+
+def run_until_precision(sim_fn, params : dict, metric : str, half_width : float, relative : bool = False,
+                        confidence : float = 0.95, batch_size : int = 100, max_replications : int = 100000,
+                        workers : int = None, seed : int = 0, summarize=summarize_queue_result,
+                        chunk_size : int = None):
+    """Run replications of a simulator in batches until the mean of a metric is precise enough.
+    Parameters:
+      sim_fn, params, workers, seed, summarize : as in run_replications
+      chunk_size : replications per work unit, by default batch_size split evenly over the workers
+      metric : key of the summary whose mean is estimated (e.g. "avg_time_in_system", "exceeded_time",
+               "utilisation" with summarize_one_server_result)
+      half_width : target half-width of the confidence interval
+      relative : if True, half_width is relative to the absolute value of the mean
+      confidence : confidence level of the interval
+      batch_size : replications run between precision checks, the target is not checked before
+                   MIN_REPLICATIONS replications
+      max_replications : replications after which the run stops even without the target precision
+
+    Return :
+        totals -> dict(str, RunningStatistics) : statistics of each metric over the replications.
+        half_width -> float : half-width of the confidence interval reached for metric.
+    Batches continue the seed sequence, so replication i always uses the same seed as in run_replications.
+    The worker processes are started once and shared by all the batches."""
+
+    if batch_size < 1 or max_replications < 1:
+        raise ValueError("batch_size and max_replications must be positive")
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or -(-batch_size // workers)
+    totals = {}
+    n = 0
+
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else contextlib.nullcontext() as executor:
+        while n < max_replications:
+            batch = min(batch_size, max_replications - n)
+            merge_totals(totals, run_replications(sim_fn, params, batch, workers, seed, summarize, chunk_size, n, executor))
+            n += batch
+
+            stats = totals[metric]
+            reached = confidence_half_width(stats, confidence)
+            target = half_width * abs(stats.mean) if relative else half_width
+            if stats.count >= MIN_REPLICATIONS and reached <= target:
+                break
+
+    return totals, confidence_half_width(totals[metric], confidence)
@@ -0,0 +1,223 @@
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from src.discret_events import (simulate_one_server_queue, simulate_two_in_series_servers_queue,
+                                simulate_two_paralel_servers_queue, simulate_multi_server_queue)
+from src.replication import (spawn_seeds, run_chunk, merge_totals, confidence_half_width,
+                             summarize_queue_result, summarize_one_server_result)
+from src.utils import freeze
+
+# Models served by default : name -> (simulator, summarize)
+MODELS = {
+    "one_server" : (simulate_one_server_queue, summarize_one_server_result),
+    "two_in_series" : (simulate_two_in_series_servers_queue, summarize_queue_result),
+    "two_parallel" : (simulate_two_paralel_servers_queue, summarize_queue_result),
+    "multi_server" : (simulate_multi_server_queue, summarize_queue_result),
+}
+
+def request_key(model : str, params : dict, seed : int, n_replications : int):
+    """Cache key of a request."""
+    return model, freeze(params), seed, n_replications
+
+def summarize_totals(totals, confidence : float = 0.95):
+    """Mean, standard deviation, count and confidence half-width of each metric of totals."""
+    return {metric : {"mean" : stats.mean, "std" : stats.std, "count" : stats.count,
+                      "half_width" : confidence_half_width(stats, confidence)}
+            for metric, stats in totals.items()}
+
+class ResultCache:
+    """Least recently used cache whose entries expire ttl seconds after they are stored.
+
+    Parameters:
+      maxsize : maximum number of entries, the least recently used one is evicted first
+      ttl : lifetime in seconds of an entry (None for entries that never expire)
+      clock : function returning the current time in seconds"""
+
+    def __init__(self, maxsize : int = 128, ttl : float = 600.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()        # key -> (expiry time, value), least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Value stored for key, or default when it is missing or expired."""
+        entry = self.entries.get(key)
+        if entry is None or (entry[0] is not None and entry[0] <= self.clock()):
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        """Store value for key, evicting the least recently used entry when full."""
+        expiry = None if self.ttl is None else self.clock() + self.ttl
+        self.entries[key] = (expiry, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __contains__(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and (entry[0] is None or entry[0] > self.clock())
+
+    def __len__(self):
+        return len(self.entries)
+
+class SimulationJob:
+    """Replications of one request in progress, shared by every caller of the same request."""
+
+    def __init__(self, n_replications : int):
+        self.n_replications = n_replications
+        self.completed = 0
+        self.totals = {}
+        self.listeners = []     # asyncio.Queue of each progress subscriber
+        self.task = None
+
+    def snapshot(self):
+        """Progress (completed, totals) with a copy of the partial statistics."""
+        return self.completed, copy.deepcopy(self.totals)
+
+    def publish(self, update=None):
+        """Send the current progress, or the error that stopped the run, to the subscribers."""
+        update = self.snapshot() if update is None else update
+        for queue in self.listeners:
+            queue.put_nowait(update)
+
+class SimulationService:
+    """asyncio front end running replications of the simulators on a bounded executor.
+
+    Requests are (model, params, seed, n_replications). The replications of a request are
+    split in chunks of chunk_size run on the executor, and merged in chunk order as they
+    complete, so that progress can be reported and the result does not depend on the executor.
+    Each replication gets its own generator (see rvg.make_rng), so threads can be used too.
+
+    Concurrent identical requests share a single run, and finished results are kept in an
+    LRU/TTL ResultCache, so repeated queries return without running anything.
+
+    Parameters:
+      models : dict name -> (simulator, summarize) of the models served (default MODELS)
+      executor : concurrent.futures executor running the chunks, by default a
+                 ProcessPoolExecutor with max_workers workers created on first use
+      max_workers : bound of the default executor
+      cache_size, ttl : size and entry lifetime in seconds of the result cache
+      chunk_size : replications per executor call"""
+
+    def __init__(self, models=None, executor=None, max_workers : int = None, cache_size : int = 128,
+                 ttl : float = 600.0, chunk_size : int = 25):
+        self.models = dict(MODELS if models is None else models)
+        self.executor = executor
+        self.max_workers = max_workers
+        self.cache = ResultCache(cache_size, ttl)
+        self.chunk_size = chunk_size
+        self.jobs = {}          # requests in flight
+        self.owns_executor = executor is None
+
+    def register(self, name : str, sim_fn, summarize=summarize_queue_result):
+        """Serve a new model. sim_fn must accept rng (and be picklable for a process pool)."""
+        self.models[name] = (sim_fn, summarize)
+
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def shutdown(self):
+        """Shut down the default executor."""
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def job(self, model : str, params : dict, seed : int, n_replications : int):
+        """Job in flight for a request, started if there is none."""
+        key = request_key(model, params, seed, n_replications)
+        job = self.jobs.get(key)
+        if job is None:
+            if model not in self.models:
+                raise KeyError(f"unknown model: {model}")
+            job = SimulationJob(n_replications)
+            job.task = asyncio.ensure_future(self.execute(key, job, model, params, seed))
+            self.jobs[key] = job
+        return job
+
+    async def execute(self, key, job : SimulationJob, model : str, params : dict, seed : int):
+        """Run the chunks of a job on the executor and store the result in the cache."""
+        sim_fn, summarize = self.models[model]
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+        n = job.n_replications
+
+        futures = []
+        try:
+            futures = [loop.run_in_executor(executor, run_chunk, sim_fn, params,
+                                            spawn_seeds(seed, min(self.chunk_size, n - i), i), summarize, True)
+                       for i in range(0, n, self.chunk_size)]
+            for i, future in enumerate(futures):    # merged in chunk order so the result is reproducible
+                merge_totals(job.totals, await future)
+                job.completed = min(n, (i + 1) * self.chunk_size)
+                job.publish()
+        except BaseException as error:
+            for future in futures:
+                future.cancel()
+            job.publish(error)
+            raise
+        finally:
+            del self.jobs[key]
+
+        self.cache.put(key, job.totals)
+        return job.totals
+
+    async def run(self, model : str, params : dict, seed : int = 0, n_replications : int = 100):
+        """Statistics of n_replications replications of a model.
+        Parameters:
+          model : name of the model (see MODELS)
+          params : keyword arguments of the simulator
+          seed : root seed, replication i is seeded with spawn_seeds(seed, 1, i)
+          n_replications : number of replications
+
+        Return :
+            totals -> dict(str, RunningStatistics) : statistics of each metric, shared with
+                      the cache and other callers, so it must not be modified."""
+        key = request_key(model, params, seed, n_replications)
+        totals = self.cache.get(key)
+        if totals is not None:
+            return totals
+
+        # shielded, cancelling one caller does not cancel the run shared with the others
+        return await asyncio.shield(self.job(model, params, seed, n_replications).task)
+
+    async def progress(self, model : str, params : dict, seed : int = 0, n_replications : int = 100):
+        """Asynchronous iterator over the progress of a request as (completed, totals) pairs,
+        with the partial statistics after each chunk. The last pair has every replication."""
+        key = request_key(model, params, seed, n_replications)
+        totals = self.cache.get(key)
+        if totals is not None:
+            yield n_replications, totals
+            return
+
+        job = self.job(model, params, seed, n_replications)
+        queue = asyncio.Queue()
+        job.listeners.append(queue)
+        if job.completed:
+            queue.put_nowait(job.snapshot())
+
+        try:
+            completed = 0
+            while completed < n_replications:
+                update = await queue.get()
+                if isinstance(update, BaseException):
+                    raise update
+                completed, totals = update
+                yield completed, totals
+        finally:
+            job.listeners.remove(queue)
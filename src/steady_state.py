@@ -0,0 +1,102 @@
+import math
+from array import array
+from src.discret_events.observers import StatisticsObserver
+from src.replication import student_t_quantile
+
+class CustomerSeries(StatisticsObserver):
+    """StatisticsObserver that also keeps, in departure order, the time in system and waiting
+    time of each customer who departs until time until, as compact array('d') series."""
+
+    def __init__(self, until : float = math.inf):
+        super().__init__()
+        self.until = until
+        self.series = {"time_in_system" : array("d"), "waiting_time" : array("d")}
+
+    def on_departure(self, t, customer):
+        if t <= self.until:
+            self.series["time_in_system"].append(t - self.arrival[customer])
+            self.series["waiting_time"].append(self.waited[customer])
+        super().on_departure(t, customer)
+
+def mser_truncation(values, batch_size : int = 5):
+    """Number of initial observations to delete as warm-up, by the MSER rule (MSER-5 by default).
+
+    The values are averaged in batches of batch_size and the truncation point d
+    minimizes the variance of the remaining batch means divided by their count,
+    searched over the first half of the batches."""
+    k = len(values) // batch_size
+    if k < 2:
+        return 0
+
+    means = [sum(values[j * batch_size:(j + 1) * batch_size]) / batch_size for j in range(k)]
+
+    # suffix sums of the batch means and their squares
+    total, squares = 0.0, 0.0
+    suffix = [(0.0, 0.0)] * (k + 1)
+    for j in range(k - 1, -1, -1):
+        total += means[j]
+        squares += means[j] * means[j]
+        suffix[j] = (total, squares)
+
+    best, best_d = math.inf, 0
+    for d in range(k // 2 + 1):
+        m = k - d
+        total, squares = suffix[d]
+        mser = (squares - total * total / m) / (m * m)
+        if mser < best:
+            best, best_d = mser, d
+
+    return best_d * batch_size
+
+def batch_means(values, n_batches : int = 20, confidence : float = 0.95):
+    """Mean of a correlated series and the half-width of its confidence interval by batch means.
+
+    The series is split into n_batches consecutive batches of equal size (the first
+    len(values) % n_batches values are dropped) whose means are treated as independent.
+
+    Return :
+        mean -> float : mean of the batch means.
+        half_width -> float : half-width of the confidence interval of the mean."""
+    batch_size = len(values) // n_batches
+    if batch_size == 0:
+        raise ValueError("not enough values for the number of batches")
+
+    start = len(values) - n_batches * batch_size
+    means = [sum(values[start + j * batch_size:start + (j + 1) * batch_size]) / batch_size for j in range(n_batches)]
+
+    mean = sum(means) / n_batches
+    variance = sum((x - mean) ** 2 for x in means) / (n_batches - 1)
+    return mean, student_t_quantile(0.5 + confidence / 2, n_batches - 1) * math.sqrt(variance / n_batches)
+
+def estimate_steady_state(sim_fn, params : dict, metric : str = "time_in_system", n_batches : int = 20,
+                          confidence : float = 0.95):
+    """Estimate the steady-state mean of a customer metric from a single long run of a simulator.
+    Parameters:
+      sim_fn : simulator function of src.discret_events accepting an observer
+      params : keyword arguments of sim_fn, end_time should be long compared to the warm-up
+      metric : "time_in_system" or "waiting_time"
+      n_batches : number of batches of the batch-means method
+      confidence : confidence level of the interval
+
+    Customers departing after end_time are ignored, since the system stops receiving arrivals
+    and empties. The warm-up is removed with mser_truncation before the batch means.
+
+    Return :
+        result -> dict : mean, half_width, warmup (customers deleted) and customers (customers used)."""
+
+    return estimate_steady_state_metrics(sim_fn, params, (metric,), n_batches, confidence)[metric]
+
+def estimate_steady_state_metrics(sim_fn, params : dict, metrics=("time_in_system", "waiting_time"),
+                                  n_batches : int = 20, confidence : float = 0.95):
+    """estimate_steady_state of several customer metrics from the same run.
+    Returns a dict with the result of each metric."""
+    series = CustomerSeries(until=params["end_time"])
+    sim_fn(observer=series, **params)
+
+    results = {}
+    for metric in metrics:
+        values = series.series[metric]
+        warmup = mser_truncation(values)
+        mean, half_width = batch_means(values[warmup:], n_batches, confidence)
+        results[metric] = {"mean" : mean, "half_width" : half_width, "warmup" : warmup, "customers" : len(values) - warmup}
+    return results
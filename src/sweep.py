@@ -0,0 +1,138 @@
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.online_statistics import RunningStatistics
+from src.replication import run_chunk, spawn_seeds, summarize_queue_result
+
+# Columns of a sweep table besides the parameters and the metrics
+UNIT_COLUMNS = ["point", "chunk", "count"]
+
+# Statistics stored for each metric of a work unit
+METRIC_FIELDS = ["mean", "variance", "min", "max"]
+
+def parameter_grid(ranges : dict):
+    """List of the parameter dicts of every combination of the values in ranges."""
+    names = list(ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*ranges.values())]
+
+def estimate_cost(params : dict):
+    """Relative cost of one replication of a queue simulator with the given parameters.
+
+    Proportional to the expected number of customers lmd * end_time, inflated by
+    1 / (1 - rho) for heavy traffic. The load rho uses the slowest scalar mu* rate
+    and the total rate of list-valued mu* parameters (parallel servers)."""
+    lmd = params.get("lmd", 1.0)
+    capacities = [sum(value) if isinstance(value, (list, tuple)) else value
+                  for name, value in params.items() if name.startswith("mu")]
+
+    rho = min(lmd / min(capacities), 0.99) if capacities else 0.0
+    return lmd * params.get("end_time", 1.0) / (1 - rho)
+
+def unit_row(names, point : int, params : dict, chunk : int, totals : dict):
+    """Row of the sweep table for the statistics of one work unit."""
+    count = next(iter(totals.values())).count if totals else 0
+    row = {name : json.dumps(params[name]) for name in names}
+    row.update(point=point, chunk=chunk, count=count)
+    for metric, stats in sorted(totals.items()):
+        for field in METRIC_FIELDS:
+            row[f"{metric}_{field}"] = repr(float(getattr(stats, field)))
+    return row
+
+def row_statistics(row : dict, metrics):
+    """RunningStatistics of each metric stored in a row of the sweep table."""
+    totals = {}
+    for metric in metrics:
+        stats = RunningStatistics()
+        stats.count = int(row["count"])
+        stats.mean = float(row[f"{metric}_mean"])
+        stats.m2 = float(row[f"{metric}_variance"]) * max(stats.count - 1, 0)
+        stats.min = float(row[f"{metric}_min"])
+        stats.max = float(row[f"{metric}_max"])
+        totals[metric] = stats
+    return totals
+
+def read_rows(path : str):
+    """Rows and metric names of a sweep table (empty if it does not exist)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return [], []
+
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        metrics = [name[:-len("_mean")] for name in reader.fieldnames if name.endswith("_mean")]
+        return list(reader), metrics
+
+def load_sweep(path : str):
+    """Merge the work units of a sweep table into one result per grid point.
+
+    Return :
+        results -> list((dict, dict(str, RunningStatistics))) : parameters and statistics of each point."""
+    rows, metrics = read_rows(path)
+    parameters = [name for name in rows[0] if name not in UNIT_COLUMNS and not name.startswith(tuple(f"{m}_" for m in metrics))] if rows else []
+
+    points = {}
+    for row in rows:
+        params, totals = points.setdefault(int(row["point"]), ({name : json.loads(row[name]) for name in parameters}, {}))
+        for metric, stats in row_statistics(row, metrics).items():
+            totals.setdefault(metric, RunningStatistics()).merge(stats)
+
+    return [points[point] for point in sorted(points)]
+
+def run_sweep(sim_fn, ranges : dict, replications : int, path : str, workers : int = None, seed : int = 0,
+              summarize=summarize_queue_result, chunk_size : int = 100, cost=estimate_cost):
+    """Run replications of a simulator over a grid of parameters, streaming results to a table.
+    Parameters:
+      sim_fn : simulator function, e.g. simulate_two_in_series_servers_queue
+      ranges : dict mapping each keyword argument of sim_fn to the list of its values
+      replications : replications per grid point
+      path : CSV file receiving one row per completed work unit (grid point x chunk of replications)
+      workers : number of worker processes (default os.cpu_count(), 1 runs in this process)
+      seed : root seed, each grid point has its own seed sequence derived from it
+      summarize : function mapping a simulator result to a dict of metrics
+      chunk_size : replications per work unit
+      cost : function estimating the relative cost of a replication from its parameters
+
+    Return :
+        results -> list((dict, dict(str, RunningStatistics))) : as in load_sweep.
+
+    Work units are submitted from the most to the least expensive, so that heavy traffic
+    points start first and the cheap ones fill the gaps. Units already present in path are
+    not run again, which resumes an interrupted sweep with the same arguments."""
+
+    grid = parameter_grid(ranges)
+    names = list(ranges)
+    done = {(int(row["point"]), int(row["chunk"])) for row in read_rows(path)[0]}
+
+    units = [(point, start) for point in range(len(grid)) for start in range(0, replications, chunk_size)
+             if (point, start) not in done]
+    units.sort(key=lambda unit: cost(grid[unit[0]]), reverse=True)
+
+    def work(point, start):
+        point_seed = spawn_seeds(seed, 1, point)[0]
+        seeds = spawn_seeds(point_seed, min(chunk_size, replications - start), start)
+        return sim_fn, grid[point], seeds, summarize
+
+    with open(path, "a", newline="") as f:
+        writer = None
+
+        def write(point, start, totals):
+            nonlocal writer
+            row = unit_row(names, point, grid[point], start, totals)
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                if f.tell() == 0:
+                    writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+
+        if (workers or os.cpu_count() or 1) == 1:
+            for point, start in units:
+                write(point, start, run_chunk(*work(point, start)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run_chunk, *work(point, start)) : (point, start) for point, start in units}
+                for future in as_completed(futures):
+                    write(*futures[future], future.result())
+
+    return load_sweep(path)
@@ -9,4 +9,25 @@ def calculate_average_time_in_system(arrival_times, departure_times):
     if customers == 0:
         return 0.0
     
-    return round((sum(departure_times) - sum(arrival_times)) / customers , 2)
\ No newline at end of file
+    return round((sum(departure_times) - sum(arrival_times)) / customers , 2)
+
+def calculate_busy_time(arrival_times, departure_times):
+    """Calculate the time a single FIFO server spends attending customers who have departed.
+
+    Customer i is attended from max(arrival_i, departure_{i-1}) until departure_i."""
+    busy_time = 0.0
+    last_departure = 0.0
+
+    for arrival, departure in zip(arrival_times, departure_times):
+        busy_time += departure - max(arrival, last_departure)
+        last_departure = departure
+
+    return busy_time
+
+def freeze(value):
+    """Hashable version of a parameter value, with lists and dicts turned into tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
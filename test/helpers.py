@@ -0,0 +1,9 @@
+import random
+from src.random_variable_generator.streams import ExponentialBuffer
+
+def recorded_stream(seed : int = 11, size : int = 5000):
+    """Stream replaying the same recorded exponentials on every call, so that two runs of a
+    simulator see the same event times."""
+    rng = random.Random(seed)
+    recorded = [rng.expovariate(1.0) for _ in range(size)]
+    return ExponentialBuffer(block_size=size, fill=lambda _: recorded)
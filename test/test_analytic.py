@@ -0,0 +1,88 @@
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src import analytic
+
+def number_in_system(result, t):
+    """Customers in the system at time t in a simulator result."""
+    arrivals, departures = result[:2]
+    return sum(1 for a in arrivals if a <= t) - sum(1 for d in departures if d <= t)
+
+class TestSteadyState(unittest.TestCase):
+    def test_mm1_and_tandem(self):
+        mm1 = analytic.analytic_metrics("one_server", {"lmd" : 1.0, "mu" : 1.25, "end_time" : 10.0})
+        self.assertAlmostEqual(mm1["time_in_system"], 4.0)
+        self.assertAlmostEqual(mm1["queue_length"], 3.2)
+        self.assertAlmostEqual(mm1["utilisation"], 0.8)
+        self.assertEqual(mm1["station_utilisation"], [mm1["utilisation"]])
+
+        tandem = analytic.analytic_metrics("two_in_series", {"lmd" : 1.0, "mu_1" : 1.25, "mu_2" : 2.0, "end_time" : 10.0})
+        self.assertAlmostEqual(tandem["time_in_system"], 4.0 + 1.0)
+        self.assertEqual([round(u, 6) for u in tandem["station_utilisation"]], [0.8, 0.5])
+        self.assertNotIn("utilisation", tandem)
+
+    def test_erlang_c(self):
+        # M/M/2 with load 1 : C = 1/3, W = 1/3 / (2 - 1) + 1
+        self.assertAlmostEqual(analytic.erlang_c(2, 1.0), 1 / 3)
+        metrics = analytic.analytic_metrics("two_parallel", {"lmd" : 1.0, "mu_1" : 1.0, "mu_2" : 1.0, "end_time" : 10.0})
+        self.assertAlmostEqual(metrics["time_in_system"], 4 / 3)
+
+    def test_jackson_network(self):
+        # station 1 sends half of its customers back : traffic rates 2 and 2
+        stations = [de.Station([4.0], [(1.0, 1)]), de.Station([2.0, 2.0], [(0.5, 0)])]
+        self.assertEqual(analytic.traffic_rates(1.0, stations), [2.0, 2.0])
+
+        metrics = analytic.analytic_metrics("queue_network", {"lmd" : 1.0, "stations" : stations, "end_time" : 10.0})
+        self.assertEqual(metrics["station_utilisation"], [0.5, 0.5])
+        self.assertAlmostEqual(metrics["number_in_system"], 1.0 + 4 / 3)
+
+    def test_no_analytic_answer(self):
+        for model, params in [("one_server", {"lmd" : 2.0, "mu" : 1.0}),
+                              ("two_parallel", {"lmd" : 1.0, "mu_1" : 1.0, "mu_2" : 2.0}),
+                              ("one_server", {"lmd" : [(0, 1.0), (5, 2.0)], "mu" : 3.0}),
+                              ("queue_network", {"lmd" : 1.0, "stations" : de.one_server_stations(2.0, capacity=5)})]:
+            self.assertIsNone(analytic.analytic_metrics(model, params))
+
+    def test_check_simulator(self):
+        report = analytic.check_simulator("two_in_series", {"lmd" : 1.0, "mu_1" : 2.0, "mu_2" : 1.6, "end_time" : 20000.0,
+                                                            "rng" : rvg.make_rng(5)})
+        for metric in ["time_in_system", "waiting_time"]:
+            self.assertTrue(report[metric]["consistent"], report[metric])
+
+    def test_hybrid_evaluation(self):
+        source, metrics, _ = analytic.evaluate("one_server", {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5000.0})
+        self.assertEqual(source, "analytic")
+        self.assertAlmostEqual(metrics["time_in_system"], 1.0)
+
+        params = {"lmd" : 1.0, "mu_1" : 2.0, "mu_2" : 1.5, "end_time" : 5000.0, "rng" : rvg.make_rng(6)}
+        source, metrics, half_width = analytic.evaluate("two_parallel", params)
+        self.assertEqual(source, "simulation")
+        self.assertGreater(metrics["time_in_system"], metrics["waiting_time"])
+        self.assertGreater(half_width["time_in_system"], 0.0)
+
+class TestTransient(unittest.TestCase):
+    def test_uniformization_two_states(self):
+        # on/off chain : P(on at t) = a / (a + b) (1 - exp(-(a + b) t)) starting off
+        p = analytic.ctmc_transient([(0, 1, 1.0), (1, 0, 3.0)], [1.0, 0.0], 0.5)
+        self.assertAlmostEqual(p[1], 0.25 * (1 - 2.718281828459045 ** -2), places=8)
+
+    def test_mm1_transient(self):
+        p = analytic.mm1_transient(1.0, 1.25, 400.0)
+        self.assertAlmostEqual(sum(p), 1.0, places=8)
+        self.assertAlmostEqual(sum(n * x for n, x in enumerate(p)), 4.0, delta=0.1)
+
+    def test_transient_matches_simulation(self):
+        t, n = 3.0, 3000
+        rngs = rvg.spawn_rngs(8, 2 * n)
+
+        mm1 = analytic.mm1_transient(1.0, 1.25, t)
+        simulated = sum(number_in_system(de.simulate_one_server_queue(1.0, 1.25, t + 1, rng=rng), t) for rng in rngs[:n]) / n
+        self.assertAlmostEqual(simulated, sum(k * x for k, x in enumerate(mm1)), delta=0.1)
+
+        tandem = analytic.tandem_transient(1.0, [1.25, 2.0], t)
+        simulated = sum(number_in_system(de.simulate_two_in_series_servers_queue(1.0, 1.25, 2.0, t + 1, rng=rng), t) for rng in rngs[n:]) / n
+        self.assertAlmostEqual(simulated, sum(tandem), delta=0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
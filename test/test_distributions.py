@@ -0,0 +1,105 @@
+import random
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src.random_variable_generator.distributions import np
+from src.utils import calculate_average_time_in_system
+
+class TestDistributions(unittest.TestCase):
+    def test_means(self):
+        distributions = [rvg.Exponential(2.0), rvg.Erlang(3, 6.0), rvg.LogNormal.from_moments(0.5, 0.3),
+                         rvg.Empirical([0.2, 0.4, 0.9]), rvg.Empirical([0.2, 0.4, 0.9], interpolate=True)]
+        rngs = [random.Random(1)] + ([rvg.make_rng(1)] if np is not None else [])
+
+        for distribution in distributions:
+            for rng in rngs:
+                values = list(distribution.sample(20000, rng))
+                self.assertEqual(len(values), 20000)
+                self.assertTrue(all(v > 0 for v in values))
+                self.assertAlmostEqual(sum(values) / len(values), distribution.mean, delta=0.03 * distribution.mean)
+
+    def test_lognormal_moments(self):
+        distribution = rvg.LogNormal.from_moments(2.0, 1.5)
+        values = distribution.sample(50000, random.Random(2))
+        mean = sum(values) / len(values)
+        std = (sum((v - mean) ** 2 for v in values) / len(values)) ** 0.5
+
+        self.assertAlmostEqual(distribution.mean, 2.0)
+        self.assertAlmostEqual(std, 1.5, delta=0.1)
+
+    def test_empirical_inverse(self):
+        distribution = rvg.Empirical([3.0, 1.0, 2.0, 2.0], guide_size=3)
+
+        self.assertEqual([distribution.inverse(u) for u in [0.0, 0.24, 0.25, 0.74, 0.75, 0.999]], [1.0, 1.0, 2.0, 2.0, 3.0, 3.0])
+        self.assertEqual(set(distribution.sample(1000, random.Random(3))), {1.0, 2.0, 3.0})
+
+        weighted = rvg.Empirical([1.0, 5.0], weights=[3, 1])
+        values = weighted.sample(8000, random.Random(4))
+        self.assertAlmostEqual(list(values).count(5.0) / 8000, 0.25, delta=0.02)
+
+        interpolated = rvg.Empirical([1.0, 3.0], interpolate=True)
+        self.assertEqual(interpolated.inverse(0.25), 1.5)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_lookup_matches_guide_table(self):
+        distribution = rvg.Empirical(random.Random(5).choices(range(1, 50), k=300))
+        u = rvg.generate_U_batch(1000, rng=rvg.make_rng(5))
+
+        expected = [distribution.inverse(x) for x in u.tolist()]
+        self.assertEqual(distribution._values[np.searchsorted(distribution._cdf, u, side="right")].tolist(), expected)
+
+    def test_abstract_base(self):
+        with self.assertRaises(TypeError):
+            rvg.Distribution()
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_empirical_from_arrays(self):
+        distribution = rvg.Empirical(np.array([3.0, 1.0, 2.0]), weights=np.array([1, 1, 2]))
+
+        self.assertEqual(distribution.values, [1.0, 2.0, 3.0])
+        self.assertAlmostEqual(distribution.mean, 2.0)
+        self.assertEqual(set(distribution.sample(100, rvg.make_rng(1)).tolist()), {1.0, 2.0, 3.0})
+        with self.assertRaises(ValueError):
+            rvg.Empirical(np.array([]))
+
+    def test_renewal_process(self):
+        arrivals = rvg.generate_renewal_process(rvg.Erlang(2, 4.0), 1000.0, random.Random(6))
+
+        self.assertAlmostEqual(len(arrivals) / 2000, 1.0, delta=0.05)
+        self.assertTrue(all(a < b for a, b in zip(arrivals, arrivals[1:])))
+        self.assertEqual(len(rvg.generate_renewal_process(rvg.Erlang(2, 4.0), 0.0, rvg.make_rng(6))), 0)
+        self.assertEqual(de.simulate_one_server_queue(rvg.Erlang(2, 4.0), 1.0, 0.0, method="lindley"), ([], [], 0.0))
+
+class TestSimulatorsWithDistributions(unittest.TestCase):
+    def test_mg1_waiting_time(self):
+        # M/G/1 with Erlang(4) services : W = E[S] + lmd E[S^2] / (2 (1 - rho))
+        service = rvg.Erlang(4, 8.0)
+        expected = 0.5 + 1.5 * (4 * 5 / 64) / (2 * (1 - 0.75))
+
+        for method in ["events", "lindley"]:
+            arrivals, departures, _ = de.simulate_one_server_queue(1.5, service, 40000.0, method=method, rng=rvg.make_rng(7))
+            self.assertAlmostEqual(calculate_average_time_in_system(arrivals, departures), expected, delta=0.1 * expected)
+
+    def test_per_server_distributions(self):
+        services = [rvg.Empirical([0.5, 1.0, 1.5]), rvg.LogNormal.from_moments(1.0, 0.5), rvg.Exponential(1.0)]
+        arrival = rvg.Erlang(2, 4.0)
+
+        arrivals, departures, exceeded_time, served = de.simulate_multi_server_queue(arrival, services, 200.0, rng=rvg.make_rng(8))
+        self.assertEqual(sum(served), len(arrivals))
+        self.assertTrue(all(d > a for a, d in zip(arrivals, departures)))
+
+        stations = [de.Station([rvg.Erlang(2, 6.0)], [(1.0, 1)]), de.Station([2.5, rvg.Exponential(2.5)])]
+        arrivals, departures, _, served = de.simulate_queue_network(arrival, stations, 200.0, rng=rvg.make_rng(9))
+        self.assertEqual(sum(served[1]), len(arrivals))
+
+        for simulate in [de.simulate_two_in_series_servers_queue, de.simulate_two_paralel_servers_queue]:
+            arrivals, departures = simulate(1.0, services[0], services[1], 100.0, rng=rvg.make_rng(10))[:2]
+            self.assertEqual(len(arrivals), len(departures))
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            de.simulate_one_server_queue(1.0, rvg.Erlang(2, 3.0), 10.0, backend="numba")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src.discret_events import kernels
+from src.discret_events.kernels import np, HAS_NUMBA
+from src.replication import preserved_generators
+from src.utils import calculate_average_time_in_system
+
+SIMULATIONS = [lambda **kw : de.simulate_one_server_queue(1.0, 2.0, 5.0, **kw),
+               lambda **kw : de.simulate_two_in_series_servers_queue(1.0, 2.0, 1.5, 5.0, **kw),
+               lambda **kw : de.simulate_two_paralel_servers_queue(1.5, 1.0, 0.8, 5.0, **kw)]
+
+class TestKernels(unittest.TestCase):
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_same_distribution_as_event_loop(self):
+        # the kernels run as Python without Numba, so their logic is checked either way. Interpreted
+        # kernels seed np.random, whose state is restored for the other tests
+        n = 1000
+        rng = random.Random(1)
+        for simulate, kernel, args in [(SIMULATIONS[0], kernels.one_server_kernel, (1.0, 2.0, 5.0)),
+                                       (SIMULATIONS[1], kernels.two_in_series_kernel, (1.0, 2.0, 1.5, 5.0)),
+                                       (SIMULATIONS[2], kernels.two_parallel_kernel, (1.5, 1.0, 0.8, 5.0))]:
+            totals = {"python" : 0.0, "kernel" : 0.0}
+            for _ in range(n):
+                arrivals, departures = simulate(rng=rng)[:2]
+                totals["python"] += calculate_average_time_in_system(arrivals, departures) / n
+
+                with preserved_generators():
+                    arrivals, departures, exceeded_time = kernels.run_kernel(kernel, *args, rng=rng)[:3]
+                self.assertIsInstance(arrivals, list)
+                self.assertEqual(len(arrivals), len(departures))
+                self.assertGreaterEqual(exceeded_time, 0.0)
+                totals["kernel"] += calculate_average_time_in_system(arrivals, departures) / n
+
+            self.assertAlmostEqual(totals["kernel"], totals["python"], delta=0.15 * totals["python"])
+
+    @unittest.skipIf(HAS_NUMBA, "Numba is installed")
+    def test_falls_back_to_event_loop(self):
+        for simulate in SIMULATIONS:
+            self.assertEqual(simulate(backend="numba", rng=random.Random(3)), simulate(rng=random.Random(3)))
+
+    def test_rejects_streams_and_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            de.simulate_one_server_queue(1.0, 2.0, 5.0, backend="numba", observer=de.StatisticsObserver())
+        with self.assertRaises(ValueError):
+            de.simulate_two_paralel_servers_queue(1.0, 2.0, 2.0, 5.0, backend="unknown")
+
+@unittest.skipUnless(HAS_NUMBA, "Numba is not installed")
+class TestCompiledKernels(unittest.TestCase):
+    def test_same_distribution_as_event_loop(self):
+        n = 1000
+        for simulate in SIMULATIONS:
+            totals = {"python" : 0.0, "numba" : 0.0}
+            for backend in totals:
+                for _ in range(n):
+                    arrivals, departures = simulate(backend=backend)[:2]
+                    totals[backend] += calculate_average_time_in_system(arrivals, departures) / n
+
+            self.assertAlmostEqual(totals["numba"], totals["python"], delta=0.15 * totals["python"])
+
+    def test_parallel_servers_output(self):
+        arrivals, departures, exceeded_time, c_1, c_2 = de.simulate_two_paralel_servers_queue(2.0, 1.0, 1.5, 50.0, backend="numba")
+
+        self.assertEqual(c_1 + c_2, len(arrivals))
+        self.assertTrue(all(d > a for a, d in zip(arrivals, departures)))
+        self.assertAlmostEqual(max(0.0, max(departures) - 50.0), exceeded_time)
+
+    def test_reproducible_with_rng(self):
+        first = de.simulate_one_server_queue(1.0, 1.5, 100.0, backend="numba", rng=rvg.make_rng(4))
+        second = de.simulate_one_server_queue(1.0, 1.5, 100.0, backend="numba", rng=rvg.make_rng(4))
+
+        self.assertEqual(first, second)
+
+    def test_global_state_untouched(self):
+        random.seed(1)
+        expected = random.getstate()
+        state = np.random.get_state()[1].copy()
+        de.simulate_two_in_series_servers_queue(1.0, 2.0, 1.5, 100.0, backend="numba", rng=random.Random(2))
+
+        self.assertEqual(random.getstate(), expected)
+        self.assertTrue((np.random.get_state()[1] == state).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import unittest
+import src.discret_events as de
+from src.discret_events.lindley import lindley_departures, np
+from src.utils import calculate_average_time_in_system
+
+class TestLindley(unittest.TestCase):
+    def test_recursion_matches_event_loop(self):
+        # customers arriving at 1, 2, 3, 10 with service times 1.5, 0.5, 2, 1
+        departures = lindley_departures([1.0, 2.0, 3.0, 10.0], [1.5, 0.5, 2.0, 1.0])
+        self.assertEqual(departures, [2.5, 3.0, 5.0, 11.0])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_vectorized_recursion(self):
+        rng = random.Random(2)
+        arrivals = sorted(rng.uniform(0, 100) for _ in range(1000))
+        services = [rng.expovariate(1.2) for _ in range(1000)]
+
+        expected = lindley_departures(arrivals, services)
+        departures = lindley_departures(np.array(arrivals), np.array(services))
+
+        for d, e in zip(departures.tolist(), expected):
+            self.assertAlmostEqual(d, e, places=9)
+
+    def test_same_distribution_as_event_loop(self):
+        n = 2000
+        for simulate in [lambda **kw : de.simulate_one_server_queue(1.0, 2.0, 5.0, **kw),
+                         lambda **kw : de.simulate_two_in_series_servers_queue(1.0, 2.0, 1.5, 5.0, **kw)]:
+            totals = {"events" : 0.0, "lindley" : 0.0}
+            for method in totals:
+                for _ in range(n):
+                    arrivals, departures, exceeded_time = simulate(method=method)
+                    self.assertIsInstance(arrivals, list)
+                    self.assertEqual(len(arrivals), len(departures))
+                    self.assertGreaterEqual(exceeded_time, 0.0)
+                    totals[method] += calculate_average_time_in_system(arrivals, departures) / n
+
+            self.assertAlmostEqual(totals["lindley"], totals["events"], delta=0.15 * totals["events"])
+
+    def test_no_arrivals(self):
+        for method in ["events", "lindley"]:
+            self.assertEqual(de.simulate_one_server_queue(1.0, 2.0, 0.0, method=method), ([], [], 0.0))
+            self.assertEqual(de.simulate_two_in_series_servers_queue(1.0, 2.0, 2.0, 0.0, method=method), ([], [], 0.0))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            de.simulate_one_server_queue(1.0, 2.0, 5.0, method="unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
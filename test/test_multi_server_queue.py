@@ -0,0 +1,43 @@
+import random
+import unittest
+import src.discret_events.multi_server_queue as msq
+import src.discret_events.queue_network as qn
+from src.random_variable_generator.streams import ExponentialBuffer
+from src.utils import calculate_average_time_in_system
+
+class TestSimulateMultiServerQueue(unittest.TestCase):
+    def test_basic_simulation(self):
+        mus = [1.0, 2.0, 0.5]
+        arrivals, departures, exceeded_time, served = msq.simulate_multi_server_queue(3.0, mus, 10.0)
+
+        self.assertIsInstance(arrivals, list)
+        self.assertIsInstance(departures, list)
+        self.assertIsInstance(exceeded_time, float)
+        self.assertEqual(len(arrivals), len(departures))
+        self.assertEqual(sum(served), len(arrivals))
+        self.assertEqual(len(served), len(mus))
+        self.assertTrue(all(d > a for a, d in zip(arrivals, departures)))
+        self.assertGreaterEqual(exceeded_time, 0.0)
+
+    def test_matches_queue_network(self):
+        rng = random.Random(7)
+        recorded = [rng.expovariate(1.0) for _ in range(1000)]
+        fill = lambda size: recorded
+        mus = [1.0, 1.3, 0.8]
+
+        result = msq.simulate_multi_server_queue(2.0, mus, 10.0, stream=ExponentialBuffer(block_size=1000, fill=fill))
+        expected = qn.simulate_queue_network(2.0, qn.parallel_servers_stations(mus), 10.0, stream=ExponentialBuffer(block_size=1000, fill=fill))
+
+        self.assertEqual(result[:3], expected[:3])
+        self.assertEqual(result[3], expected[3][0])
+
+    def test_large_pool(self):
+        mus = [0.01] * 500
+        arrivals, departures, _, served = msq.simulate_multi_server_queue(4.0, mus, 100.0)
+
+        self.assertEqual(sum(served), len(arrivals))
+        self.assertGreater(calculate_average_time_in_system(arrivals, departures), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
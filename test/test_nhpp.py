@@ -0,0 +1,97 @@
+import math
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src.random_variable_generator.nhpp import np
+
+def daily_rate(t):
+    """Rate between 2 and 20 with a peak at the middle of each period of 24."""
+    return 2.0 + 18.0 * math.sin(math.pi * (t % 24.0) / 24.0) ** 4
+
+def shift_rate(t):
+    """Rate 10 during the first half of each period of 24 and 1 during the second half, for scalars only."""
+    return 10.0 if t % 24.0 < 12.0 else 1.0
+
+class TestPiecewiseRate(unittest.TestCase):
+    def test_rate_and_pieces(self):
+        rate = rvg.PiecewiseRate([0, 8, 18], [1.0, 5.0, 2.0], period=24)
+
+        self.assertEqual([rate(t) for t in [0.0, 7.9, 8.0, 20.0, 24.0, 32.5]], [1.0, 1.0, 5.0, 2.0, 1.0, 5.0])
+        self.assertEqual(rate.piece(4), (32.0, 42.0, 5.0))
+        self.assertAlmostEqual(rate.mean(48.0), 2 * (8 * 1.0 + 10 * 5.0 + 6 * 2.0))
+        if np is not None:
+            self.assertEqual(rate(np.array([0.0, 8.0, 30.0])).tolist(), [1.0, 5.0, 1.0])
+
+    def test_invalid_table(self):
+        with self.assertRaises(ValueError):
+            rvg.PiecewiseRate([0, 5, 3], [1.0, 2.0, 3.0])
+        with self.assertRaises(ValueError):
+            rvg.PiecewiseRate([0, 5], [1.0, 2.0], period=4)
+
+class TestThinning(unittest.TestCase):
+    def test_piecewise_process(self):
+        rate = rvg.PiecewiseRate([0, 10, 20], [1.0, 8.0, 0.0], period=30)
+        arrivals = rvg.generate_nhpp(rate, 300.0, rng=rvg.make_rng(1))
+
+        self.assertEqual(arrivals, sorted(arrivals))
+        self.assertFalse(any(20.0 <= t % 30.0 for t in arrivals))
+        self.assertAlmostEqual(len(arrivals) / rate.mean(300.0), 1.0, delta=0.1)
+
+    def test_rate_function(self):
+        end_time = 24.0 * 50
+        for period in [None, 24.0]:
+            stream = rvg.ThinningArrivals(daily_rate, end_time, period=period, rng=rvg.make_rng(2))
+            arrivals = []
+            t = 0.0
+            while t <= end_time:
+                t = stream.next_time(t, None)
+                arrivals.append(t)
+
+            # mean of daily_rate over a period is 2 + 18 * 3 / 8, thinning against its maximum keeps 0.44
+            self.assertAlmostEqual((len(arrivals) - 1) / end_time, 2.0 + 18.0 * 3 / 8, delta=0.4)
+            self.assertGreater(stream.acceptance_rate, 0.65 if period is None else 0.95)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_process(self):
+        arrivals = rvg.generate_nhpp_batch([(0, 3.0), (50, 0.5)], 100.0, rng=rvg.make_rng(3))
+
+        self.assertTrue((np.diff(arrivals) > 0).all())
+        self.assertTrue(arrivals[-1] < 100.0)
+        self.assertAlmostEqual((arrivals < 50).sum() / 150.0, 1.0, delta=0.15)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_scalar_rate_function(self):
+        # the array path evaluates rate functions written for scalars one time at a time
+        arrivals = rvg.generate_nhpp_batch(shift_rate, 48.0, rng=rvg.make_rng(5))
+        self.assertAlmostEqual(len(arrivals) / 264.0, 1.0, delta=0.2)
+        self.assertLess((arrivals % 24.0 >= 12.0).sum(), (arrivals % 24.0 < 12.0).sum())
+
+        arrivals = de.simulate_one_server_queue(shift_rate, 20.0, 48.0, rng=rvg.make_rng(6))[0]
+        self.assertGreater(len(arrivals), 0)
+
+        vectorized = rvg.generate_nhpp_batch(lambda t : np.where(t % 24.0 < 12.0, 10.0, 1.0), 48.0, rng=rvg.make_rng(5),
+                                             vectorized=True)
+        self.assertEqual(vectorized.tolist(), rvg.generate_nhpp_batch(shift_rate, 48.0, rng=rvg.make_rng(5)).tolist())
+
+    def test_simulators_with_time_varying_rate(self):
+        # no arrivals after time 10
+        table = [(0, 2.0), (10, 0.0)]
+        for simulate in [lambda **kw : de.simulate_one_server_queue(table, 3.0, 50.0, **kw),
+                         lambda **kw : de.simulate_two_in_series_servers_queue(table, 3.0, 3.0, 50.0, **kw),
+                         lambda **kw : de.simulate_two_paralel_servers_queue(table, 3.0, 3.0, 50.0, **kw),
+                         lambda **kw : de.simulate_multi_server_queue(table, [3.0, 3.0], 50.0, **kw),
+                         lambda **kw : de.simulate_queue_network(table, de.one_server_stations(3.0), 50.0, **kw)]:
+            arrivals = simulate(rng=rvg.make_rng(4))[0]
+            self.assertGreater(len(arrivals), 0)
+            self.assertLess(max(arrivals), 10.0)
+
+        arrivals, departures, _ = de.simulate_one_server_queue(table, 3.0, 50.0, method="lindley")
+        self.assertLess(max(arrivals), 10.0)
+        self.assertEqual(len(arrivals), len(departures))
+
+        with self.assertRaises(ValueError):
+            de.simulate_one_server_queue(table, 3.0, 50.0, backend="numba")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+import src.discret_events as de
+from src.online_statistics import P2Quantile, TimeWeightedStatistics
+from test.helpers import recorded_stream
+from src.utils import calculate_busy_time
+
+class ListObserver(de.SimulationObserver):
+    """Rebuilds the output lists of the simulators from the observed events."""
+
+    def __init__(self):
+        self.arrival_times = {}
+        self.departure_times = {}
+        self.in_service = set()
+        self.closed = None
+
+    def on_arrival(self, t, customer):
+        self.arrival_times[customer] = t
+
+    def on_service_start(self, t, customer, server):
+        assert server not in self.in_service
+        self.in_service.add(server)
+
+    def on_service_end(self, t, customer, server):
+        self.in_service.remove(server)
+
+    def on_departure(self, t, customer):
+        self.departure_times[customer] = t
+
+    def on_close(self, t):
+        self.closed = t
+
+SIMULATIONS = [
+    lambda **kw : de.simulate_one_server_queue(1.0, 1.2, 20.0, **kw),
+    lambda **kw : de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 20.0, **kw),
+    lambda **kw : de.simulate_two_paralel_servers_queue(1.5, 1.0, 1.0, 20.0, **kw),
+    lambda **kw : de.simulate_multi_server_queue(2.0, [1.0, 0.8, 0.5], 20.0, **kw),
+    lambda **kw : de.simulate_queue_network(1.0, de.in_series_servers_stations([2.0, 1.5, 3.0]), 20.0, **kw),
+]
+
+class TestObservers(unittest.TestCase):
+    def test_observer_sees_the_same_events(self):
+        for simulate in SIMULATIONS:
+            arrivals, departures = simulate(stream=recorded_stream())[:2]
+
+            observer = ListObserver()
+            observed = simulate(stream=recorded_stream(), observer=observer)
+
+            self.assertEqual(observed[:2], ([], []))
+            self.assertEqual([observer.arrival_times[i] for i in range(len(arrivals))], arrivals)
+            self.assertEqual(sorted(observer.departure_times.values()), sorted(departures))
+            self.assertEqual(observer.in_service, set())
+            self.assertEqual(observer.closed, max(departures))
+
+    def test_statistics_observer(self):
+        for simulate in SIMULATIONS:
+            arrivals, departures = simulate(stream=recorded_stream())[:2]
+
+            observer = de.StatisticsObserver()
+            simulate(stream=recorded_stream(), observer=observer)
+
+            mean = (sum(departures) - sum(arrivals)) / len(departures)
+            self.assertEqual(observer.time_in_system.count, len(departures))
+            self.assertAlmostEqual(observer.time_in_system.mean, mean)
+            self.assertGreaterEqual(observer.waiting_time.min, 0.0)
+            self.assertLessEqual(observer.waiting_time.mean, observer.time_in_system.mean)
+            self.assertEqual(observer.queue_length.count, len(arrivals))
+            self.assertEqual(observer.arrival, {})
+
+    def test_p2_quantile(self):
+        rng = random.Random(3)
+        values = [rng.random() for _ in range(20000)]
+        estimator = P2Quantile(0.9)
+        for x in values:
+            estimator.add(x)
+
+        self.assertAlmostEqual(estimator.value, 0.9, delta=0.01)
+
+    def test_time_weighted_statistics(self):
+        stats = TimeWeightedStatistics()
+        stats.update(1.0, 2.0)
+        stats.add(3.0, -1.0)
+        stats.update(4.0, 0.0)
+
+        self.assertAlmostEqual(stats.mean, (0 * 1 + 2 * 2 + 1 * 1) / 4)
+        self.assertEqual(stats.max, 2.0)
+
+    def test_metrics_observer(self):
+        arrivals, departures, _ = de.simulate_one_server_queue(1.0, 1.2, 20.0, stream=recorded_stream())
+        metrics = de.MetricsObserver()
+        de.simulate_one_server_queue(1.0, 1.2, 20.0, stream=recorded_stream(), observer=metrics)
+
+        duration = max(departures)
+        self.assertAlmostEqual(metrics.utilisation(0), calculate_busy_time(arrivals, departures) / duration)
+        # Little's law over the whole run : area under n(t) = total time in system
+        self.assertAlmostEqual(metrics.number_in_system.area, sum(departures) - sum(arrivals))
+        self.assertEqual(metrics.event_counts["arrival"], len(arrivals))
+        self.assertEqual(metrics.event_counts["departure"], len(departures))
+        self.assertAlmostEqual(metrics.busy_periods.mean * metrics.busy_periods.count, calculate_busy_time(arrivals, departures))
+        self.assertGreater(metrics.wall_time, 0.0)
+
+    def test_metrics_of_stations_in_series(self):
+        metrics = de.MetricsObserver(server_stations=(0, 1))
+        trace = de.TraceRecorder()
+        de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 200.0, observer=de.ObserverGroup(metrics, trace))
+
+        total = metrics.station_number[0].area + metrics.station_number[1].area
+        self.assertAlmostEqual(total, metrics.number_in_system.area)
+        self.assertAlmostEqual(metrics.number_in_system.area, sum(trace.columns["departure"]) - sum(trace.columns["arrival"]))
+        self.assertTrue(0.0 < metrics.utilisation(1) < 1.0)
+        self.assertGreaterEqual(metrics.queue_length.mean, 0.0)
+        self.assertEqual(metrics.queue_length.value, 0)
+
+        # the default single station layout does not fit servers in series
+        with self.assertRaises(ValueError):
+            de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 200.0, observer=de.MetricsObserver())
+        with self.assertRaises(ValueError):
+            de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 200.0, observer=de.MetricsObserver(server_stations=(0,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
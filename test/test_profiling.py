@@ -0,0 +1,66 @@
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+
+class TestEventProfiler(unittest.TestCase):
+    def test_one_server(self):
+        expected = de.simulate_one_server_queue(0.9, 1.0, 500.0, rng=rvg.make_rng(1))
+        profiler = de.EventProfiler()
+        arrivals, departures, exceeded_time = de.simulate_one_server_queue(0.9, 1.0, 500.0, rng=rvg.make_rng(1), profiler=profiler)
+
+        # profiling does not change the simulation
+        self.assertEqual((arrivals, departures, exceeded_time), expected)
+
+        self.assertEqual(profiler.counts, {"arrival" : len(arrivals), "departure" : len(departures)})
+        self.assertEqual(profiler.events, 2 * len(arrivals))
+        self.assertEqual(profiler.section_calls, {"generate" : 2 * len(arrivals) + 1, "record" : 2 * len(arrivals)})
+        self.assertEqual(profiler.end_time, departures[-1])
+        self.assertGreater(profiler.wall_time, 0)
+
+        shares = profiler.breakdown()
+        self.assertEqual(set(shares), {"generate", "record", "loop", "profiling"})
+        self.assertAlmostEqual(sum(shares.values()), 1.0)
+
+    def test_trace_sampling(self):
+        profiler = de.EventProfiler(trace_every=10)
+        de.simulate_two_in_series_servers_queue(1.0, 2.0, 2.0, 200.0, rng=rvg.make_rng(2), profiler=profiler)
+
+        self.assertEqual(len(profiler.traces), profiler.events // 10)
+        self.assertEqual([trace[0] for trace in profiler.traces], list(range(10, profiler.events + 1, 10)))
+        for index, t, kind, (n_1, n_2) in profiler.traces:
+            self.assertIn(kind, ["arrival", "service_end", "departure"])
+            self.assertTrue(n_1 >= 0 and n_2 >= 0)
+
+        bounded = de.EventProfiler(trace_every=1, max_traces=5)
+        de.simulate_two_in_series_servers_queue(1.0, 2.0, 2.0, 200.0, rng=rvg.make_rng(2), profiler=bounded)
+        self.assertEqual([trace[0] for trace in bounded.traces], list(range(bounded.events - 4, bounded.events + 1)))
+        self.assertEqual(bounded.traces[-1][3], (0, 0))
+
+    def test_callback(self):
+        sampled = []
+        profiler = de.EventProfiler(trace_every=7, callback=lambda *event: sampled.append(event))
+        arrivals, departures, _, c_1, c_2 = de.simulate_two_paralel_servers_queue(1.0, 0.6, 0.6, 200.0, rng=rvg.make_rng(3),
+                                                                                  profiler=profiler)
+
+        self.assertEqual(profiler.counts, {"arrival" : len(arrivals), "departure" : c_1 + c_2})
+        self.assertEqual(len(sampled), profiler.events // 7)
+        self.assertEqual(len(profiler.traces), 0)
+        self.assertEqual(profiler.section_calls["record"], 2 * len(arrivals) + c_1 + c_2)
+
+    def test_queue_network(self):
+        profiler = de.EventProfiler(trace_every=1)
+        arrivals, departures, _, served = de.simulate_queue_network(1.0, de.in_series_servers_stations([2.0, 2.0]), 100.0,
+                                                                    rng=rvg.make_rng(4), profiler=profiler)
+
+        self.assertEqual(profiler.counts, {"arrival" : len(arrivals), "service_end" : 2 * len(arrivals)})
+        self.assertEqual(len(profiler.traces[0][3]), 2)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            de.simulate_one_server_queue(1.0, 2.0, 10.0, method="lindley", profiler=de.EventProfiler())
+        with self.assertRaises(ValueError):
+            de.simulate_two_in_series_servers_queue(1.0, 2.0, 2.0, 10.0, backend="numba", profiler=de.EventProfiler())
+
+
+if __name__ == '__main__':
+    unittest.main()
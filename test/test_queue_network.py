@@ -0,0 +1,138 @@
+import math
+import os
+import tempfile
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src.replication import seed_generators
+from src.random_variable_generator.streams import ExponentialBuffer
+from src.utils import calculate_average_time_in_system
+
+def constant_stream():
+    """Stream with every rate-1 exponential equal to 0.5."""
+    return ExponentialBuffer(fill=lambda size: [0.5] * size)
+
+class TestQueueNetwork(unittest.TestCase):
+    def test_scheduler_order(self):
+        scheduler = de.EventScheduler()
+        for time in [3.0, 1.0, 2.0, 1.0]:
+            scheduler.schedule(time, "event", time)
+
+        times = [scheduler.pop()[0] for _ in range(4)]
+        self.assertEqual(times, [1.0, 1.0, 2.0, 3.0])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_matches_one_server_queue(self):
+        expected = de.simulate_one_server_queue(1.0, 1.25, 5.0, stream=constant_stream())
+        arrivals, departures, exceeded_time, served = de.simulate_queue_network(1.0, de.one_server_stations(1.25), 5.0, stream=constant_stream())
+
+        self.assertEqual((arrivals, departures, exceeded_time), expected)
+        self.assertEqual(served, [[len(arrivals)]])
+
+    def test_matches_two_in_series_servers_queue(self):
+        expected = de.simulate_two_in_series_servers_queue(1.0, 1.25, 0.9, 5.0, stream=constant_stream())
+        arrivals, departures, exceeded_time, _ = de.simulate_queue_network(1.0, de.in_series_servers_stations([1.25, 0.9]), 5.0, stream=constant_stream())
+
+        self.assertEqual(arrivals, expected[0])
+        self.assertEqual(departures, expected[1])
+        self.assertAlmostEqual(exceeded_time, expected[2])
+
+    def test_k_servers_and_k_stages(self):
+        for stations in [de.parallel_servers_stations([1.0] * 5), de.in_series_servers_stations([3.0] * 5)]:
+            arrivals, departures, exceeded_time, served = de.simulate_queue_network(2.0, stations, 20.0)
+
+            self.assertEqual(len(arrivals), len(departures))
+            self.assertFalse(any(math.isnan(d) for d in departures))
+            self.assertTrue(all(d > a for a, d in zip(arrivals, departures)))
+            self.assertGreaterEqual(exceeded_time, 0.0)
+
+        self.assertEqual([sum(s) for s in served], [len(arrivals)] * 5)
+
+    def test_feedback_network(self):
+        # customers leaving station 1 go back to station 0 with probability 0.5
+        stations = [de.Station([4.0], [(1.0, 1)]), de.Station([2.0, 2.0], [(0.5, 0)])]
+        arrivals, departures, _, served = de.simulate_queue_network(1.0, stations, 50.0)
+
+        self.assertEqual(sum(served[1]), sum(served[0]))
+        self.assertGreater(sum(served[0]), len(arrivals))
+        self.assertGreater(calculate_average_time_in_system(arrivals, departures), 0.0)
+
+    def test_checkpoint_and_resume(self):
+        stations = de.in_series_servers_stations([1.5, 1.2])
+
+        seed_generators(9)
+        expected = de.simulate_queue_network(1.0, stations, 200.0, stream=ExponentialBuffer(block_size=64))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.ckpt")
+
+            seed_generators(9)
+            network = de.QueueNetwork(1.0, stations, 200.0, stream=ExponentialBuffer(block_size=64))
+            for _ in range(150):
+                network.step()
+            network.save_checkpoint(path)
+
+            # the interrupted run goes on and its progress is lost
+            seed_generators(123)
+            for _ in range(20):
+                network.step()
+
+            self.assertEqual(de.resume_queue_network(path, checkpoint_every=200), expected)
+
+    def test_periodic_checkpoints_with_observer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.ckpt")
+            observer = de.StatisticsObserver()
+            de.simulate_queue_network(2.0, de.parallel_servers_stations([1.0, 1.5]), 100.0, observer=observer,
+                                      checkpoint_path=path, checkpoint_every=250)
+
+            saved = de.QueueNetwork.resume(path)
+            self.assertEqual(saved.events % 250, 0)
+            self.assertLessEqual(saved.observer.time_in_system.count, observer.time_in_system.count)
+
+
+    def test_scheduler_cancel(self):
+        scheduler = de.EventScheduler()
+        ids = [scheduler.schedule(float(time), "event", time) for time in range(200)]
+        for event_id in ids[:150:2] + ids[150:]:
+            scheduler.cancel(event_id)
+
+        self.assertEqual(len(scheduler), 75)
+        self.assertEqual([scheduler.pop()[2] for _ in range(75)], list(range(1, 150, 2)))
+
+    def test_finite_capacity(self):
+        # M/M/1/K : the fraction of arrivals finding the station full is (1 - r) r^K / (1 - r^(K + 1))
+        r, capacity = 0.8, 3
+        network = de.QueueNetwork(r, de.one_server_stations(1.0, capacity=capacity), 50000.0, rng=rvg.make_rng(2))
+        arrivals, departures, _, served = network.run()
+
+        self.assertEqual(sum(served[0]) + network.blocked[0], len(arrivals))
+        self.assertAlmostEqual(network.blocked[0] / len(arrivals), (1 - r) * r ** capacity / (1 - r ** (capacity + 1)), delta=0.01)
+
+    def test_balking_and_reneging(self):
+        stations = de.parallel_servers_stations([1.0, 1.0], balking=lambda waiting : 0.1 * waiting, patience=0.5)
+        network = de.QueueNetwork(10.0, stations, 500.0, rng=rvg.make_rng(3))
+        arrivals, departures, _, served = network.run()
+
+        self.assertGreater(network.balked[0], 0)
+        self.assertGreater(network.reneged[0], 0)
+        self.assertEqual(sum(served[0]) + network.balked[0] + network.reneged[0], len(arrivals))
+        self.assertFalse(any(math.isnan(d) for d in departures))
+        self.assertEqual(len(network.scheduler), 0)
+
+    def test_observers_with_abandonment(self):
+        statistics = de.StatisticsObserver()
+        metrics = de.MetricsObserver()
+        network = de.QueueNetwork(3.0, de.one_server_stations(1.0, capacity=20, patience=0.2), 300.0,
+                                  observer=de.ObserverGroup(statistics, metrics), rng=rvg.make_rng(4))
+        network.run()
+
+        self.assertEqual(statistics.abandoned, network.blocked[0] + network.reneged[0])
+        self.assertEqual(metrics.event_counts["abandon"], statistics.abandoned)
+        self.assertEqual(statistics.time_in_system.count, network.n_a)
+        self.assertEqual(metrics.queue_length.value, 0)
+        self.assertEqual(metrics.number_in_system.value, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
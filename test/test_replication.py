@@ -0,0 +1,112 @@
+import random
+import unittest
+from src.discret_events.one_server_queue import simulate_one_server_queue
+from src.discret_events.multi_server_queue import simulate_multi_server_queue
+from src.online_statistics import RunningStatistics
+from src.random_variable_generator.rvg import np
+from src.replication import run_replications, run_until_precision, spawn_seeds, student_t_quantile, summarize_one_server_result
+
+class TestRunningStatistics(unittest.TestCase):
+    def test_merge(self):
+        values = [0.5 * i * i - 3 * i for i in range(50)]
+        single = RunningStatistics()
+        left, right = RunningStatistics(), RunningStatistics()
+
+        for i, x in enumerate(values):
+            single.add(x)
+            (left if i < 20 else right).add(x)
+
+        left.merge(right)
+        mean = sum(values) / len(values)
+        variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
+
+        self.assertAlmostEqual(single.mean, mean)
+        self.assertAlmostEqual(single.variance, variance)
+        self.assertAlmostEqual(left.mean, mean)
+        self.assertAlmostEqual(left.variance, variance)
+        self.assertEqual((left.min, left.max), (min(values), max(values)))
+
+class TestRunReplications(unittest.TestCase):
+    def test_spawn_seeds(self):
+        seeds = spawn_seeds(1, 10)
+        self.assertEqual(len(set(seeds)), 10)
+        self.assertEqual(spawn_seeds(1, 4, 6), seeds[6:])
+
+    def test_reproducible_across_workers(self):
+        params = {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}
+
+        serial = run_replications(simulate_one_server_queue, params, 200, workers=1, seed=3, chunk_size=25)
+        parallel = run_replications(simulate_one_server_queue, params, 200, workers=2, seed=3, chunk_size=25)
+
+        self.assertEqual(serial["customers"].count, 200)
+        for metric in serial:
+            self.assertEqual(serial[metric].mean, parallel[metric].mean)
+            self.assertEqual(serial[metric].variance, parallel[metric].variance)
+
+        # 5 expected arrivals in [0, 5], mean time in system 1 / (mu - lmd) = 1
+        self.assertAlmostEqual(serial["customers"].mean, 5.0, delta=0.5)
+
+    def test_caller_state_untouched(self):
+        random.seed(5)
+        expected = random.getstate()
+        np_state = np.random.get_state()[1].copy() if np is not None else None
+        run_replications(simulate_one_server_queue, {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}, 10, workers=1)
+
+        self.assertEqual(random.getstate(), expected)
+        if np is not None:
+            self.assertTrue((np.random.get_state()[1] == np_state).all())
+
+    def test_multi_server(self):
+        params = {"lmd" : 3.0, "mus" : [1.0, 1.0, 1.0, 1.0], "end_time" : 5.0}
+        totals = run_replications(simulate_multi_server_queue, params, 50, workers=1)
+
+        self.assertEqual(totals["avg_time_in_system"].count, 50)
+        self.assertGreater(totals["avg_time_in_system"].mean, 0.0)
+
+class TestRunUntilPrecision(unittest.TestCase):
+    def test_stops_when_precise(self):
+        params = {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}
+        totals, half_width = run_until_precision(simulate_one_server_queue, params, "utilisation", 0.02,
+                                                 batch_size=50, workers=1, summarize=summarize_one_server_result)
+        stats = totals["utilisation"]
+
+        self.assertLessEqual(half_width, 0.02)
+        self.assertLess(stats.count, 100000)
+        self.assertEqual(stats.count % 50, 0)
+        self.assertTrue(0.0 < stats.mean < 1.0)
+
+    def test_max_replications(self):
+        params = {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}
+        totals, half_width = run_until_precision(simulate_one_server_queue, params, "avg_time_in_system", 0.0,
+                                                 batch_size=40, max_replications=100, workers=1)
+
+        self.assertEqual(totals["avg_time_in_system"].count, 100)
+        self.assertGreater(half_width, 0.0)
+
+        with self.assertRaises(ValueError):
+            run_until_precision(simulate_one_server_queue, params, "avg_time_in_system", 0.1, max_replications=0, workers=1)
+
+    def test_minimum_replications(self):
+        params = {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}
+        totals, _ = run_until_precision(simulate_one_server_queue, params, "avg_time_in_system", 10.0,
+                                        batch_size=2, workers=1)
+
+        self.assertEqual(totals["avg_time_in_system"].count, 10)
+        self.assertAlmostEqual(student_t_quantile(0.975, 1), 12.7062, places=3)
+        self.assertAlmostEqual(student_t_quantile(0.975, 2), 4.3027, places=3)
+        self.assertAlmostEqual(student_t_quantile(0.975, 10), 2.2281, places=3)
+
+    def test_shared_workers(self):
+        params = {"lmd" : 1.0, "mu" : 2.0, "end_time" : 5.0}
+        expected, _ = run_until_precision(simulate_one_server_queue, params, "avg_time_in_system", 0.0,
+                                          batch_size=40, max_replications=120, workers=1, chunk_size=20)
+        totals, _ = run_until_precision(simulate_one_server_queue, params, "avg_time_in_system", 0.0,
+                                        batch_size=40, max_replications=120, workers=2)
+
+        self.assertEqual(totals["avg_time_in_system"].count, 120)
+        for metric in expected:
+            self.assertAlmostEqual(totals[metric].mean, expected[metric].mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
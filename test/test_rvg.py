@@ -0,0 +1,98 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import src.random_variable_generator.rvg as rvg
+from src.discret_events import simulate_one_server_queue, simulate_queue_network, one_server_stations
+
+np = rvg.np
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchGenerators(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+
+    def test_exponential_batch(self):
+        lam = 2.0
+        values = rvg.generate_exponential_batch(lam, 100000)
+
+        self.assertEqual(values.shape, (100000,))
+        self.assertTrue((values >= 0).all())
+        self.assertAlmostEqual(values.mean(), 1 / lam, delta=0.01)
+
+    def test_out_argument(self):
+        out = np.zeros(1000)
+        result = rvg.generate_exponential_batch(1.0, out=out)
+
+        self.assertIs(result, out)
+        self.assertTrue((out > 0).all())
+
+    def test_discrete_batches(self):
+        n = 100000
+
+        poisson = rvg.generate_poisson_batch(4.0, n)
+        binomial = rvg.generate_binomial_batch(10, 0.3, n)
+        geometric = rvg.generate_geometric_batch(0.25, n)
+        numbers = rvg.generate_random_number_batch(6, n)
+
+        self.assertAlmostEqual(poisson.mean(), 4.0, delta=0.05)
+        self.assertAlmostEqual(poisson.var(), 4.0, delta=0.1)
+        self.assertAlmostEqual(binomial.mean(), 3.0, delta=0.05)
+        self.assertTrue(binomial.max() <= 10)
+        self.assertAlmostEqual(geometric.mean(), 4.0, delta=0.1)
+        self.assertTrue(geometric.min() >= 1)
+        self.assertEqual(set(numbers.tolist()), {1, 2, 3, 4, 5, 6})
+
+    def test_poisson_process_batch(self):
+        lam = 3.0
+        t = 10.0
+        counts = []
+
+        for _ in range(2000):
+            arrivals = rvg.generate_poisson_process_batch(lam, t)
+            self.assertTrue((np.diff(arrivals) > 0).all())
+            self.assertTrue(len(arrivals) == 0 or arrivals[-1] < t)
+            counts.append(len(arrivals))
+
+        self.assertAlmostEqual(sum(counts) / len(counts), lam * t, delta=0.5)
+
+        self.assertEqual(len(rvg.generate_poisson_process_batch(lam, 0.0)), 0)
+        self.assertEqual(rvg.generate_poisson_process(lam, 0.0), [])
+
+
+class TestGenerators(unittest.TestCase):
+    def test_same_seed_same_output(self):
+        first = simulate_one_server_queue(1.0, 1.5, 200, rng=rvg.make_rng(3))
+        second = simulate_one_server_queue(1.0, 1.5, 200, rng=rvg.make_rng(3))
+
+        self.assertEqual(first, second)
+
+    def test_global_state_untouched(self):
+        random.seed(5)
+        expected = random.random()
+
+        random.seed(5)
+        simulate_queue_network(1.0, one_server_stations(1.5), 100, rng=rvg.make_rng(1))
+        self.assertEqual(random.random(), expected)
+
+    def test_spawned_streams_differ(self):
+        first, second = rvg.spawn_rngs(7, 2)
+        a = [rvg.generate_U(first) for _ in range(10)]
+        b = [rvg.generate_U(second) for _ in range(10)]
+
+        self.assertNotEqual(a, b)
+        again = rvg.spawn_rngs(7, 2)[0]
+        self.assertEqual(a, [rvg.generate_U(again) for _ in range(10)])
+
+    def test_reproducible_across_threads(self):
+        def run(rng):
+            return simulate_one_server_queue(1.0, 1.2, 100, rng=rng)[1]
+
+        serial = [run(rng) for rng in rvg.spawn_rngs(11, 4)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(run, rvg.spawn_rngs(11, 4)))
+
+        self.assertEqual(serial, threaded)
+
+
+if __name__ == '__main__':
+    unittest.main()
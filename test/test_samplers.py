@@ -0,0 +1,51 @@
+import random
+import unittest
+from src.random_variable_generator import rvg
+from src.random_variable_generator import samplers
+
+def mean_and_variance(values):
+    mean = sum(values) / len(values)
+    return mean, sum((x - mean) ** 2 for x in values) / (len(values) - 1)
+
+class TestSamplers(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+
+    def test_alias_sampler(self):
+        sampler = samplers.AliasSampler([0.1, 0.2, 0.3, 0.4])
+        n = 100000
+        counts = [0] * 4
+        for _ in range(n):
+            counts[sampler.sample()] += 1
+
+        for count, p in zip(counts, [0.1, 0.2, 0.3, 0.4]):
+            self.assertAlmostEqual(count / n, p, delta=0.01)
+
+    def test_poisson(self):
+        for lam in [2.0, 300.0]:
+            mean, variance = mean_and_variance([samplers.sample_poisson(lam) for _ in range(50000)])
+            self.assertAlmostEqual(mean, lam, delta=0.02 * lam)
+            self.assertAlmostEqual(variance, lam, delta=0.05 * lam)
+
+        self.assertIsInstance(samplers.poisson_sampler(2.0), samplers.AliasSampler)
+        self.assertIsInstance(samplers.poisson_sampler(300.0), samplers.PoissonRejectionSampler)
+        self.assertIs(samplers.poisson_sampler(300.0), samplers.poisson_sampler(300.0))
+
+    def test_binomial(self):
+        for n, p in [(10, 0.3), (1000, 0.4), (1000, 0.9)]:
+            mean, variance = mean_and_variance([samplers.sample_binomial(n, p) for _ in range(50000)])
+            self.assertAlmostEqual(mean, n * p, delta=0.02 * n * p)
+            self.assertAlmostEqual(variance, n * p * (1 - p), delta=0.05 * n * p * (1 - p))
+
+        self.assertIsInstance(samplers.binomial_sampler(1000, 0.9), samplers.BinomialRejectionSampler)
+        self.assertTrue(all(0 <= samplers.sample_binomial(20, 0.5) <= 20 for _ in range(1000)))
+
+    @unittest.skipIf(rvg.np is None, "NumPy is not installed")
+    def test_sample_batch(self):
+        rvg.np.random.seed(0)
+        values = samplers.poisson_sampler(4.0).sample_batch(100000)
+        self.assertAlmostEqual(values.mean(), 4.0, delta=0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.replication import run_chunk, spawn_seeds, summarize_one_server_result
+from src.service import ResultCache, SimulationService, request_key, summarize_totals
+import src.discret_events as de
+
+PARAMS = {"lmd" : 1.0, "mu" : 1.5, "end_time" : 20.0}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def failing_simulator(**params):
+    raise RuntimeError("simulation failed")
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2, ttl=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResultCache(ttl=10.0, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 9.0
+        self.assertIn("a", cache)
+        clock.now = 10.0
+        self.assertNotIn("a", cache)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_request_key(self):
+        self.assertEqual(request_key("multi_server", {"mus" : [1.0, 2.0], "lmd" : 1.0}, 0, 10),
+                         request_key("multi_server", {"lmd" : 1.0, "mus" : (1.0, 2.0)}, 0, 10))
+
+class TestSimulationService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.service = SimulationService(executor=self.executor, chunk_size=10)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def test_result_matches_replications(self):
+        totals = await self.service.run("one_server", PARAMS, seed=3, n_replications=30)
+        expected = run_chunk(de.simulate_one_server_queue, PARAMS, spawn_seeds(3, 30), summarize_one_server_result, rng=True)
+
+        self.assertEqual(totals["avg_time_in_system"].count, 30)
+        for metric, stats in expected.items():
+            self.assertAlmostEqual(totals[metric].mean, stats.mean)
+        self.assertEqual(set(summarize_totals(totals)["utilisation"]), {"mean", "std", "count", "half_width"})
+
+    async def test_deduplication_and_cache(self):
+        calls = []
+        def counted(**params):
+            calls.append(1)
+            return de.simulate_one_server_queue(**params)
+        self.service.register("counted", counted, summarize_one_server_result)
+
+        first, second = await asyncio.gather(self.service.run("counted", PARAMS, 1, 20),
+                                             self.service.run("counted", PARAMS, 1, 20))
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 20)
+
+        self.assertIs(await self.service.run("counted", PARAMS, 1, 20), first)
+        self.assertEqual(len(calls), 20)
+
+        await self.service.run("counted", PARAMS, 2, 20)
+        self.assertEqual(len(calls), 40)
+
+    async def test_progress(self):
+        params = {"lmd" : 1.0, "mu_1" : 1.0, "mu_2" : 1.0, "end_time" : 20.0}
+        updates = [(completed, totals["customers"].count)
+                   async for completed, totals in self.service.progress("two_parallel", params, 0, 35)]
+        self.assertEqual(updates, [(10, 10), (20, 20), (30, 30), (35, 35)])
+
+        cached = [completed async for completed, _ in self.service.progress("two_parallel", params, 0, 35)]
+        self.assertEqual(cached, [35])
+
+    async def test_failed_run(self):
+        self.service.register("failing", failing_simulator)
+
+        with self.assertRaises(RuntimeError):
+            await self.service.run("failing", PARAMS, 0, 20)
+        with self.assertRaises(RuntimeError):
+            async for _ in self.service.progress("failing", PARAMS, 0, 20):
+                pass
+        self.assertEqual(len(self.service.cache), 0)
+        self.assertEqual(self.service.jobs, {})
+
+        with self.assertRaises(KeyError):
+            await self.service.run("unknown", PARAMS)
+
+
+if __name__ == '__main__':
+    unittest.main()
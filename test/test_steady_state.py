@@ -0,0 +1,45 @@
+import random
+import unittest
+from src.discret_events.one_server_queue import simulate_one_server_queue
+from src.discret_events.multi_server_queue import simulate_multi_server_queue
+from src.steady_state import batch_means, estimate_steady_state, mser_truncation
+
+class TestSteadyState(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+
+    def test_mser_truncation(self):
+        # a transient of 200 observations decaying from 50 to the steady state around 1
+        values = [1.0 + 50.0 * (1 - i / 200) if i < 200 else 1.0 + random.uniform(-0.5, 0.5) for i in range(2000)]
+        warmup = mser_truncation(values)
+
+        self.assertGreaterEqual(warmup, 150)
+        self.assertLessEqual(warmup, 300)
+        self.assertEqual(mser_truncation([1.0] * 3), 0)
+
+    def test_batch_means(self):
+        values = [random.gauss(3.0, 1.0) for _ in range(10000)]
+        mean, half_width = batch_means(values, 20)
+
+        self.assertAlmostEqual(mean, 3.0, delta=3 * half_width)
+        self.assertLess(half_width, 0.1)
+        with self.assertRaises(ValueError):
+            batch_means([1.0] * 5, 20)
+
+    def test_mm1_time_in_system(self):
+        # steady-state mean time in system of M/M/1 : 1 / (mu - lmd) = 2
+        result = estimate_steady_state(simulate_one_server_queue, {"lmd" : 1.0, "mu" : 1.5, "end_time" : 20000.0})
+
+        self.assertAlmostEqual(result["mean"], 2.0, delta=max(3 * result["half_width"], 0.1))
+        self.assertGreater(result["customers"], 15000)
+
+    def test_waiting_time(self):
+        params = {"lmd" : 3.0, "mus" : [1.0] * 4, "end_time" : 20000.0}
+        result = estimate_steady_state(simulate_multi_server_queue, params, metric="waiting_time")
+
+        # M/M/4 with rho = 0.75 : mean waiting time C(4, 3) / (4 - 3) = 0.5094
+        self.assertAlmostEqual(result["mean"], 0.5094, delta=max(3 * result["half_width"], 0.05))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import math
+import unittest
+import src.discret_events as de
+from src.random_variable_generator.streams import CommonRandomNumbers, ExponentialBuffer
+from src.online_statistics import RunningStatistics
+from src.replication import summarize_queue_result
+
+class TestExponentialBuffer(unittest.TestCase):
+    def test_refills_in_blocks(self):
+        calls = []
+
+        def fill(size):
+            calls.append(size)
+            return [1.0] * size
+
+        stream = ExponentialBuffer(block_size=4, fill=fill)
+        times = [stream.next_time(10.0, 2.0) for _ in range(9)]
+
+        self.assertEqual(times, [10.5] * 9)
+        self.assertEqual(calls, [4, 4, 4])
+
+    def test_default_fill_mean(self):
+        stream = ExponentialBuffer(block_size=1000)
+        n = 50000
+        mean = sum(stream.next_time(0.0, 4.0) for _ in range(n)) / n
+        self.assertAlmostEqual(mean, 0.25, delta=0.01)
+
+    def test_simulators_accept_stream(self):
+        recorded = lambda size: [0.5] * size
+
+        arrivals, departures, exceeded_time = de.simulate_one_server_queue(1.0, 1.0, 2.0, stream=ExponentialBuffer(fill=recorded))
+        self.assertEqual(arrivals, [0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(departures, [1.0, 1.5, 2.0, 2.5])
+        self.assertEqual(exceeded_time, 0.5)
+
+        arrivals, departures, _ = de.simulate_two_in_series_servers_queue(1.0, 1.0, 1.0, 2.0, stream=ExponentialBuffer())
+        self.assertGreaterEqual(len(arrivals), len(departures))
+
+        arrivals, departures, _, c_1, c_2 = de.simulate_two_paralel_servers_queue(1.0, 1.0, 1.0, 2.0, stream=ExponentialBuffer())
+        self.assertEqual(len(departures), c_1 + c_2)
+
+class TestCommonRandomNumbers(unittest.TestCase):
+    def test_seeded_and_antithetic_streams(self):
+        crn = CommonRandomNumbers(5)
+        first = [crn.arrival_stream().next_time(0.0, 1.0) for _ in range(3)]
+        stream, other, antithetic = crn.arrival_stream(), crn.arrival_stream(), crn.antithetic_pair().arrival_stream()
+
+        for _ in range(100):
+            e, e_other, e_antithetic = stream.next_time(0.0, 1.0), other.next_time(0.0, 1.0), antithetic.next_time(0.0, 1.0)
+            self.assertEqual(e, e_other)
+            self.assertAlmostEqual(math.exp(-e) + math.exp(-e_antithetic), 1.0)
+
+        self.assertEqual(len(set(first)), 1)
+        self.assertNotEqual(crn.service_streams(2)[0].next_time(0.0, 1.0), crn.service_streams(2)[1].next_time(0.0, 1.0))
+
+    def test_common_random_numbers_reduce_variance(self):
+        # mean time in system of two parallel servers with rate 1 against one server with rate 2
+        def difference(arrival_stream, parallel_streams, one_streams):
+            parallel = de.simulate_two_paralel_servers_queue(1.5, 1.0, 1.0, 20.0, arrival_stream=arrival_stream[0],
+                                                             service_streams=parallel_streams)
+            one = de.simulate_one_server_queue(1.5, 2.0, 20.0, arrival_stream=arrival_stream[1], service_streams=one_streams)
+            return summarize_queue_result(parallel)["avg_time_in_system"] - summarize_queue_result(one)["avg_time_in_system"]
+
+        common, independent = RunningStatistics(), RunningStatistics()
+        for i in range(300):
+            crn = CommonRandomNumbers(i, block_size=64)
+            common.add(difference([crn.arrival_stream(), crn.arrival_stream()], crn.service_streams(2), crn.service_streams(1)))
+
+            a, b = CommonRandomNumbers(f"{i}:a", block_size=64), CommonRandomNumbers(f"{i}:b", block_size=64)
+            independent.add(difference([a.arrival_stream(), b.arrival_stream()], a.service_streams(2), b.service_streams(1)))
+
+        self.assertLess(common.variance, independent.variance / 2)
+
+    def test_service_streams_count(self):
+        with self.assertRaises(ValueError):
+            de.simulate_multi_server_queue(1.0, [1.0, 1.0, 1.0], 5.0, service_streams=CommonRandomNumbers(0).service_streams(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
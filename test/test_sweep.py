@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from src.discret_events.two_in_series_servers_queue import simulate_two_in_series_servers_queue
+from src.discret_events.multi_server_queue import simulate_multi_server_queue
+from src.sweep import estimate_cost, load_sweep, parameter_grid, run_sweep
+
+class TestSweep(unittest.TestCase):
+    def test_parameter_grid(self):
+        grid = parameter_grid({"lmd" : [1.0, 2.0], "mu" : [3.0, 4.0, 5.0]})
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(grid[0], {"lmd" : 1.0, "mu" : 3.0})
+
+    def test_estimate_cost(self):
+        light = estimate_cost({"lmd" : 0.5, "mu_1" : 1.0, "mu_2" : 2.0, "end_time" : 10.0})
+        heavy = estimate_cost({"lmd" : 0.95, "mu_1" : 1.0, "mu_2" : 2.0, "end_time" : 10.0})
+        self.assertGreater(heavy, 10 * light)
+        self.assertAlmostEqual(estimate_cost({"lmd" : 1.0, "mus" : [1.0, 1.0], "end_time" : 1.0}), 2.0)
+
+    def test_run_and_resume(self):
+        ranges = {"lmd" : [0.5, 0.9], "mu_1" : [1.0], "mu_2" : [1.0, 2.0], "end_time" : [5.0]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.csv")
+            results = run_sweep(simulate_two_in_series_servers_queue, ranges, 60, path, workers=1, chunk_size=25)
+
+            self.assertEqual(len(results), 4)
+            for params, totals in results:
+                self.assertEqual(totals["avg_time_in_system"].count, 60)
+            self.assertEqual(results[3][0], {"lmd" : 0.9, "mu_1" : 1.0, "mu_2" : 2.0, "end_time" : 5.0})
+
+            # drop the last units as if the sweep had been interrupted, then resume
+            with open(path) as f:
+                lines = f.readlines()
+            with open(path, "w") as f:
+                f.writelines(lines[:-3])
+
+            resumed = run_sweep(simulate_two_in_series_servers_queue, ranges, 60, path, workers=1, chunk_size=25)
+            with open(path) as f:
+                self.assertEqual(len(f.readlines()), len(lines))
+
+            for (_, totals), (_, expected) in zip(resumed, results):
+                self.assertAlmostEqual(totals["avg_time_in_system"].mean, expected["avg_time_in_system"].mean)
+
+    def test_parallel_workers_and_list_parameters(self):
+        ranges = {"lmd" : [1.0, 2.0], "mus" : [[1.0, 1.5, 2.0]], "end_time" : [5.0]}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sweep.csv")
+            run_sweep(simulate_multi_server_queue, ranges, 40, path, workers=2, chunk_size=10)
+            results = load_sweep(path)
+
+            self.assertEqual([params["lmd"] for params, _ in results], [1.0, 2.0])
+            self.assertEqual(results[0][0]["mus"], [1.0, 1.5, 2.0])
+            self.assertEqual(results[1][1]["customers"].count, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
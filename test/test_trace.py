@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import src.discret_events as de
+from test.helpers import recorded_stream
+
+class TestTraceRecorder(unittest.TestCase):
+    def test_in_memory_trace(self):
+        arrivals, departures, _, c_1, c_2 = de.simulate_two_paralel_servers_queue(2.0, 1.0, 1.5, 50.0, stream=recorded_stream(5))
+
+        recorder = de.TraceRecorder()
+        de.simulate_two_paralel_servers_queue(2.0, 1.0, 1.5, 50.0, stream=recorded_stream(5), observer=recorder)
+        columns = recorder.columns
+
+        self.assertEqual(len(recorder), len(arrivals))
+        self.assertEqual(columns["arrival"].tolist(), arrivals)
+        self.assertEqual(columns["departure"].tolist(), departures)
+        self.assertEqual(columns["server"].tolist().count(0), c_1)
+        self.assertEqual(columns["server"].tolist().count(1), c_2)
+        self.assertTrue(all(a <= s < d for a, s, d in zip(arrivals, columns["service_start"], departures)))
+
+    def test_spilled_trace(self):
+        arrivals, departures, _ = de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 200.0, stream=recorded_stream(5))
+
+        with tempfile.TemporaryDirectory() as path:
+            recorder = de.TraceRecorder(path, spill_rows=16)
+            de.simulate_two_in_series_servers_queue(1.0, 1.5, 1.2, 200.0, stream=recorded_stream(5), observer=recorder)
+
+            self.assertEqual(len(recorder.columns["arrival"]), 0)
+            self.assertEqual(os.path.getsize(os.path.join(path, "arrival.bin")), 8 * len(arrivals))
+
+            columns = de.load_trace(path)
+            self.assertEqual(columns["arrival"].tolist(), arrivals)
+            self.assertEqual(columns["departure"].tolist(), departures)
+            self.assertEqual(set(columns["server"].tolist()), {1})
+            del columns
+
+    def test_save_and_load(self):
+        recorder = de.TraceRecorder()
+        arrivals, departures, _ = de.simulate_one_server_queue(1.0, 2.0, 20.0, stream=recorded_stream(5))
+        de.simulate_one_server_queue(1.0, 2.0, 20.0, stream=recorded_stream(5), observer=recorder)
+
+        with tempfile.TemporaryDirectory() as path:
+            recorder.save(path)
+            columns = de.load_trace(path)
+            self.assertEqual(columns["departure"].tolist(), departures)
+            del columns
+
+
+if __name__ == '__main__':
+    unittest.main()
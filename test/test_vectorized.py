@@ -0,0 +1,37 @@
+import unittest
+import src.discret_events as de
+import src.random_variable_generator as rvg
+from src.discret_events.vectorized import np
+from src.replication import summarize_one_server_result
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestVectorizedReplications(unittest.TestCase):
+    def test_same_distribution_as_event_loop(self):
+        n = 2000
+        summaries = de.simulate_one_server_replications(1.0, 1.5, 20.0, n, rng=rvg.make_rng(0))
+        expected = [summarize_one_server_result(de.simulate_one_server_queue(1.0, 1.5, 20.0, rng=rng))
+                    for rng in rvg.spawn_rngs(1, n)]
+
+        for metric, values in summaries.items():
+            self.assertEqual(values.shape, (n,))
+            mean = sum(e[metric] for e in expected) / n
+            self.assertAlmostEqual(values.mean(), mean, delta=0.1 * mean)
+
+    def test_replication_values(self):
+        summaries = de.simulate_one_server_replications(2.0, 3.0, 10.0, 500, rng=rvg.make_rng(3))
+
+        self.assertTrue((summaries["exceeded_time"] >= 0).all())
+        self.assertTrue(((summaries["utilisation"] >= 0) & (summaries["utilisation"] <= 1)).all())
+        self.assertTrue((summaries["avg_time_in_system"][summaries["customers"] > 0] > 0).all())
+        self.assertTrue((summaries["avg_time_in_system"][summaries["customers"] == 0] == 0).all())
+
+    def test_reproducible_with_rng(self):
+        first = de.simulate_one_server_replications(1.0, 1.2, 10.0, 100, rng=rvg.make_rng(5))
+        second = de.simulate_one_server_replications(1.0, 1.2, 10.0, 100, rng=rvg.make_rng(5))
+
+        for metric in first:
+            self.assertTrue((first[metric] == second[metric]).all())
+
+
+if __name__ == '__main__':
+    unittest.main()